@@ -0,0 +1,142 @@
+"""
+Zip archive reader for Virtual Pet Pal.
+Reads assets straight out of Assets.zip without extracting it.
+The archive is memory-mapped once and its central directory is indexed once,
+so reading a member is a slice of the mapping plus an optional inflate.
+"""
+
+import io
+import mmap
+import struct
+import zlib
+from collections import namedtuple
+from PIL import Image
+
+END_OF_CENTRAL_DIR = struct.Struct("<IHHHHIIH")
+CENTRAL_DIR_ENTRY = struct.Struct("<IHHHHHHIIIHHHHHII")
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+
+END_OF_CENTRAL_DIR_SIGNATURE = 0x06054B50
+CENTRAL_DIR_SIGNATURE = 0x02014B50
+LOCAL_HEADER_SIGNATURE = 0x04034B50
+
+STORED = 0
+DEFLATED = 8
+
+# Per-member information taken from the central directory
+ZipEntry = namedtuple("ZipEntry", "method compressed_size size crc header_offset dos_time dos_date")
+
+"""
+AssetArchive indexes a zip file once and serves its members from a read-only memory map.
+Member names use forward slashes, e.g. "Pets/Dog/Idle/idle001.png".
+"""
+class AssetArchive:
+
+    def __init__(self, path):
+
+        self.path = path
+        with open(path, "rb") as archive_file:
+            self._map = mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        self.entries = {}
+        self._dirs = {}
+        self._read_central_directory()
+
+    """
+    Locates the end of central directory record and indexes every member.
+    Only plain (non-ZIP64, unencrypted) stored or deflated members are supported.
+    """
+    def _read_central_directory(self):
+
+        # The end record sits in the last 22 bytes plus an optional comment of up to 64 KiB
+        search_start = max(0, len(self._map) - END_OF_CENTRAL_DIR.size - 0xFFFF)
+        end_pos = self._map.rfind(struct.pack("<I", END_OF_CENTRAL_DIR_SIGNATURE), search_start)
+        if end_pos < 0:
+            raise ValueError(f"{self.path} is not a zip archive")
+
+        _, _, _, _, total, _, position, _ = END_OF_CENTRAL_DIR.unpack_from(self._view, end_pos)
+        if total == 0xFFFF or position == 0xFFFFFFFF:
+            raise ValueError(f"{self.path} is a ZIP64 archive, which is not supported")
+
+        for _ in range(total):
+            (signature, _, _, flags, method, dos_time, dos_date, crc, compressed_size, size,
+             name_len, extra_len, comment_len, _, _, _, header_offset) = CENTRAL_DIR_ENTRY.unpack_from(self._view, position)
+            if signature != CENTRAL_DIR_SIGNATURE:
+                raise ValueError(f"{self.path} has a corrupt central directory")
+
+            name_start = position + CENTRAL_DIR_ENTRY.size
+            raw_name = bytes(self._view[name_start:name_start + name_len])
+            name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+            position = name_start + name_len + extra_len + comment_len
+
+            if name.endswith("/") or flags & 0x1:
+                continue
+
+            self.entries[name] = ZipEntry(method, compressed_size, size, crc, header_offset, dos_time, dos_date)
+            folder, _, file = name.rpartition("/")
+            self._dirs.setdefault(folder, []).append(file)
+
+    """
+    Returns True if the archive holds files directly inside the given folder.
+    """
+    def isdir(self, folder):
+        return folder.strip("/") in self._dirs
+
+    """
+    Returns the names of the files directly inside a folder, in archive order.
+    """
+    def listdir(self, folder):
+        return list(self._dirs.get(folder.strip("/"), []))
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    """
+    Returns a member's entry and a view of its (possibly compressed) data in the mapping.
+    """
+    def _member_data(self, name):
+
+        entry = self.entries[name]
+        signature, *_, name_len, extra_len = LOCAL_HEADER.unpack_from(self._view, entry.header_offset)
+        if signature != LOCAL_HEADER_SIGNATURE:
+            raise ValueError(f"Corrupt local header for {name}")
+
+        start = entry.header_offset + LOCAL_HEADER.size + name_len + extra_len
+        return entry, self._view[start:start + entry.compressed_size]
+
+    """
+    Returns the uncompressed bytes of a member.
+    """
+    def read(self, name):
+
+        entry, data = self._member_data(name)
+        if entry.method == STORED:
+            return bytes(data)
+        if entry.method == DEFLATED:
+            return zlib.decompress(data, -15)
+        raise ValueError(f"Unsupported compression method {entry.method} for {name}")
+
+    """
+    Returns the first length uncompressed bytes of a member, inflating only as much as needed.
+    Used to read PNG headers without decompressing whole images.
+    """
+    def read_prefix(self, name, length):
+
+        entry, data = self._member_data(name)
+        if entry.method == STORED:
+            return bytes(data[:length])
+        if entry.method == DEFLATED:
+            return zlib.decompressobj(-15).decompress(data, length)
+        raise ValueError(f"Unsupported compression method {entry.method} for {name}")
+
+    """
+    Opens a member as a Pillow image.
+    """
+    def open_image(self, name):
+        return Image.open(io.BytesIO(self.read(name)))
+
+    def close(self):
+
+        self._view.release()
+        self._map.close()
@@ -0,0 +1,442 @@
+"""
+Asset manifest and pet registry for Virtual Pet Pal.
+Records which pets exist and, per pet, its actions (frame counts, frame dimensions, content hashes
+and modification times) in Assets/manifest.json, or in asset_manifest.json next to the Assets folder
+when only Assets.zip ships, so that a first start does not create an Assets folder. The selector and the main window take their pet list
+from it and ask "is this pet complete?" and "how big are its frames?" without opening any PNG.
+
+Pets come from the same sources as the loader, in its order: packs in Assets/Packs and in the
+PACK_DIRS of config.py, then the extracted Assets folder, then Assets.zip.
+
+The manifest is cached between runs and refreshed incrementally, so startup does not grow with the
+number of pets or packs:
+- at startup only the roots are checked: Assets/Pets, Assets.zip and each pack directory.
+  A root whose modification time did not change is taken from the cache as it is
+- a pet's own folders are checked the first time that pet is asked about,
+  and only new or changed files (by size and mtime) are read again
+Editing a PNG in place does not touch any directory, so after replacing frames run
+"python asset_manifest.py --full", which checks every file.
+"""
+
+import json
+import os
+import struct
+import sys
+import threading
+import zlib
+
+import pet_loader
+from asset_archive import AssetArchive
+from config import ACTIONS
+from pet_pack import PetPack, PACK_EXTENSION
+
+MANIFEST_NAME = "manifest.json"
+ZIP_MANIFEST_NAME = "asset_manifest.json"  # used next to the Assets folder while it does not exist
+MANIFEST_VERSION = 2
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_HEADER = struct.Struct(">8sI4sII")  # signature, IHDR length, "IHDR", width, height
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+"""
+Returns (width, height) read from a PNG's IHDR chunk, or None if the bytes are not a PNG.
+"""
+def png_size(head):
+
+    if len(head) < PNG_HEADER.size:
+        return None
+    signature, _, chunk, width, height = PNG_HEADER.unpack_from(head)
+    if signature != PNG_SIGNATURE or chunk != b"IHDR":
+        return None
+    return width, height
+
+def _stamp(path):
+
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _mtime(path):
+
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _subdirs(path):
+    return sorted(name for name in os.listdir(path) if os.path.isdir(os.path.join(path, name)))
+
+"""
+Describes one PNG file of the Assets folder: its stamp, CRC-32 and dimensions.
+The CRC-32 matches the one Assets.zip stores, so both sources hash alike.
+"""
+def _describe_file(path):
+
+    with open(path, "rb") as png_file:
+        data = png_file.read()
+    mtime_ns, size = _stamp(path)
+    width, height = png_size(data) or (0, 0)
+    return {"mtime_ns": mtime_ns, "bytes": size, "crc32": zlib.crc32(data), "width": width, "height": height}
+
+"""
+AssetManifest holds the indexed sources and answers questions about pets from them.
+"""
+class AssetManifest:
+
+    def __init__(self, path, data=None):
+
+        self.path = path
+        data = data if data and data.get("version") == MANIFEST_VERSION else {}
+        self.folder = data.get("folder", {"mtime_ns": None, "pets": {}})
+        self.zip = data.get("zip", {})
+        self.pack_dirs = data.get("pack_dirs", {})
+        self.rescanned = 0
+        self._checked = set()
+        self._views = {}
+        self._lock = threading.RLock()
+
+    """
+    Reads a manifest file. A missing, unreadable or outdated file gives an empty manifest.
+    """
+    @classmethod
+    def load(cls, path):
+
+        try:
+            with open(path) as manifest_file:
+                return cls(path, json.load(manifest_file))
+        except FileNotFoundError:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            print(f"[Warning] Rebuilding asset manifest {path}: {e}")
+            return cls(path)
+
+    """
+    Writes the manifest atomically.
+    """
+    def save(self):
+
+        data = {"version": MANIFEST_VERSION, "folder": self.folder, "zip": self.zip, "pack_dirs": self.pack_dirs}
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w") as manifest_file:
+                json.dump(data, manifest_file, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[Warning] Could not write asset manifest {self.path}: {e}")
+
+    """
+    Brings the roots up to date: the list of pet folders, Assets.zip and every pack directory.
+    With full=True every pet folder, PNG and pack is checked as well. Returns True if anything changed.
+    """
+    def refresh(self, full=False):
+
+        with self._lock:
+            changed = self._refresh_pet_list(full)
+            changed = self._refresh_zip() or changed
+            changed = self._refresh_pack_dirs(full) or changed
+            if full:
+                for pet_name in list(self.folder["pets"]):
+                    changed = self._refresh_pet(pet_name, full=True) or changed
+            self._views.clear()
+            return changed
+
+    def _refresh_pet_list(self, full):
+
+        pets_dir = os.path.join(pet_loader.ASSETS_DIR, "Pets")
+        mtime_ns = _mtime(pets_dir)
+        if mtime_ns == self.folder["mtime_ns"] and not full:
+            return False
+
+        names = _subdirs(pets_dir) if mtime_ns is not None else []
+        old = self.folder["pets"]
+        self.folder = {"mtime_ns": mtime_ns,
+                       "pets": {name: old.get(name, {"mtime_ns": None, "actions": {}}) for name in names}}
+        self._checked &= set(names)
+        return True
+
+    """
+    Checks one pet's folder and its action folders, reading only new or changed PNGs.
+    Returns True if anything changed.
+    """
+    def _refresh_pet(self, pet_name, full=False):
+
+        self._checked.add(pet_name)
+        entry = self.folder["pets"].get(pet_name)
+        pet_dir = os.path.join(pet_loader.ASSETS_DIR, "Pets", pet_name)
+        mtime_ns = _mtime(pet_dir)
+        if entry is None or mtime_ns is None:
+            return False
+
+        old_actions = entry["actions"]
+        if mtime_ns == entry["mtime_ns"] and not full:
+            action_names = list(old_actions)
+        else:
+            action_names = _subdirs(pet_dir)
+
+        changed = mtime_ns != entry["mtime_ns"] or set(action_names) != set(old_actions)
+        actions = {}
+        for action in action_names:
+            action_dir = os.path.join(pet_dir, action)
+            old = old_actions.get(action)
+            action_mtime = _mtime(action_dir)
+            if action_mtime is None:
+                changed = True
+                continue
+            if old and old["mtime_ns"] == action_mtime and not full:
+                actions[action] = old
+                continue
+
+            old_files = old["files"] if old else {}
+            files = {}
+            for file in sorted(os.listdir(action_dir)):
+                if not file.lower().endswith(".png"):
+                    continue
+                path = os.path.join(action_dir, file)
+                previous = old_files.get(file)
+                if previous and (previous["mtime_ns"], previous["bytes"]) == _stamp(path):
+                    files[file] = previous
+                else:
+                    files[file] = _describe_file(path)
+                    self.rescanned += 1
+            changed = changed or not old or files != old_files or action_mtime != old["mtime_ns"]
+            actions[action] = {"mtime_ns": action_mtime, "files": files}
+
+        self.folder["pets"][pet_name] = {"mtime_ns": mtime_ns, "actions": actions}
+        return changed
+
+    def _refresh_zip(self):
+
+        if not os.path.exists(pet_loader.ASSETS_ZIP):
+            changed = bool(self.zip)
+            self.zip = {}
+            return changed
+
+        mtime_ns, size = _stamp(pet_loader.ASSETS_ZIP)
+        if self.zip.get("mtime_ns") == mtime_ns and self.zip.get("bytes") == size:
+            return False
+
+        old_files = {}
+        for key, files in self.zip.get("dirs", {}).items():
+            for file, info in files.items():
+                old_files[f"{key}/{file}"] = info
+
+        dirs = {}
+        try:
+            archive = AssetArchive(pet_loader.ASSETS_ZIP)
+        except (OSError, ValueError) as e:
+            print(f"[Warning] Could not index {pet_loader.ASSETS_ZIP}: {e}")
+            self.zip = {}
+            return True
+
+        try:
+            for name, entry in archive.entries.items():
+                key, _, file = name.rpartition("/")
+                if not key.startswith("Pets/") or key.count("/") != 2 or not file.lower().endswith(".png"):
+                    continue
+                old = old_files.get(name)
+                if old and old["crc32"] == entry.crc and old["bytes"] == entry.size:
+                    info = old
+                else:
+                    # The CRC comes from the central directory; only the IHDR is inflated for the size
+                    width, height = png_size(archive.read_prefix(name, PNG_HEADER.size)) or (0, 0)
+                    info = {"crc32": entry.crc, "bytes": entry.size, "width": width, "height": height}
+                    self.rescanned += 1
+                dirs.setdefault(key, {})[file] = info
+        finally:
+            archive.close()
+
+        self.zip = {"mtime_ns": mtime_ns, "bytes": size, "dirs": dirs}
+        return True
+
+    """
+    Checks every pack directory. Packs are written by replacing the file, which updates the
+    directory's modification time, so the packs of an unchanged directory are not looked at.
+    """
+    def _refresh_pack_dirs(self, full):
+
+        changed = False
+        pack_dirs = {}
+        for pack_dir in pet_loader.pack_dirs():
+            old = self.pack_dirs.get(pack_dir, {"mtime_ns": None, "packs": {}})
+            mtime_ns = _mtime(pack_dir)
+            if mtime_ns == old["mtime_ns"] and not full:
+                pack_dirs[pack_dir] = old
+                continue
+
+            packs = {}
+            if mtime_ns is not None:
+                for file in sorted(os.listdir(pack_dir)):
+                    if not file.endswith(PACK_EXTENSION):
+                        continue
+                    pack = self._index_pack(os.path.join(pack_dir, file), old["packs"].get(file))
+                    if pack:
+                        packs[file] = pack
+            pack_dirs[pack_dir] = {"mtime_ns": mtime_ns, "packs": packs}
+            changed = True
+
+        changed = changed or list(pack_dirs) != list(self.pack_dirs)
+        self.pack_dirs = pack_dirs
+        return changed
+
+    def _index_pack(self, path, old):
+
+        mtime_ns, size = _stamp(path)
+        if old and (old["mtime_ns"], old["bytes"]) == (mtime_ns, size):
+            return old
+
+        try:
+            pack = PetPack.open(path)
+        except (OSError, ValueError) as e:
+            print(f"[Warning] Ignoring pet pack {path}: {e}")
+            return None
+        # Trimmed frames (asset_optimizer.py) are laid out in their untrimmed canvas size
+        keys = {key: [tables.get("canvas", [width, height]) for _, width, height, *_ in tables.get("right", [])]
+                for key, tables in pack.index.items()}
+        pack.close()
+        self.rescanned += 1
+        return {"mtime_ns": mtime_ns, "bytes": size, "keys": keys}
+
+    """
+    Yields (pack path, indexed keys) in the loader's order:
+    Assets/Packs first, then PACK_DIRS, each directory sorted by file name.
+    """
+    def _packs_in_order(self):
+
+        for pack_dir in pet_loader.pack_dirs():
+            for file, pack in sorted(self.pack_dirs.get(pack_dir, {}).get("packs", {}).items()):
+                yield os.path.join(pack_dir, file), pack
+
+    """
+    Returns the path of the pack an asset key is read from, or None if no pack has it.
+    """
+    def pack_for(self, key):
+
+        for path, pack in self._packs_in_order():
+            if key in pack["keys"]:
+                return path
+        return None
+
+    """
+    Returns the sorted names of every pet found in any source.
+    """
+    def pet_names(self):
+
+        names = set(self.folder["pets"])
+        names.update(key.split("/")[1] for key in self.zip.get("dirs", {}))
+        for _, pack in self._packs_in_order():
+            names.update(key.split("/")[1] for key in pack["keys"] if key.startswith("Pets/") and key.count("/") == 2)
+        return sorted(names)
+
+    """
+    Returns a pet's actions as a dictionary of action to where the loader will take it from,
+    how many frames it has, its largest frame width and height, and a stamp that changes
+    whenever the action's source frames change.
+    The pet's folder is checked the first time it is asked about in this process.
+    """
+    def actions(self, pet_name):
+
+        with self._lock:
+            view = self._views.get(pet_name)
+            if view is not None:
+                return view
+
+            if pet_name not in self._checked and self._refresh_pet(pet_name):
+                self.save()
+
+            # Lowest precedence first, so the folder and packs override the zip as in pet_loader
+            sources = {}
+            prefix = f"Pets/{pet_name}/"
+            for key, files in self.zip.get("dirs", {}).items():
+                if key.startswith(prefix):
+                    sources[key[len(prefix):]] = ("zip", [(info["width"], info["height"])
+                                                          for _, info in sorted(files.items())],
+                                                  {file: info["crc32"] for file, info in files.items()})
+            for action, entry in self.folder["pets"].get(pet_name, {"actions": {}})["actions"].items():
+                sources[action] = ("folder", [(info["width"], info["height"])
+                                              for _, info in sorted(entry["files"].items())],
+                                   {file: info["crc32"] for file, info in entry["files"].items()})
+            for path, pack in reversed(list(self._packs_in_order())):
+                for key, sizes in pack["keys"].items():
+                    if key.startswith(prefix) and key.count("/") == 2:
+                        sources[key[len(prefix):]] = (f"pack:{os.path.basename(path)}",
+                                                      [tuple(size) for size in sizes],
+                                                      [path, pack["mtime_ns"], pack["bytes"]])
+
+            view = {}
+            for action, (source, sizes, origin) in sorted(sources.items()):
+                view[action] = {
+                    "source": source,
+                    "frames": len(sizes),
+                    "width": max((width for width, _ in sizes), default=0),
+                    "height": max((height for _, height in sizes), default=0),
+                    "stamp": f"{zlib.crc32(json.dumps(origin, sort_keys=True).encode()):08x}",
+                }
+            self._views[pet_name] = view
+            return view
+
+    """
+    Returns how many frames an action has, or 0 if it does not exist.
+    """
+    def frame_count(self, pet_name, action):
+        return self.actions(pet_name).get(action, {}).get("frames", 0)
+
+    """
+    Returns the (width, height) of an action's largest frame, or None if it has no frames.
+    """
+    def frame_size(self, pet_name, action="Idle"):
+
+        info = self.actions(pet_name).get(action)
+        if not info or not info["frames"]:
+            return None
+        return info["width"], info["height"]
+
+    """
+    Returns the actions of a pet that have no frames.
+    """
+    def missing_actions(self, pet_name, actions=ACTIONS):
+        return [action for action in actions if not self.frame_count(pet_name, action)]
+
+    def is_complete(self, pet_name, actions=ACTIONS):
+        return not self.missing_actions(pet_name, actions)
+
+"""
+Returns where the manifest of the current asset root is kept: inside the Assets folder if there is one,
+otherwise in the folder that would hold it, next to Assets.zip and pet_state.json.
+"""
+def manifest_path():
+
+    if os.path.isdir(pet_loader.ASSETS_DIR):
+        return os.path.join(pet_loader.ASSETS_DIR, MANIFEST_NAME)
+    return os.path.join(os.path.dirname(pet_loader.ASSETS_DIR), ZIP_MANIFEST_NAME)
+
+"""
+Returns the manifest for the current asset root, loaded and refreshed once per process.
+It is saved back only if the refresh found changes. Safe to call from the loader's worker threads.
+"""
+def get_manifest():
+
+    global _manifest
+    path = manifest_path()
+    with _manifest_lock:
+        if _manifest is None or _manifest.path != path:
+            manifest = AssetManifest.load(path)
+            if manifest.refresh():
+                manifest.save()
+            _manifest = manifest
+        return _manifest
+
+
+if __name__ == "__main__":
+    # Rebuild the manifest, checking every file: "python asset_manifest.py --full"
+    manifest = AssetManifest.load(manifest_path())
+    manifest.refresh(full="--full" in sys.argv[1:])
+    pet_names = manifest.pet_names()
+    for pet_name in pet_names:
+        missing = manifest.missing_actions(pet_name)
+        size = manifest.frame_size(pet_name)
+        print(f"  {pet_name}: " + ", ".join(f"{action} {manifest.frame_count(pet_name, action)}" for action in ACTIONS)
+              + (f", {size[0]}x{size[1]}" if size else "") + (f" - missing {', '.join(missing)}" if missing else ""))
+    manifest.save()
+    print(f"[Info] Indexed {len(pet_names)} pets ({manifest.rescanned} files read) into {manifest.path}")
@@ -0,0 +1,142 @@
+"""
+Offline asset optimizer for Virtual Pet Pal.
+Compiles pets into optimized packs (see pet_pack.py) in which every frame is:
+- trimmed to its visible pixels, keeping its offset inside the full frame
+- stored as palette indices when it has at most 256 distinct colors, which is lossless
+- pre-mirrored, so the left-facing frames are never flipped at startup
+Frames are read from the Assets folder or Assets.zip and render pixel-for-pixel as before.
+
+    python asset_optimizer.py            # all pets and the health bar into Assets/Packs/Assets.vpp
+    python asset_optimizer.py Dog Cat    # one optimized pack per pet in Assets/Packs/<pet>.vpp
+"""
+
+import os
+import sys
+from PIL import Image
+
+from pet_loader import load_action_images
+from pet_pack import collect_health_bar, write_pack, PACK_DIR, PACK_EXTENSION
+from asset_manifest import get_manifest
+
+PALETTE_COLORS = 256
+
+"""
+Clears the color of fully transparent pixels, which are never visible,
+so they do not count as distinct colors.
+"""
+def clear_hidden_pixels(img):
+
+    visible = img.getchannel("A").point(lambda alpha: 255 if alpha else 0)
+    cleared = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    cleared.paste(img, mask=visible)
+    return cleared
+
+"""
+Crops a frame to the bounding box of its visible pixels.
+Returns the cropped frame and its (x, y) offset in the original. A fully transparent frame becomes 1x1.
+"""
+def trim(img):
+
+    box = img.getchannel("A").getbbox()
+    if box is None:
+        return Image.new("RGBA", (1, 1), (0, 0, 0, 0)), (0, 0)
+    return img.crop(box), box[:2]
+
+"""
+Converts an RGBA frame to palette mode with an RGBA palette if it has at most 256 colors.
+Returns None if it has more, or if the conversion would not round-trip exactly.
+"""
+def to_palette(img):
+
+    colors = img.getcolors(PALETTE_COLORS)
+    if colors is None:
+        return None
+
+    palette = [bytes(color) for _, color in colors]
+    lookup = {color: index for index, color in enumerate(palette)}
+    pixels = img.tobytes()
+    indices = bytes(lookup[pixels[i:i + 4]] for i in range(0, len(pixels), 4))
+    indexed = Image.frombytes("P", img.size, indices)
+    indexed.putpalette(b"".join(palette), "RGBA")
+
+    if indexed.convert("RGBA").tobytes() != img.tobytes():
+        return None
+    return indexed
+
+"""
+Optimizes one full frame: trims it, quantizes it if lossless,
+and records its offset and full size for the pack.
+"""
+def optimize_frame(img):
+
+    img = clear_hidden_pixels(img.convert("RGBA"))
+    trimmed, offset = trim(img)
+    optimized = to_palette(trimmed) or trimmed
+    optimized.info["offset"] = offset
+    optimized.info["canvas"] = img.size
+    return optimized
+
+"""
+Collects every action of a pet from its PNG sources as optimized right- and left-facing frames.
+Returns the assets for pet_pack.write_pack and the number of bytes (before, after) for reporting.
+"""
+def optimize_pet(pet_name):
+
+    assets = {}
+    before = after = 0
+
+    for action in get_manifest().actions(pet_name):
+        images = load_action_images(pet_name, action, use_packs=False)
+        if not images:
+            continue
+
+        directions = {"right": [], "left": []}
+        for img in images:
+            # Mirroring the full frame and trimming it again gives the exact left-facing offset
+            for direction, frame in (("right", img), ("left", img.transpose(Image.FLIP_LEFT_RIGHT))):
+                optimized = optimize_frame(frame)
+                directions[direction].append(optimized)
+                before += frame.width * frame.height * 4
+                after += optimized.width * optimized.height * (1 if optimized.mode == "P" else 4)
+                if optimized.mode == "P":
+                    after += len(optimized.getpalette("RGBA"))
+
+        assets[f"Pets/{pet_name}/{action}"] = directions
+
+    return assets, (before, after)
+
+"""
+Writes optimized packs. With no pet names every pet goes into one pack, otherwise one pack per pet.
+The whole-tree pack replaces the one pet_pack.py builds, so it also carries the health bar, stored as is.
+Returns a list of (pack path, bytes before, bytes after).
+"""
+def build(pet_names=None, out_dir=PACK_DIR):
+
+    groups = [(name, [name]) for name in pet_names] if pet_names else [("Assets", get_manifest().pet_names())]
+    written = []
+
+    for pack_name, pets in groups:
+        assets, before, after = {}, 0, 0
+        for pet_name in pets:
+            pet_assets, (pet_before, pet_after) = optimize_pet(pet_name)
+            if not pet_assets:
+                print(f"[Warning] No frames found for '{pet_name}'. Skipping it.")
+                continue
+            assets.update(pet_assets)
+            before += pet_before
+            after += pet_after
+
+        if assets and not pet_names:
+            assets.update(collect_health_bar())
+        if assets:
+            path = os.path.join(out_dir, pack_name + PACK_EXTENSION)
+            write_pack(path, assets)
+            written.append((path, before, after))
+
+    return written
+
+
+if __name__ == "__main__":
+    for pack_path, raw_bytes, stored_bytes in build(sys.argv[1:]):
+        print(f"[Info] Wrote {pack_path}: {raw_bytes / 1024:.0f} KiB of full RGBA frames stored in "
+              f"{stored_bytes / 1024:.0f} KiB ({stored_bytes / max(raw_bytes, 1):.0%})")
@@ -0,0 +1,573 @@
+"""
+Benchmark suite for Virtual Pet Pal.
+Times asset loading, the pet selector's pet switch and the animation tick on synthetic pets,
+and reports wall-clock time, peak RSS and how many PhotoImages each benchmark leaves alive.
+
+Every benchmark runs in a fresh worker process, so loads are cold and the peak RSS belongs
+to that benchmark alone. Tk benchmarks need a display: the current one, a virtual Xvfb display
+started for the run, or none ("headless"), in which case only the Tk-free benchmarks run.
+
+Timings depend on the machine, so no baseline ships with the app: record one with --save-baseline
+before measuring a change, and compare later runs against it.
+
+    python benchmark.py --save-baseline         # first run: store the results as this machine's baseline
+    python benchmark.py                         # run, then compare against benchmark_baseline.json
+    python benchmark.py --frames 24 --size 256x256 --display xvfb
+"""
+
+import argparse
+import json
+import os
+import platform
+import queue
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+from PIL import Image, ImageDraw, ImageOps
+
+from config import ACTIONS, ANIMATION_DELAY, PET_FRAME_WIDTH, PET_FRAME_HEIGHT, FULL_HEALTH, MULTI_PET_AREA_HEIGHT
+from health_bar import build_templates, render_health_image
+from compositor import Compositor, premultiply, AVAILABLE as COMPOSITOR_AVAILABLE
+from frame_cache import FrameCache
+from multi_pet import CompositedHostedPet
+from pet_engine import PetEngine, PetAnimation
+from scheduler import VirtualClock
+import pet_loader
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BASE_DIR, "benchmark_baseline.json")
+
+BENCH_PET = "Bench"
+DEFAULT_FRAMES = 8
+DEFAULT_PETS = 2
+DEFAULT_TICKS = 500
+DEFAULT_REPEAT = 3
+REGRESSION_THRESHOLD = 0.25  # a best time 25% slower (or 25% more peak RSS) than the baseline is a regression
+PLAY_EVERY_TICKS = 100  # the tick benchmarks start play this often so movement is measured too
+COMPOSITE_PETS = 12  # pets sharing the strip in the compositor benchmark
+COMPOSITE_WIDTH = 1280
+XVFB_WAIT = 5  # seconds to wait for a virtual display to come up
+WORKER_TIMEOUT = 300  # seconds
+
+"""
+Draws one synthetic RGBA frame: a noisy, coloured body on a transparent background,
+shifted per frame so consecutive frames differ like a real animation.
+The noise keeps PNG decoding cost close to that of real artwork.
+"""
+def _synthetic_frame(rng, size, color, index):
+
+    width, height = size
+    texture = ImageOps.colorize(Image.effect_noise(size, 48), black=color[0], white=color[1])
+
+    mask = Image.new("L", size, 0)
+    draw = ImageDraw.Draw(mask)
+    offset = (index % 4) * max(1, width // 40)
+    draw.ellipse((width // 6 + offset, height // 4, width * 5 // 6 + offset, height - 4), fill=255)
+    draw.ellipse((width // 2 + offset, 4, width * 5 // 6 + offset, height // 2), fill=255)
+    for _ in range(3):
+        x, y = rng.randrange(width), rng.randrange(height)
+        draw.ellipse((x - 4, y - 4, x + 4, y + 4), fill=rng.randrange(128, 256))
+
+    frame = Image.new("RGBA", size, (0, 0, 0, 0))
+    frame.paste(texture, mask=mask)
+    return frame
+
+"""
+Generates a synthetic asset tree in out_dir with the same layout as Assets/:
+pets named Bench1, Bench2, ... with frames PNGs of the given size for every action,
+plus a Health_Bar folder with one image per health value.
+Returns the generated pet names.
+"""
+def generate_assets(out_dir, pets=DEFAULT_PETS, frames=DEFAULT_FRAMES, size=(PET_FRAME_WIDTH, PET_FRAME_HEIGHT),
+                    seed=0):
+
+    rng = random.Random(seed)
+    pet_names = [f"{BENCH_PET}{i + 1}" for i in range(pets)]
+
+    for pet_name in pet_names:
+        for action in ACTIONS:
+            folder = os.path.join(out_dir, "Pets", pet_name, action)
+            os.makedirs(folder, exist_ok=True)
+            color = (tuple(rng.randrange(64) for _ in range(3)), tuple(rng.randrange(128, 256) for _ in range(3)))
+            for i in range(frames):
+                frame = _synthetic_frame(rng, size, color, i)
+                frame.save(os.path.join(folder, f"{action.lower()}{i + 1:03d}.png"))
+
+    health_dir = os.path.join(out_dir, "Health_Bar")
+    os.makedirs(health_dir, exist_ok=True)
+    templates = build_templates()
+    for health in range(1, FULL_HEALTH + 1):
+        render_health_image(health, templates=templates).save(os.path.join(health_dir, f"{health}.png"))
+
+    return pet_names
+
+"""
+Returns the peak resident set size of this process in megabytes,
+or None where the resource module is unavailable (Windows).
+"""
+def peak_rss_mb():
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+# --- Benchmarks ---
+# Each returns (milliseconds, extra metrics, objects to keep alive until PhotoImages are counted)
+
+def bench_load_frames(pet_names, root, ticks):
+
+    start = time.perf_counter()
+    frames = [pet_loader.load_frames(pet_names[0], action) for action in ACTIONS]
+    return (time.perf_counter() - start) * 1000, {}, frames
+
+def bench_load_health_frames(pet_names, root, ticks):
+
+    start = time.perf_counter()
+    frames = pet_loader.load_health_frames()
+    return (time.perf_counter() - start) * 1000, {}, frames
+
+def bench_load_preview_frames(pet_names, root, ticks):
+
+    start = time.perf_counter()
+    frames = pet_loader.load_preview_frames(pet_names[0])
+    return (time.perf_counter() - start) * 1000, {}, frames
+
+"""
+Switching to a pet the background worker has not reached yet: the previews are decoded on the Tk thread.
+"""
+def bench_selector_switch_cold(pet_names, root, ticks):
+
+    from pet_selector import switch_preview
+
+    preview_cache = {pet_names[0]: pet_loader.load_preview_frames(pet_names[0])}
+    start = time.perf_counter()
+    switch_preview(pet_names[-1], preview_cache, queue.Queue())
+    return (time.perf_counter() - start) * 1000, {}, preview_cache
+
+"""
+Switching to a pet the worker already decoded: only the PhotoImages are built on the Tk thread.
+"""
+def bench_selector_switch_warm(pet_names, root, ticks):
+
+    from pet_selector import switch_preview
+
+    preview_cache = {pet_names[0]: pet_loader.load_preview_frames(pet_names[0])}
+    results = queue.Queue()
+    results.put((pet_names[-1], pet_loader.load_preview_images(pet_names[-1])))
+    start = time.perf_counter()
+    switch_preview(pet_names[-1], preview_cache, results)
+    return (time.perf_counter() - start) * 1000, {}, preview_cache
+
+"""
+Per-tick cost of the main window's animation tick (PetView.tick, which pet_window's animate runs),
+on a virtual clock so hours of engine timers do not have to elapse in real time.
+Lazy frame decodes on the first use of each action are part of the measured ticks.
+"""
+def bench_animate_tick(pet_names, root, ticks):
+
+    from frame_cache import FrameCache
+    from pet_window import PetView
+
+    root.deiconify()
+    window_width = window_height = 400
+    canvas = tk.Canvas(root, width=window_width, height=window_height, highlightthickness=0)
+    canvas.pack()
+
+    frame_cache = FrameCache()
+    idle_frames = frame_cache.get(pet_names[0], "Idle", "left")
+    frame_w, frame_h = idle_frames[0].width(), idle_frames[0].height()
+
+    engine = PetEngine(VirtualClock())
+    animation = PetAnimation(engine, window_width - frame_w - 10)
+    view = PetView(canvas, pet_names[0], frame_cache, engine, animation, window_height - frame_h - 10, frame_w,
+                   window_width)
+    engine.start()
+
+    tick_times, redraw_total = [], 0.0
+    for i in range(ticks):
+        if i % PLAY_EVERY_TICKS == 0:
+            engine.feed()
+            engine.start_play()
+        engine.advance(ANIMATION_DELAY)
+
+        start = time.perf_counter()
+        view.tick()
+        middle = time.perf_counter()
+        canvas.update_idletasks()
+        redraw_total += time.perf_counter() - middle
+        tick_times.append((middle - start) * 1000)
+
+    tick_times.sort()
+    extras = {
+        "p95_ms": tick_times[int(len(tick_times) * 0.95)],
+        "max_ms": tick_times[-1],
+        "redraw_mean_ms": redraw_total * 1000 / ticks,
+        "tk_calls_per_tick": view.tk_calls / ticks,
+    }
+    return statistics.mean(tick_times), extras, (frame_cache, view)
+
+def bench_load_action_images(pet_names, root, ticks):
+
+    start = time.perf_counter()
+    images = [pet_loader.load_action_images(pet_names[0], action, direction)
+              for action in ACTIONS for direction in ("right", "left")]
+    return (time.perf_counter() - start) * 1000, {}, images
+
+def bench_load_preview_images(pet_names, root, ticks):
+
+    start = time.perf_counter()
+    images = pet_loader.load_preview_images(pet_names[0])
+    return (time.perf_counter() - start) * 1000, {}, images
+
+def bench_health_bar_render(pet_names, root, ticks):
+
+    start = time.perf_counter()
+    templates = build_templates()
+    images = [render_health_image(health, templates=templates) for health in range(1, FULL_HEALTH + 1)]
+    return (time.perf_counter() - start) * 1000, {}, images
+
+"""
+The Tk-free half of a tick: engine timers plus PetAnimation.step, per tick.
+"""
+def bench_tick_logic(pet_names, root, ticks):
+
+    frame_counts = {action: pet_loader.count_frames(pet_names[0], action) for action in ACTIONS}
+    engine = PetEngine(VirtualClock())
+    animation = PetAnimation(engine, 0)
+    engine.start()
+
+    start = time.perf_counter()
+    for i in range(ticks):
+        if i % PLAY_EVERY_TICKS == 0:
+            engine.feed()
+            engine.start_play()
+        engine.advance(ANIMATION_DELAY)
+        animation.step(frame_counts[engine.action], 1000)
+    return (time.perf_counter() - start) * 1000 / ticks, {}, None
+
+"""
+A multi-pet tick through the compositor without Tk: every pet's sprite, health bar and mood
+blended into one buffer, and the dirty rectangles converted as they would be for the PhotoImage.
+"""
+def bench_composite_tick(pet_names, root, ticks):
+
+    frame_cache = FrameCache(convert=premultiply)
+    compositor = Compositor(COMPOSITE_WIDTH, MULTI_PET_AREA_HEIGHT)
+    pets = []
+    for i in range(COMPOSITE_PETS):
+        engine = PetEngine(VirtualClock())
+        animation = PetAnimation(engine, (i * 97) % (COMPOSITE_WIDTH - PET_FRAME_WIDTH))
+        y = MULTI_PET_AREA_HEIGHT - PET_FRAME_HEIGHT - 10 - (i % 3) * 15
+        pets.append(CompositedHostedPet(pet_names[i % len(pet_names)], engine, animation, y,
+                                        PET_FRAME_WIDTH, PET_FRAME_HEIGHT))
+        engine.start()
+
+    tick_times = []
+    rect_count = 0
+    for tick in range(ticks):
+        start = time.perf_counter()
+        layers = []
+        for i, pet in enumerate(pets):
+            if tick % PLAY_EVERY_TICKS == i:
+                pet.engine.feed()
+                pet.engine.start_play()
+            pet.engine.advance(ANIMATION_DELAY)
+            frame_set = frame_cache.get_set(pet.pet_name, pet.engine.action, pet.animation.direction)
+            pet.animation.step(len(frame_set.images), COMPOSITE_WIDTH - pet.frame_w)
+            frame_set = frame_cache.get_set(pet.pet_name, pet.engine.action, pet.animation.direction)
+            layers += pet.layers(i, frame_set)
+        rects = compositor.compose(layers)
+        for rect in rects:
+            compositor.region(rect)
+        rect_count += len(rects)
+        tick_times.append((time.perf_counter() - start) * 1000)
+
+    extras = {
+        "pets": COMPOSITE_PETS,
+        "dirty_rects_per_tick": rect_count / ticks,
+        "blended_pixels_per_tick": compositor.blended_pixels / ticks,
+        "max_ms": max(tick_times),
+    }
+    return statistics.mean(tick_times), extras, (frame_cache, compositor)
+
+# name: (needs Tk, function, what time_ms means)
+BENCHMARKS = {
+    "load_frames": (True, bench_load_frames, "all actions of one pet, both directions"),
+    "load_health_frames": (True, bench_load_health_frames, "all health bar PNGs"),
+    "load_preview_frames": (True, bench_load_preview_frames, "idle and action previews of one pet"),
+    "selector_switch_cold": (True, bench_selector_switch_cold, "pet switch before the prefetch reached it"),
+    "selector_switch_warm": (True, bench_selector_switch_warm, "pet switch after the prefetch decoded it"),
+    "animate_tick": (True, bench_animate_tick, "mean per animation tick"),
+    "load_action_images": (False, bench_load_action_images, "all actions of one pet, both directions, no Tk"),
+    "load_preview_images": (False, bench_load_preview_images, "idle and action previews of one pet, no Tk"),
+    "health_bar_render": (False, bench_health_bar_render, "every health level composed from the templates"),
+    "tick_logic": (False, bench_tick_logic, "mean per tick of engine timers and animation step"),
+}
+if COMPOSITOR_AVAILABLE:
+    BENCHMARKS["composite_tick"] = (False, bench_composite_tick, "mean per multi-pet tick through the compositor")
+
+"""
+Runs one benchmark in this process and prints its metrics as a JSON line.
+This is what each worker process executes.
+"""
+def run_worker(name, assets_dir, pet_names, ticks):
+
+    pet_loader.use_asset_root(assets_dir)
+    needs_tk, bench, _ = BENCHMARKS[name]
+
+    root = None
+    if needs_tk:
+        root = tk.Tk()
+        root.withdraw()
+    images_before = len(root.image_names()) if root else 0
+
+    elapsed_ms, extras, keep = bench(pet_names, root, ticks)
+
+    result = {
+        "time_ms": elapsed_ms,
+        "peak_rss_mb": peak_rss_mb(),
+        "photoimages": len(root.image_names()) - images_before if root else 0,
+    }
+    result.update(extras)
+    print(json.dumps(result))
+
+    del keep
+    if root:
+        root.destroy()
+
+"""
+Starts an Xvfb virtual display on the first free display number.
+Returns (process, display name), or (None, None) if Xvfb is not installed or fails to start.
+"""
+def start_virtual_display():
+
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        return None, None
+
+    for number in range(99, 199):
+        socket = f"/tmp/.X11-unix/X{number}"
+        if os.path.exists(socket) or os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+
+        process = subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + XVFB_WAIT
+        while time.monotonic() < deadline and process.poll() is None:
+            if os.path.exists(socket):
+                return process, f":{number}"
+            time.sleep(0.05)
+        process.terminate()
+
+    return None, None
+
+"""
+Returns True if Tk can open a window on the current display.
+"""
+def tk_available():
+
+    try:
+        tk.Tk().destroy()
+        return True
+    except tk.TclError:
+        return False
+
+"""
+Chooses where the Tk benchmarks run. Returns (mode, environment for workers, Xvfb process or None);
+mode is "tk", "xvfb" or "headless".
+"""
+def resolve_display(requested):
+
+    env = dict(os.environ)
+    if requested in ("auto", "tk") and tk_available():
+        return "tk", env, None
+    if requested == "tk":
+        print("[Error] No display available for Tk. Use --display xvfb or --display headless.")
+        sys.exit(1)
+
+    if requested in ("auto", "xvfb"):
+        process, display = start_virtual_display()
+        if process:
+            env["DISPLAY"] = display
+            return "xvfb", env, process
+        if requested == "xvfb":
+            print("[Error] Could not start an Xvfb virtual display. Is Xvfb installed?")
+            sys.exit(1)
+        print("[Warning] No display and no Xvfb found. Running only the headless benchmarks.")
+
+    return "headless", env, None
+
+"""
+Runs a benchmark repeat times, each in a fresh worker process, and aggregates the runs:
+median and minimum time, the largest peak RSS and the PhotoImage count.
+"""
+def run_benchmark(name, assets_dir, params, env, repeat):
+
+    command = [sys.executable, os.path.abspath(__file__), "--worker", name, "--assets", assets_dir,
+               "--pets", str(params["pets"]), "--ticks", str(params["ticks"])]
+
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(command, env=env, capture_output=True, text=True, timeout=WORKER_TIMEOUT)
+        lines = completed.stdout.strip().splitlines()
+        if completed.returncode != 0 or not lines:
+            print(f"[Error] Benchmark {name} failed:\n{completed.stderr.strip()}")
+            return None
+        runs.append(json.loads(lines[-1]))
+
+    times = [run["time_ms"] for run in runs]
+    rss = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    result = dict(runs[-1])
+    result.update({
+        "time_ms": statistics.median(times),
+        "time_min_ms": min(times),
+        "peak_rss_mb": max(rss) if rss else None,
+    })
+    return result
+
+"""
+Compares results against a baseline and returns the list of regressions.
+A benchmark regresses if its best (minimum) time or peak RSS grew by more than threshold,
+or if it leaves more PhotoImages alive than before. The best time is compared because it is
+the least disturbed by other load on the machine.
+"""
+def compare(report, baseline, threshold):
+
+    if baseline["params"] != report["params"]:
+        print(f"[Warning] Baseline was recorded with {baseline['params']}, not {report['params']}. Skipping comparison.")
+        return []
+
+    regressions = []
+    print(f"\n{'Benchmark':<22}{'min':>11}{'baseline':>12}{'change':>9}   {'RSS change':>10}   PhotoImages")
+    for name, result in report["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+
+        time_change = result["time_min_ms"] / base["time_min_ms"] - 1 if base["time_min_ms"] else 0.0
+        rss_change = None
+        if result["peak_rss_mb"] and base["peak_rss_mb"]:
+            rss_change = result["peak_rss_mb"] / base["peak_rss_mb"] - 1
+
+        flags = []
+        if time_change > threshold:
+            flags.append("time")
+        if rss_change is not None and rss_change > threshold:
+            flags.append("RSS")
+        if result["photoimages"] > base["photoimages"]:
+            flags.append("PhotoImages")
+        if flags:
+            regressions.append((name, flags))
+
+        rss_text = f"{rss_change:+.1%}" if rss_change is not None else "n/a"
+        print(f"{name:<22}{result['time_min_ms']:>9.3f}ms{base['time_min_ms']:>10.3f}ms{time_change:>+9.1%}   {rss_text:>10}   "
+              f"{base['photoimages']} -> {result['photoimages']}{'   REGRESSION: ' + ', '.join(flags) if flags else ''}")
+
+    return regressions
+
+def print_report(report):
+
+    print(f"\n[Info] Display: {report['display']}, {report['params']['pets']} pets, "
+          f"{report['params']['frames']} frames per action at {report['params']['size'][0]}x{report['params']['size'][1]}, "
+          f"{report['params']['ticks']} ticks")
+    print(f"{'Benchmark':<22}{'median':>11}{'min':>11}{'peak RSS':>11}{'PhotoImages':>13}   Measures")
+    for name, result in report["results"].items():
+        rss = f"{result['peak_rss_mb']:.1f}MB" if result["peak_rss_mb"] is not None else "n/a"
+        print(f"{name:<22}{result['time_ms']:>9.3f}ms{result['time_min_ms']:>9.3f}ms{rss:>11}{result['photoimages']:>13}   "
+              f"{BENCHMARKS[name][2]}")
+        if name == "animate_tick":
+            print(f"{'':<22}p95 {result['p95_ms']:.3f}ms, max {result['max_ms']:.3f}ms, "
+                  f"redraw {result['redraw_mean_ms']:.3f}ms, {result['tk_calls_per_tick']:.2f} Tk calls per tick")
+
+def parse_size(text):
+
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height or width)
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Benchmark Virtual Pet Pal on synthetic pets.")
+    parser.add_argument("benchmarks", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--pets", type=int, default=DEFAULT_PETS, help="number of synthetic pets")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="frames per action")
+    parser.add_argument("--size", type=parse_size, default=(PET_FRAME_WIDTH, PET_FRAME_HEIGHT),
+                        help="frame size, e.g. 130x130")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="animation ticks to time")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="worker runs per benchmark")
+    parser.add_argument("--display", choices=["auto", "tk", "xvfb", "headless"], default="auto",
+                        help="where Tk benchmarks run (default: current display, else Xvfb, else headless)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to compare against or save to")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="allowed relative slowdown before a benchmark counts as regressed")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--assets", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        pet_names = [f"{BENCH_PET}{i + 1}" for i in range(args.pets)]
+        run_worker(args.worker, args.assets, pet_names, args.ticks)
+        return
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)} (choose from {', '.join(BENCHMARKS)})")
+
+    display, env, xvfb = resolve_display(args.display)
+    names = [name for name in args.benchmarks or BENCHMARKS if display != "headless" or not BENCHMARKS[name][0]]
+    params = {"pets": max(1, args.pets), "frames": args.frames, "size": list(args.size), "ticks": args.ticks}
+
+    assets_dir = tempfile.mkdtemp(prefix="vpp-bench-")
+    try:
+        start = time.perf_counter()
+        generate_assets(assets_dir, params["pets"], params["frames"], args.size)
+        print(f"[Info] Generated synthetic assets in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        results = {}
+        for name in names:
+            result = run_benchmark(name, assets_dir, params, env, max(1, args.repeat))
+            if result:
+                results[name] = result
+    finally:
+        shutil.rmtree(assets_dir, ignore_errors=True)
+        if xvfb:
+            xvfb.terminate()
+
+    report = {
+        "display": display,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+        "results": results,
+    }
+    print_report(report)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+        print(f"\n[Info] Saved baseline to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.threshold)
+        if regressions:
+            print(f"\n[Warning] {len(regressions)} benchmark(s) regressed against {args.baseline}")
+            sys.exit(1)
+    else:
+        print(f"\n[Info] No baseline at {args.baseline} to compare with. "
+              f"Run with --save-baseline first to record one on this machine.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Software compositor backend for Virtual Pet Pal.
+Instead of one Tk canvas item per sprite, health bar and mood label, every visible layer is
+alpha-blended with NumPy into one RGBA frame buffer, which is shown through a single PhotoImage.
+Only dirty rectangles are blended and copied to Tk: the areas of layers that moved or changed
+image since the previous frame.
+
+Layers are premultiplied RGBA arrays (see premultiply), so blending a layer is one multiply-add.
+NumPy is optional: without it AVAILABLE is False and the windows keep the canvas backend.
+Select the backend with RENDER_BACKEND in config.py or "python main.py --renderer compositor".
+"""
+
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+from config import FULL_HEALTH
+from health_bar import render_health_image, fill_width, FILL_BOX
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AVAILABLE = np is not None
+
+LABEL_COLOR = "white"
+LABEL_FONT = "arialbd.ttf"
+
+"""
+Converts a Pillow image to a premultiplied RGBA uint8 array, the form every layer is blended in.
+"""
+def premultiply(img):
+
+    pixels = np.array(img.convert("RGBA"), dtype=np.uint16)
+    alpha = pixels[..., 3:4]
+    pixels[..., :3] = (pixels[..., :3] * alpha + 127) // 255
+    return pixels.astype(np.uint8)
+
+"""
+Returns the premultiplied pixels of a text label, rendered once per text and size.
+"""
+@lru_cache(maxsize=64)
+def label_pixels(text, size=13):
+
+    try:
+        font = ImageFont.truetype(LABEL_FONT, size)
+    except OSError:
+        font = ImageFont.load_default()
+
+    left, top, right, bottom = ImageDraw.Draw(Image.new("RGBA", (1, 1))).textbbox((0, 0), text, font=font)
+    img = Image.new("RGBA", (max(1, right - left), max(1, bottom - top)), (0, 0, 0, 0))
+    ImageDraw.Draw(img).text((-left, -top), text, font=font, fill=LABEL_COLOR)
+    return premultiply(img)
+
+"""
+Returns the premultiplied pixels of the health bar for a health value, rendered once per visible fill width.
+"""
+def health_pixels(health, full_health=FULL_HEALTH):
+    return _health_pixels(fill_width(health, full_health))
+
+@lru_cache(maxsize=None)
+def _health_pixels(width):
+
+    # Rendering "width out of the full fill width" shows exactly width pixels of fill
+    return premultiply(render_health_image(width, FILL_BOX[2] - FILL_BOX[0] + 1))
+
+"""
+Compositor keeps the frame buffer and the layers drawn into it last time.
+It does not use Tk, so it can be driven and measured headless.
+"""
+class Compositor:
+
+    def __init__(self, width, height):
+
+        self.width = width
+        self.height = height
+        self.buffer = np.zeros((height, width, 4), dtype=np.uint8)
+        self._layers = {}
+        self.blended_pixels = 0
+
+    """
+    Draws layers, given in back-to-front order as (slot, x, y, pixels) where slot names the layer
+    from frame to frame (e.g. ("pet", 0, "sprite")). Returns the dirty rectangles (x0, y0, x1, y1)
+    that changed in the buffer.
+    """
+    def compose(self, layers):
+
+        current = {slot: (x, y, pixels) for slot, x, y, pixels in layers}
+        dirty = []
+        for slot in self._layers.keys() | current.keys():
+            old, new = self._layers.get(slot), current.get(slot)
+            if old is not None and new is not None and old[:2] == new[:2] and old[2] is new[2]:
+                continue
+            for layer in (old, new):
+                if layer is not None:
+                    dirty.append(self._bounds(*layer))
+
+        rects = self._merge([rect for rect in dirty if rect[0] < rect[2] and rect[1] < rect[3]])
+        for rect in rects:
+            x0, y0, x1, y1 = rect
+            self.buffer[y0:y1, x0:x1] = 0
+            for _, x, y, pixels in layers:
+                self._blend(pixels, x, y, rect)
+
+        self._layers = current
+        return rects
+
+    def _bounds(self, x, y, pixels):
+
+        height, width = pixels.shape[:2]
+        return max(0, x), max(0, y), min(self.width, x + width), min(self.height, y + height)
+
+    """
+    Merges overlapping rectangles, so no pixel is blended twice in one frame.
+    """
+    @staticmethod
+    def _merge(rects):
+
+        merged = []
+        for rect in rects:
+            while True:
+                for other in merged:
+                    if rect[0] < other[2] and other[0] < rect[2] and rect[1] < other[3] and other[1] < rect[3]:
+                        merged.remove(other)
+                        rect = (min(rect[0], other[0]), min(rect[1], other[1]),
+                                max(rect[2], other[2]), max(rect[3], other[3]))
+                        break
+                else:
+                    break
+            merged.append(rect)
+        return merged
+
+    """
+    Blends the part of a layer inside rect over the buffer ("source over", premultiplied).
+    """
+    def _blend(self, pixels, x, y, rect):
+
+        height, width = pixels.shape[:2]
+        x0, y0 = max(rect[0], x), max(rect[1], y)
+        x1, y1 = min(rect[2], x + width), min(rect[3], y + height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        src = pixels[y0 - y:y1 - y, x0 - x:x1 - x]
+        dst = self.buffer[y0:y1, x0:x1]
+        inverse_alpha = 255 - src[..., 3:4].astype(np.uint16)
+        dst[...] = src + (dst * inverse_alpha + 127) // 255
+        self.blended_pixels += (x1 - x0) * (y1 - y0)
+
+    """
+    Returns a rectangle of the buffer as a straight-alpha RGBA Pillow image, ready for Tk.
+    """
+    def region(self, rect):
+
+        x0, y0, x1, y1 = rect
+        pixels = self.buffer[y0:y1, x0:x1].astype(np.uint16)
+        alpha = pixels[..., 3:4]
+        pixels[..., :3] = np.minimum(255, (pixels[..., :3] * 255 + alpha // 2) // np.maximum(alpha, 1))
+        return Image.fromarray(pixels.astype(np.uint8))
+
+"""
+CompositedSurface shows a Compositor's buffer as one image item on a Tk canvas.
+Each dirty rectangle is copied into the window's PhotoImage, replacing its pixels and alpha.
+"""
+class CompositedSurface:
+
+    def __init__(self, canvas, width, height):
+
+        self.compositor = Compositor(width, height)
+        self.photo = ImageTk.PhotoImage("RGBA", (width, height))
+        self.item = canvas.create_image(0, 0, anchor="nw", image=self.photo)
+        self.blits = 0
+
+    """
+    Composites the layers and pushes the dirty rectangles to Tk. Returns the number of Tk calls made.
+    """
+    def draw(self, layers):
+
+        rects = self.compositor.compose(layers)
+        for rect in rects:
+            patch = ImageTk.PhotoImage(self.compositor.region(rect))
+            self.photo.tk.call(str(self.photo), "copy", str(patch), "-to", rect[0], rect[1],
+                               "-compositingrule", "set")
+        self.blits += len(rects)
+        return len(rects)
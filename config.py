@@ -4,14 +4,50 @@ Defines constant values used throughout the application.
 """
 
 # --- Pet Settings ---
-PET_LIST = ["Dog", "Cat", "Minotaur", "Werewolf"]
-DEFAULT_PET = "Dog"
+DEFAULT_PET = "Dog"  # selected first in the pet selector if installed
 PET_PLAY_SPEED = 10
 PET_FRAME_WIDTH = 130  
 PET_FRAME_HEIGHT = 130  
+PET_SCALE = 1.0  # sprite size; "auto" follows the screen DPI (96 DPI is 1.0)
+SCALE_STEP = 0.25  # scales are rounded to this step, so each screen reuses a few cached sizes
+SCALE_FILTER = "lanczos"  # resampling filter for scaled sprites: "nearest" (pixel art), "bilinear" or "lanczos"
+MULTI_PET_AREA_HEIGHT = 300  # height of the strip hosting pets in multi-pet mode
+HIT_ALPHA_THRESHOLD = 32  # pixels at least this opaque respond to clicks
+HIT_GRID_CELL = 64  # pixels per cell of the grid that finds the pets under a click
 
 # --- Animation Settings ---
+ACTIONS = ["Idle", "Action", "Sleep", "Play"]  # the animation folders every pet needs
 ANIMATION_DELAY = 120  # milliseconds
+FRAME_CACHE_BUDGET = 8 * 1024 * 1024  # bytes of decoded frames kept per process
+RENDER_BACKEND = "canvas"  # "canvas" (one Tk item per sprite) or "compositor" (NumPy blending into one image)
+
+# --- Scheduler Settings ---
+SCHEDULER_TICK = 10  # milliseconds per timer wheel slot; timers due in the same slot run together
+SCHEDULER_SLOTS = 512
+SCHEDULER_MAX_CATCH_UP = 100  # missed runs replayed after a stall before skipping the rest
+
+# --- Loading Settings ---
+PACK_DIRS = []  # extra folders of .vpp pet packs, absolute or relative to the app folder
+PARALLEL_LOADING = False  # decode PNGs on a thread pool
+LOADER_WORKERS = 4
+REPORT_LOAD_TIMES = False  # print wall-clock time of each load
+PROGRESSIVE_LOADING = True  # show the first Idle frame at once and decode its action in the background
+PROGRESSIVE_PREFETCH = False  # also decode every other action and direction in the background up front
+PROGRESSIVE_POLL_INTERVAL = 30  # milliseconds between checks for frames decoded in the background
+REPORT_RENDER_STATS = False  # print animation ticks, Tk calls and wakeups/s on close
+
+# --- Startup Settings ---
+FAST_START = False  # start the pet last chosen in the selector without showing the selector
+REPORT_STARTUP = False  # print import times and the time from process start to the first frame
+
+# --- Profiling Settings ---
+PROFILE_OUTPUT = "vpp_profile"  # written as vpp_profile.json and vpp_profile.csv when profiling
+PROFILE_MAX_SAMPLES = 100000  # raw callback samples kept for the CSV export
+PROFILE_OVERLAY_INTERVAL = 1000  # milliseconds between overlay refreshes
+
+# --- Persistence Settings ---
+PERSIST_STATE = True  # keep health, action and sleep state between runs in pet_state.json
+STATE_SAVE_INTERVAL = 10000  # milliseconds; at most one state write per interval while the pet changes
 
 # --- Health Settings ---
 FULL_HEALTH = 56
@@ -21,3 +57,5 @@ SLEEP_HEALTH_THRESHOLD = 20
 # --- Action Timings ---
 ACTION_INTERVAL = 15000  # milliseconds
 ACTION_DURATION = 3000   # milliseconds
+PLAY_DURATION = 3000     # milliseconds
+PLAY_HEALTH_DECREASE_INTERVAL = 500  # milliseconds
@@ -0,0 +1,142 @@
+"""
+Lazy frame cache for Virtual Pet Pal.
+Decodes an action's frames, in one direction, the first time they are requested
+and keeps them within a memory budget, evicting the least recently used actions first.
+"""
+
+from collections import OrderedDict
+from PIL import ImageTk
+
+from config import FRAME_CACHE_BUDGET
+from pet_loader import load_action_images, frame_offset, frame_mask, mask_hit
+
+"""
+FrameSet holds the images of one action in one direction (PhotoImages, or whatever the cache's convert
+function makes of them), where each one is drawn relative to the full frame (non-zero for trimmed frames),
+and the number of bytes their decoded RGBA pixels occupy.
+With masks and sizes (see pet_loader.alpha_mask), hit() tells whether a point lies on a visible pixel.
+"""
+class FrameSet:
+
+    def __init__(self, images, offsets=None, nbytes=None, masks=None, sizes=None):
+
+        self.images = images
+        self.offsets = offsets or [(0, 0)] * len(images)
+        self.nbytes = nbytes if nbytes is not None else sum(img.width() * img.height() * 4 for img in images)
+        self.masks = masks
+        self.sizes = sizes
+
+    """
+    Returns True if the point (x, y), relative to the full frame's top-left corner, lies on a pixel
+    of frame index that responds to clicks. Sets made by FrameCache always carry masks.
+    """
+    def hit(self, index, x, y):
+
+        if self.masks is None:
+            return False
+        x -= self.offsets[index][0]
+        y -= self.offsets[index][1]
+        width, height = self.sizes[index]
+        return 0 <= x < width and 0 <= y < height and mask_hit(self.masks[index], width, x, y)
+
+"""
+FrameCache maps (pet, action, direction) to a FrameSet, decoding on first use.
+The most recently requested set is never evicted, even if it alone exceeds the budget,
+so the animation currently on screen always stays resident.
+convert turns each decoded Pillow frame into what the renderer draws; PhotoImages by default.
+"""
+class FrameCache:
+
+    def __init__(self, budget_bytes=FRAME_CACHE_BUDGET, convert=None):
+
+        self.budget_bytes = budget_bytes
+        self.convert = convert or ImageTk.PhotoImage
+        self._sets = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    """
+    Returns the PhotoImages for an action facing "right" or "left".
+    Returns an empty list if the action has no frames.
+    """
+    def get(self, pet_name, action, direction="right"):
+        return self.get_set(pet_name, action, direction).images
+
+    """
+    Returns the FrameSet for an action facing "right" or "left", with the frame offsets renderers need
+    to place trimmed frames.
+    """
+    def get_set(self, pet_name, action, direction="right"):
+
+        frame_set = self.peek(pet_name, action, direction)
+        if frame_set is not None:
+            return frame_set
+
+        self.misses += 1
+        images = load_action_images(pet_name, action, direction, masks=True) or []
+        return self.put(pet_name, action, direction, images)
+
+    """
+    Returns the FrameSet for an action if it is resident, or None, without decoding anything.
+    """
+    def peek(self, pet_name, action, direction="right"):
+
+        key = (pet_name, action, direction)
+        frame_set = self._sets.get(key)
+        if frame_set is not None:
+            self.hits += 1
+            self._sets.move_to_end(key)
+        return frame_set
+
+    """
+    Converts decoded Pillow frames into a FrameSet without storing it.
+    PhotoImages are created here, so this must run on the Tk thread.
+    """
+    def make_set(self, images):
+
+        masks = [frame_mask(img) for img in images]
+        return FrameSet([self.convert(img) for img in images], [frame_offset(img) for img in images],
+                        sum(img.width * img.height * 4 for img in images) + sum(len(mask) for mask in masks),
+                        masks, [img.size for img in images])
+
+    """
+    Stores frames decoded elsewhere (e.g. by a background thread) as the FrameSet of an action.
+    Must run on the Tk thread, like make_set.
+    """
+    def put(self, pet_name, action, direction, images):
+
+        frame_set = self.make_set(images)
+        self._sets[(pet_name, action, direction)] = frame_set
+        self._evict()
+        return frame_set
+
+    """
+    Drops least recently used sets until the cache fits the budget again.
+    """
+    def _evict(self):
+
+        while len(self._sets) > 1 and self.resident_bytes() > self.budget_bytes:
+            self._sets.popitem(last=False)
+            self.evictions += 1
+
+    """
+    Returns the bytes held for one pet, or for every pet if pet_name is None.
+    """
+    def resident_bytes(self, pet_name=None):
+
+        return sum(frame_set.nbytes for (pet, _, _), frame_set in self._sets.items()
+                   if pet_name is None or pet == pet_name)
+
+    """
+    Returns a mapping of pet name to resident bytes.
+    """
+    def report(self):
+
+        usage = {}
+        for (pet, _, _), frame_set in self._sets.items():
+            usage[pet] = usage.get(pet, 0) + frame_set.nbytes
+        return usage
+
+    def clear(self):
+        self._sets.clear()
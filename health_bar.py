@@ -0,0 +1,124 @@
+"""
+Procedural health bar for Virtual Pet Pal.
+Draws the health bar from one frame/fill template instead of loading a PNG per health value,
+so any FULL_HEALTH works without new art.
+Both templates are cut from the shipped Assets/Health_Bar images (80x80): the frame, with its drop shadow,
+is the empty level 1.png and the fill is the full level's FILL_BOX. Empty and full health look exactly like
+the originals; in between, the fill ends in a straight cut instead of the originals' soft right edge.
+Without those images a plain blue fill in a black frame of the same geometry is drawn instead.
+"""
+
+from PIL import Image, ImageDraw, ImageTk
+
+from config import FULL_HEALTH
+from health_math import FILL_BOX, fill_width
+
+BAR_WIDTH, BAR_HEIGHT = 80, 80
+# Measured from the shipped images, inclusive corners; FILL_BOX is in health_math.py
+FRAME_BOX = (4, 28, 75, 44)  # frame and drop shadow
+INNER_BOX = (6, 30, 73, 41)  # solid part of the fill, for the drawn fallback
+FRAME_COLOR = "#000000"
+FILL_COLOR = "#1f51ff"
+
+_templates = None
+
+"""
+Returns the empty and the full level of the shipped health bar as RGBA images,
+from a compiled pack, the Assets folder or Assets.zip, or (None, None) if they are missing.
+"""
+def _load_levels():
+
+    import pet_loader  # only needed once the templates are built
+
+    pack = pet_loader._find_pack("Health_Bar")
+    if pack:
+        images = pack.images("Health_Bar")
+        return images[0].convert("RGBA"), images[-1].convert("RGBA")
+
+    files, open_image = pet_loader._find_asset_dir("Health_Bar")
+    levels = sorted(int(name[:-4]) for name in files or () if name[:-4].isdigit())
+    if not levels:
+        return None, None
+    return open_image(f"{levels[0]}.png").convert("RGBA"), open_image(f"{levels[-1]}.png").convert("RGBA")
+
+"""
+Builds the two template images every level is composed from: the empty frame and the full fill.
+"""
+def build_templates():
+
+    try:
+        empty, full = _load_levels()
+    except (OSError, ValueError) as e:
+        print(f"[Warning] Could not load the health bar images: {e}")
+        empty = full = None
+
+    if empty is None or empty.size != (BAR_WIDTH, BAR_HEIGHT) or full.size != empty.size:
+        empty = Image.new("RGBA", (BAR_WIDTH, BAR_HEIGHT), (0, 0, 0, 0))
+        ImageDraw.Draw(empty).rectangle((FRAME_BOX[0], FRAME_BOX[1], FRAME_BOX[2], FRAME_BOX[3] - 1),
+                                        outline=FRAME_COLOR)
+        full = empty.copy()
+        ImageDraw.Draw(full).rectangle(INNER_BOX, fill=FILL_COLOR)
+
+    return empty, full.crop((FILL_BOX[0], FILL_BOX[1], FILL_BOX[2] + 1, FILL_BOX[3] + 1))
+
+"""
+Returns the templates shared by every health bar, built on first use.
+"""
+def get_templates():
+
+    global _templates
+    if _templates is None:
+        _templates = build_templates()
+    return _templates
+
+"""
+Renders one health level as an RGBA Pillow image by pasting part of the fill into the frame.
+"""
+def render_health_image(health, full_health=FULL_HEALTH, templates=None):
+
+    frame, fill = templates or get_templates()
+    image = frame.copy()
+    width = fill_width(health, full_health)
+    if width:
+        image.paste(fill.crop((0, 0, width, fill.height)), (FILL_BOX[0], FILL_BOX[1]))
+    return image
+
+"""
+HealthBar draws the bar as one image item on a Tk canvas.
+set_health only redraws the image, and only when the visible width of the fill changes.
+"""
+class HealthBar:
+
+    def __init__(self, canvas, x=0, y=0, full_health=FULL_HEALTH):
+
+        self.canvas = canvas
+        self.full_health = full_health
+        self.x, self.y = x, y
+        self._width = None
+
+        self.photo = ImageTk.PhotoImage("RGBA", (BAR_WIDTH, BAR_HEIGHT))
+        self.item = canvas.create_image(x, y, anchor="nw", image=self.photo)
+
+    """
+    Moves the bar so its 80x80 box starts at (x, y) on the canvas.
+    """
+    def move(self, x, y):
+
+        self.x, self.y = x, y
+        self.canvas.coords(self.item, x, y)
+
+    """
+    Shows the given health value. Returns True if the canvas had to be updated.
+    """
+    def set_health(self, health):
+        return self.set_health_width(fill_width(health, self.full_health))
+
+    def set_health_width(self, width):
+
+        if width == self._width:
+            return False
+        self._width = width
+
+        # The fill width stands in for the health, over a full health of the whole fill
+        self.photo.paste(render_health_image(width, FILL_BOX[2] - FILL_BOX[0] + 1))
+        return True
@@ -0,0 +1,18 @@
+"""
+Health bar geometry for Virtual Pet Pal, without any Tk or Pillow code.
+Shared by health_bar.py, which draws the bar, and pet_engine.py, which only needs to know
+which health values change what the bar shows.
+"""
+
+from config import FULL_HEALTH
+
+# Measured from the shipped Assets/Health_Bar images, inclusive corners
+FILL_BOX = (5, 28, 74, 43)  # pixels the fill changes, growing from the left
+
+"""
+Returns how many pixels of the fill are shown for a health value.
+"""
+def fill_width(health, full_health=FULL_HEALTH):
+
+    health = max(0, min(health, full_health))
+    return round((FILL_BOX[2] - FILL_BOX[0] + 1) * health / full_health)
@@ -0,0 +1,72 @@
+"""
+Spatial index for click hit testing in Virtual Pet Pal.
+Buckets the pets' frame boxes into a uniform grid, so a click only tests the pets whose box
+overlaps the clicked cell instead of every pet. Moving a pet touches only the cells it enters or leaves,
+which keeps updates cheap while Play moves pets every tick.
+"""
+
+from config import HIT_GRID_CELL
+
+"""
+HitGrid maps grid cells to the keys whose boxes overlap them.
+Boxes are (x0, y0, x1, y1) with x1 and y1 exclusive.
+"""
+class HitGrid:
+
+    def __init__(self, cell_size=HIT_GRID_CELL):
+
+        self.cell_size = cell_size
+        self._cells = {}
+        self._boxes = {}
+        self._key_cells = {}
+
+    def _cells_of(self, box):
+
+        x0, y0, x1, y1 = box
+        size = self.cell_size
+        return {(cx, cy) for cx in range(x0 // size, (x1 - 1) // size + 1)
+                for cy in range(y0 // size, (y1 - 1) // size + 1)}
+
+    """
+    Places or moves a key's box. Only the cells the box enters or leaves are touched.
+    """
+    def update(self, key, box):
+
+        if self._boxes.get(key) == box:
+            return
+        self._boxes[key] = box
+
+        old_cells = self._key_cells.get(key, set())
+        new_cells = self._cells_of(box) if box[0] < box[2] and box[1] < box[3] else set()
+        for cell in old_cells - new_cells:
+            keys = self._cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self._cells[cell]
+        for cell in new_cells - old_cells:
+            self._cells.setdefault(cell, set()).add(key)
+        self._key_cells[key] = new_cells
+
+    def remove(self, key):
+
+        for cell in self._key_cells.pop(key, ()):
+            keys = self._cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self._cells[cell]
+        self._boxes.pop(key, None)
+
+    """
+    Returns the keys whose box contains the point (x, y), in no particular order.
+    """
+    def query(self, x, y):
+
+        keys = self._cells.get((x // self.cell_size, y // self.cell_size), ())
+        return [key for key in keys if self._contains(self._boxes[key], x, y)]
+
+    @staticmethod
+    def _contains(box, x, y):
+        return box[0] <= x < box[2] and box[1] <= y < box[3]
+
+    def __len__(self):
+        return len(self._boxes)
@@ -2,21 +2,128 @@
 Entry point for Virtual Pet Pal.
 Runs the pet selection popup and launches the main application window
 with the selected pet.
+Pass --pets to host several pets in one window instead, e.g.
+    python main.py --pets Dog Cat Minotaur --count 10
+Pass --profile to record callback timings (see profiler.py).
+Pass --renderer compositor to draw through the NumPy compositor (see compositor.py).
+Pass --launch to run one window process per pet, sharing decoded frames (see shared_frames.py), e.g.
+    python main.py --launch Dog Dog Cat
+Pass --scale 2 (or --scale auto for the screen DPI) to enlarge the pet; see PET_SCALE in config.py.
+Pass --fast-start (or set FAST_START) to start the pet last chosen in the selector straight away.
+Modules are imported only when the chosen path needs them, so a fast start never loads the selector;
+--startup-report prints what each import cost (see startup.py).
 """
 
-from pet_selector import show_popup
-from pet_window import run_main_app
+import startup
+import argparse
+import os
+
+from config import RENDER_BACKEND, FAST_START, REPORT_STARTUP, PET_SCALE
+
+"""
+Parses a --scale value: a positive number or "auto".
+"""
+def scale_setting(value):
+
+    if value == "auto":
+        return value
+    try:
+        scale = float(value)
+    except ValueError:
+        scale = 0
+    if scale <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive number or 'auto', got '{value}'")
+    return scale
+
+"""
+Returns the pet remembered from the last selection if it can start without the selector,
+i.e. it is still installed with every action, otherwise None.
+"""
+def remembered_pet():
+
+    pet_state = startup.timed_import("pet_state")
+    pet_name = pet_state.load_last_pet()
+    if not pet_name:
+        return None
+
+    manifest = startup.timed_import("asset_manifest").get_manifest()
+    if pet_name not in manifest.pet_names() or not manifest.is_complete(pet_name):
+        print(f"[Warning] Remembered pet '{pet_name}' is no longer installed or complete. Showing the selector.")
+        return None
+    return pet_name
+
+"""
+Shows the selector and remembers the chosen pet for the next fast start.
+"""
+def select_pet(scale):
+
+    selected_pet = startup.timed_import("pet_selector").show_popup(scale)
+    if selected_pet:
+        startup.timed_import("pet_state").save_last_pet(selected_pet)
+    return selected_pet
 
 def main():
 
-    selected_pet = show_popup()
+    parser = argparse.ArgumentParser(description="Virtual Pet Pal")
+    parser.add_argument("--pets", nargs="+", metavar="PET",
+                        help="host these pets in one window instead of showing the selector")
+    parser.add_argument("--count", type=int, default=1,
+                        help="repeat the --pets list this many times")
+    parser.add_argument("--profile", action="store_true",
+                        help="record timer lateness, callback durations and action switches, written on exit")
+    parser.add_argument("--profile-overlay", action="store_true",
+                        help="like --profile, and show the live numbers on the pet window")
+    parser.add_argument("--profile-out", metavar="PREFIX",
+                        help="like --profile, and write the profile to PREFIX.json and PREFIX.csv")
+    parser.add_argument("--renderer", choices=["canvas", "compositor"], default=RENDER_BACKEND,
+                        help="draw with one canvas item per sprite, or composite everything into one image")
+    parser.add_argument("--launch", nargs="+", metavar="PET",
+                        help="run each of these pets in its own window process, decoding each pet type once")
+    parser.add_argument("--pet", help="start this pet without showing the selector")
+    parser.add_argument("--scale", type=scale_setting, default=PET_SCALE,
+                        help="sprite scale, e.g. 1.5, or 'auto' to follow the screen DPI")
+    parser.add_argument("--fast-start", action="store_true", default=FAST_START,
+                        help="start the pet last chosen in the selector without showing the selector")
+    parser.add_argument("--select", action="store_true",
+                        help="show the selector even when fast start is on")
+    parser.add_argument("--startup-report", action="store_true", default=REPORT_STARTUP,
+                        help="print import times and the time until the first frame")
+    parser.add_argument("--shared-frames", metavar="SEGMENT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.launch:
+        startup.timed_import("shared_frames").run_supervisor(args.launch, ["--renderer", args.renderer], args.scale)
+        return
+    if args.shared_frames:
+        startup.timed_import("shared_frames").attach(args.shared_frames)
+
+    # profiler.py is imported only when profiling is asked for; PROFILE_ENV there is read the same way
+    profiler = None
+    profile_env = os.environ.get("VPP_PROFILE", "").strip().lower() not in ("", "0", "false", "no", "off")
+    if args.profile or args.profile_overlay or args.profile_out or profile_env:
+        profiler = startup.timed_import("profiler").create_profiler(args.profile, args.profile_overlay,
+                                                                    args.profile_out)
+
+    if args.pets:
+        startup.timed_import("multi_pet").run_multi_pet(args.pets * max(args.count, 1), profiler, args.renderer,
+                                                        args.scale)
+        return
+
+    selected_pet = args.pet
+    if not selected_pet and args.fast_start and not args.select:
+        selected_pet = remembered_pet()
+    if not selected_pet:
+        selected_pet = select_pet(args.scale)
 
     # Exit gracefully if no pet was selected
     if not selected_pet:
         print("Pet selection cancelled. Exiting application.")
         return
 
-    run_main_app(selected_pet)
+    run_main_app = startup.timed_import("pet_window").run_main_app
+    if args.startup_report:
+        startup.report("Starting the pet window")
+    run_main_app(selected_pet, profiler, args.renderer, started=startup.PROCESS_START, scale=args.scale)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,300 @@
+"""
+Multi-pet mode for Virtual Pet Pal.
+Hosts many pets in one borderless window along the bottom of the screen.
+Pets of the same type share their decoded frames, every pet gets its own engine
+(health, mood, action and position), and one tick advances all of them.
+"""
+
+import sys
+import time
+import tkinter as tk
+
+from config import (ANIMATION_DELAY, FRAME_CACHE_BUDGET, MULTI_PET_AREA_HEIGHT, RENDER_BACKEND, PET_SCALE,
+                    PET_PLAY_SPEED)
+from asset_manifest import get_manifest
+from health_bar import HealthBar, BAR_WIDTH, BAR_HEIGHT
+from frame_cache import FrameCache
+from pet_engine import PetEngine, PetAnimation
+from scheduler import Scheduler, TkDriver
+from hit_grid import HitGrid
+from pet_loader import set_scale
+from scaled_cache import resolve_scale, scaled_size
+
+FRAME_BUDGET_MS = 1000 / 60  # a tick slower than this would miss a 60fps frame
+
+"""
+HostedPet owns the canvas items of one pet and remembers what they currently show,
+so a tick only issues Tk calls for properties that changed.
+"""
+class HostedPet:
+
+    def __init__(self, canvas, pet_name, engine, animation, y, frame_w, frame_h):
+
+        self.pet_name = pet_name
+        self.engine = engine
+        self.animation = animation
+        self.y = y
+        self.frame_w = frame_w
+        self.frame_h = frame_h
+
+        self.canvas = canvas
+        self.sprite = canvas.create_image(animation.x, y, anchor="nw")
+        self.health_bar = HealthBar(canvas, *self._health_bar_origin(animation.x))
+        self.mood_item = canvas.create_text(animation.x + frame_w // 2, y - 20, font=("Arial", 8, "bold"),
+                                            fill="white")
+
+        self._x = animation.x
+        self._position = None
+        self._image = None
+        self._mood = None
+        self._shown = (None, 0)
+
+    def _health_bar_origin(self, x):
+        return x + self.frame_w // 2 - BAR_WIDTH // 2, self.y - 10 - BAR_HEIGHT
+
+    """
+    Returns the box of this pet's full frame, as (x0, y0, x1, y1), for the hit grid.
+    """
+    def bounds(self):
+        return self._x, self.y, self._x + self.frame_w, self.y + self.frame_h
+
+    """
+    Returns True if the canvas point lies on a visible pixel of the frame currently shown.
+    """
+    def hit(self, px, py):
+
+        frame_set, index = self._shown
+        return frame_set is not None and frame_set.hit(index, px - self._x, py - self.y)
+
+    """
+    Pushes the pet's current state to its canvas items, skipping unchanged ones.
+    Trimmed frames are placed at their offset inside the full frame.
+    """
+    def render(self, frame_set):
+
+        x = self.animation.x
+        if x != self._x:
+            self._x = x
+            self.health_bar.move(*self._health_bar_origin(x))
+            self.canvas.coords(self.mood_item, x + self.frame_w // 2, self.y - 20)
+
+        frames = frame_set.images
+        self._shown = (frame_set if frames else None, self.animation.frame_index)
+        offset_x, offset_y = frame_set.offsets[self.animation.frame_index] if frames else (0, 0)
+        position = (x + offset_x, self.y + offset_y)
+        if position != self._position:
+            self._position = position
+            self.canvas.coords(self.sprite, *position)
+
+        image = frames[self.animation.frame_index] if frames else ""
+        if image is not self._image:
+            self._image = image
+            self.canvas.itemconfig(self.sprite, image=image)
+
+        self.health_bar.set_health(self.engine.health)
+
+        if self.engine.mood != self._mood:
+            self._mood = self.engine.mood
+            self.canvas.itemconfig(self.mood_item, text=self._mood)
+
+"""
+CompositedHostedPet is a HostedPet without canvas items: it describes its sprite, health bar and mood
+as compositor layers, and the window composites every pet into one image (see compositor.py).
+"""
+class CompositedHostedPet(HostedPet):
+
+    def __init__(self, pet_name, engine, animation, y, frame_w, frame_h):
+
+        self.pet_name = pet_name
+        self.engine = engine
+        self.animation = animation
+        self.y = y
+        self.frame_w = frame_w
+        self.frame_h = frame_h
+        self._x = animation.x
+        self._shown = (None, 0)
+
+    """
+    Returns this pet's layers, back to front, under slots unique to slot_id.
+    """
+    def layers(self, slot_id, frame_set):
+
+        from compositor import label_pixels, health_pixels  # NumPy is only imported with this renderer
+
+        x = self._x = self.animation.x
+        layers = []
+
+        frames = frame_set.images
+        self._shown = (None, 0)
+        if frames:
+            index = self.animation.frame_index % len(frames)
+            self._shown = (frame_set, index)
+            offset_x, offset_y = frame_set.offsets[index]
+            layers.append(((slot_id, "sprite"), x + offset_x, self.y + offset_y, frames[index]))
+
+        layers.append(((slot_id, "health"), *self._health_bar_origin(x), health_pixels(self.engine.health)))
+
+        label = label_pixels(self.engine.mood, 11)
+        layers.append(((slot_id, "mood"), x + self.frame_w // 2 - label.shape[1] // 2,
+                       self.y - 20 - label.shape[0] // 2, label))
+        return layers
+
+"""
+Runs one window hosting a pet for every entry of pet_names (names may repeat).
+Left click starts play, right click feeds the pet under the cursor.
+If a profiler is given (see profiler.py), every timer callback and action switch is recorded.
+renderer is "canvas" (canvas items per pet) or "compositor" (every pet composited into one image, needs NumPy).
+scale sizes the pets (a number, or "auto" for the screen DPI), as in run_main_app.
+"""
+def run_multi_pet(pet_names, profiler=None, renderer=RENDER_BACKEND, scale=PET_SCALE):
+
+    manifest = get_manifest()
+    pet_types = [pet for pet in dict.fromkeys(pet_names) if manifest.is_complete(pet)]
+    for pet in dict.fromkeys(pet_names):
+        if pet not in pet_types:
+            print(f"[Warning] Animation frames missing or incomplete for '{pet}'. Skipping it.")
+    pet_names = [pet for pet in pet_names if pet in pet_types]
+    if not pet_names:
+        sys.exit(1)
+
+    root_window = tk.Tk()
+    root_window.overrideredirect(True)
+    root_window.attributes("-topmost", True)
+
+    transparent_color = "magenta"
+    root_window.config(bg=transparent_color)
+    root_window.wm_attributes("-transparentcolor", transparent_color)
+
+    scale = resolve_scale(scale, root_window)
+    set_scale(scale)
+
+    window_width = root_window.winfo_screenwidth()
+    window_height = max(MULTI_PET_AREA_HEIGHT, round(MULTI_PET_AREA_HEIGHT * scale))
+    root_window.geometry(f"{window_width}x{window_height}+0+{root_window.winfo_screenheight() - window_height - 40}")
+
+    canvas = tk.Canvas(root_window, width=window_width, height=window_height, bg=transparent_color,
+                       highlightthickness=0)
+    canvas.place(x=0, y=0)
+
+    compositing = renderer == "compositor"
+    if compositing:
+        import compositor  # NumPy is only imported with this renderer
+        if not compositor.AVAILABLE:
+            print("[Warning] The compositor renderer needs NumPy. Using the canvas renderer instead.")
+            compositing = False
+    surface = compositor.CompositedSurface(canvas, window_width, window_height) if compositing else None
+
+    # One frame cache for all pets, sized so every pet type can stay resident
+    frame_cache = FrameCache(FRAME_CACHE_BUDGET * len(pet_types), convert=compositor.premultiply if compositing else None)
+    scheduler = Scheduler()
+    driver = TkDriver(scheduler, root_window)
+
+    pets = []
+    lanes = 3
+    for i, pet_name in enumerate(pet_names):
+        frame_w, frame_h = scaled_size(manifest.frame_size(pet_name), scale)
+
+        engine = PetEngine(scheduler=scheduler)
+        spacing = max(1, window_width - frame_w)
+        animation = PetAnimation(engine, (i * 97) % spacing, speed=max(1, round(PET_PLAY_SPEED * scale)))
+        y = window_height - frame_h - 10 - (i % lanes) * 15
+        if surface:
+            pets.append(CompositedHostedPet(pet_name, engine, animation, y, frame_w, frame_h))
+        else:
+            pets.append(HostedPet(canvas, pet_name, engine, animation, y, frame_w, frame_h))
+        if profiler:
+            profiler.watch_engine(engine, f"{pet_name}#{i}")
+
+    if profiler:
+        scheduler.profiler = profiler
+        if profiler.overlay:
+            from profiler import ProfilerOverlay  # loaded only when profiling
+
+            ProfilerOverlay(canvas, profiler, scheduler)
+
+    stats = {"ticks": 0, "total_ms": 0.0, "max_ms": 0.0, "over_budget": 0}
+
+    # Pets are keyed by their index, which is also their drawing order
+    hit_grid = HitGrid()
+
+    """
+    Returns the topmost pet with a visible pixel under a canvas point, or None.
+    Only the pets whose frame box overlaps the point's grid cell are tested.
+    """
+    def pet_at(px, py):
+
+        for i in sorted(hit_grid.query(px, py), reverse=True):
+            if pets[i].hit(px, py):
+                return pets[i]
+        return None
+
+    def on_left_click(event):
+
+        pet = pet_at(event.x, event.y)
+        if pet:
+            pet.engine.start_play()
+
+    def on_right_click(event):
+
+        pet = pet_at(event.x, event.y)
+        if pet:
+            pet.engine.feed()
+
+    def feed_all():
+
+        for pet in pets:
+            pet.engine.feed()
+
+    """
+    The shared render tick: advances and renders every pet. It runs on the same scheduler
+    as every engine timer, so engine work due in the same wheel tick is handled in one wakeup.
+    """
+    def tick():
+
+        start = time.perf_counter()
+
+        layers = []
+        for i, pet in enumerate(pets):
+            frame_set = frame_cache.get_set(pet.pet_name, pet.engine.action, pet.animation.direction)
+            pet.animation.step(len(frame_set.images), window_width - pet.frame_w)
+            frame_set = frame_cache.get_set(pet.pet_name, pet.engine.action, pet.animation.direction)
+            if surface:
+                layers += pet.layers(i, frame_set)
+            else:
+                pet.render(frame_set)
+            hit_grid.update(i, pet.bounds())
+        if surface:
+            surface.draw(layers)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats["ticks"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        stats["over_budget"] += elapsed_ms > FRAME_BUDGET_MS
+
+    def close():
+
+        if stats["ticks"]:
+            print(f"[Info] {len(pets)} pets, {stats['ticks']} ticks, "
+                  f"mean {stats['total_ms'] / stats['ticks']:.2f} ms, max {stats['max_ms']:.2f} ms, "
+                  f"{stats['over_budget']} over the {FRAME_BUDGET_MS:.1f} ms frame budget")
+        lateness = scheduler.metrics.summary()
+        print(f"[Info] Timer lateness: mean {lateness['mean_lateness_ms']:.2f} ms, "
+              f"max {lateness['max_lateness_ms']:.2f} ms, {lateness['skipped']} skipped")
+        driver.stop()
+        root_window.destroy()
+
+    ui_frame = tk.Frame(canvas, bg=transparent_color)
+    tk.Button(ui_frame, text="Feed All", command=feed_all).grid(row=0, column=0, padx=10)
+    tk.Button(ui_frame, text="Close", command=close).grid(row=0, column=1, padx=10)
+    canvas.create_window(window_width - 10, 5, anchor="ne", window=ui_frame)
+
+    canvas.bind("<Button-1>", on_left_click)
+    canvas.bind("<Button-3>", on_right_click)
+
+    for pet in pets:
+        pet.engine.start()
+    scheduler.call_every(ANIMATION_DELAY, tick, first_delay=0)
+    driver.arm()
+
+    root_window.mainloop()
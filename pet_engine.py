@@ -0,0 +1,515 @@
+"""
+Headless pet simulation engine for Virtual Pet Pal.
+Holds the pet's behaviour (actions, health, mood, play and sleep rules) without any Tk code.
+Time comes from an injectable clock, so the same engine drives the desktop window in real time
+or simulates hours of pet life in milliseconds on a VirtualClock:
+
+    clock = VirtualClock()
+    engine = PetEngine(clock)
+    engine.start()
+    engine.advance(60 * 60 * 1000)  # one hour of pet life
+    print(engine.health, engine.action)
+
+Health is a function of time and the current decay rate (normal, playing or asleep). Decay ticks that
+change nothing but the value are counted when health is read instead of being run, so the engine
+only wakes up for the next health event: a visible health bar step, the SLEEP_HEALTH_THRESHOLD
+crossing or the floor at 2.
+"""
+
+import math
+import sys
+
+from config import (
+    ACTIONS, PET_PLAY_SPEED, HEALTH_DECREASE_INTERVAL, ACTION_INTERVAL, ACTION_DURATION, SLEEP_HEALTH_THRESHOLD,
+    FULL_HEALTH, PLAY_DURATION, PLAY_HEALTH_DECREASE_INTERVAL
+)
+
+from scheduler import Scheduler, MonotonicClock, VirtualClock
+from health_math import fill_width
+
+# Play drains run at play start and every PLAY_HEALTH_DECREASE_INTERVAL until PLAY_DURATION is over
+PLAY_TICKS = math.ceil(PLAY_DURATION / PLAY_HEALTH_DECREASE_INTERVAL)
+
+"""
+Returns how many ticks of the series anchor, anchor + interval, ... fall at or before time.
+The count is checked against the tick times themselves, so rounding never counts a tick twice or skips it.
+"""
+def _ticks_upto(anchor, interval, time):
+
+    if time < anchor:
+        return 0
+    ticks = int((time - anchor) // interval) + 1
+    while anchor + ticks * interval <= time:
+        ticks += 1
+    while ticks > 1 and anchor + (ticks - 1) * interval > time:
+        ticks -= 1
+    return ticks
+
+"""
+PetEngine is the pet's state machine: the same rules the window used to run in closures,
+driven by timers on a shared Scheduler instead of root_window.after.
+Every timer keeps its handle, so feeding or playing cancels stale follow-ups.
+Listeners are called with "action", "health" or "mood" whenever that part of the state changes;
+"health" is reported for every visible health bar step, not for every point lost.
+"""
+class PetEngine:
+
+    def __init__(self, clock=None, scheduler=None):
+
+        if clock is None:
+            clock = scheduler.clock if scheduler is not None else MonotonicClock()
+        self.clock = clock
+        self.scheduler = scheduler if scheduler is not None else Scheduler(clock)
+
+        self.action = "Idle"
+        self.is_playing = False
+        self.is_sleeping = False
+        self.mood = "Happy"
+
+        self._stop_play_job = None
+        self._action_end_job = None
+        self._periodic_jobs = []
+        self._listeners = []
+
+        # Health decay phase: when the last decay tick ran, and how long start() waits for the next one
+        self._last_decay = self.clock.now()
+        self._decay_delay = 0
+
+        # _health is exact at _settled_at. The next _quiet_ticks decay ticks after it only lower health by one
+        # each, so they are counted by the health property; the tick after them is the scheduled health event.
+        self._health = FULL_HEALTH
+        self._settled_at = self.clock.now()
+        self._quiet_ticks = 0
+        self._decay_anchor = None  # first normal decay tick, set by start()
+        self._play_started = None
+        self._health_job = None
+        self._event_at = None
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def _notify(self, what):
+        for callback in self._listeners:
+            callback(what)
+
+    """
+    The pet's health now: the settled value minus the quiet decay ticks due since then.
+    """
+    @property
+    def health(self):
+        return self._health - min(self._ticks_between(self._settled_at, self.clock.now()), self._quiet_ticks)
+
+    """
+    Starts the periodic action cycle and health decay.
+    Normal decay ticks fall every HEALTH_DECREASE_INTERVAL from now plus the restored phase.
+    """
+    def start(self):
+
+        self._periodic_jobs = [self.scheduler.call_every(ACTION_INTERVAL, self._action_cycle, first_delay=0)]
+        self._decay_anchor = self.clock.now() + self._decay_delay
+        self._settled_at = float("-inf")  # nothing applied yet, not even a tick due right now
+        self._schedule_health_event()
+
+    """
+    Cancels every timer the engine owns. Health stops decaying.
+    """
+    def stop(self):
+
+        self._catch_up()
+        self._last_decay = self._last_decay_at(self.clock.now())
+        self._decay_anchor = None
+        for job in self._periodic_jobs + [self._health_job, self._stop_play_job, self._action_end_job]:
+            self.scheduler.cancel(job)
+        self._periodic_jobs = []
+        self._health_job = None
+
+    """
+    Returns the state worth keeping across restarts as a plain dictionary.
+    Play and Action are short-lived, so they are stored as Idle.
+    """
+    def snapshot(self):
+
+        return {
+            "health": self.health,
+            "action": "Sleep" if self.action == "Sleep" else "Idle",
+            "is_sleeping": self.is_sleeping,
+            "decay_phase_ms": max(0, self.clock.now() - self._last_decay_at(self.clock.now())),
+        }
+
+    """
+    Returns when the last normal decay tick fell, whether or not it took any health.
+    """
+    def _last_decay_at(self, now):
+
+        if self._decay_anchor is None or now < self._decay_anchor:
+            return self._last_decay
+        ticks = (now - self._decay_anchor) // HEALTH_DECREASE_INTERVAL
+        return self._decay_anchor + ticks * HEALTH_DECREASE_INTERVAL
+
+    """
+    Restores a snapshot taken elapsed_ms ago, before start() is called.
+    The health decay of the gap is applied in closed form from HEALTH_DECREASE_INTERVAL and the sleep rules,
+    giving the same result as running every _decrease_health tick, so a week-long gap restores instantly.
+    """
+    def restore(self, snapshot, elapsed_ms):
+
+        health = max(1, min(int(snapshot["health"]), FULL_HEALTH))
+        is_sleeping = bool(snapshot["is_sleeping"])
+        action = "Sleep" if snapshot["action"] == "Sleep" else "Idle"
+
+        # Decay ticks that would have run during the gap, counted from the last tick before the snapshot
+        since_last_tick = max(0, elapsed_ms) + snapshot.get("decay_phase_ms", 0)
+        ticks = int(since_last_tick // HEALTH_DECREASE_INTERVAL)
+
+        if ticks and not is_sleeping:
+            # Each tick takes one point until health reaches 2; the tick after that puts the pet to sleep
+            drops = min(ticks, max(health - 2, 0))
+            health -= drops
+            if drops and health <= SLEEP_HEALTH_THRESHOLD:
+                action = "Sleep"
+            if ticks > drops:
+                is_sleeping = True
+                health = 2
+
+        self.is_sleeping = is_sleeping
+        self._set_health(health)
+        self.switch_action(action)
+        self.update_mood()
+
+        self._decay_delay = HEALTH_DECREASE_INTERVAL - since_last_tick % HEALTH_DECREASE_INTERVAL
+        self._last_decay = self.clock.now() - since_last_tick % HEALTH_DECREASE_INTERVAL
+
+    """
+    Runs all timers due by now on the engine clock. Used by real-time drivers.
+    """
+    def run_due(self):
+        self.scheduler.run_until(self.clock.now())
+
+    """
+    Advances a VirtualClock by the given number of milliseconds, running every timer on the way.
+    """
+    def advance(self, ms):
+        self.scheduler.run_until(self.clock.now() + ms)
+
+    """
+    Updates the pet's mood based on its current action and health level.
+    """
+    def update_mood(self):
+
+        if self.action in ["Play", "Action"]:
+            mood = "Energetic"
+        elif self.action == "Sleep" or self.health <= SLEEP_HEALTH_THRESHOLD:
+            mood = "Hungry"
+        else:
+            mood = "Happy"
+
+        if mood != self.mood:
+            self.mood = mood
+            self._notify("mood")
+
+    def _set_health(self, health):
+
+        self._health = health
+        self._notify("health")
+
+    """
+    Returns the time of the first decay tick after a given time at the current rate:
+    PLAY_TICKS times while playing, otherwise every HEALTH_DECREASE_INTERVAL unless asleep.
+    Returns None if there is none.
+    """
+    def _next_tick_after(self, time):
+
+        if self.is_playing:
+            ticks = _ticks_upto(self._play_started, PLAY_HEALTH_DECREASE_INTERVAL, time)
+            return self._play_started + ticks * PLAY_HEALTH_DECREASE_INTERVAL if ticks < PLAY_TICKS else None
+        if self.is_sleeping or self._decay_anchor is None:
+            return None
+        return self._decay_anchor + _ticks_upto(self._decay_anchor, HEALTH_DECREASE_INTERVAL, time) * HEALTH_DECREASE_INTERVAL
+
+    """
+    Returns how many decay ticks fall after one time and up to another at the current rate.
+    """
+    def _ticks_between(self, after, until):
+
+        if self.is_playing:
+            ticks = lambda time: min(_ticks_upto(self._play_started, PLAY_HEALTH_DECREASE_INTERVAL, time), PLAY_TICKS)
+        elif not self.is_sleeping and self._decay_anchor is not None:
+            ticks = lambda time: _ticks_upto(self._decay_anchor, HEALTH_DECREASE_INTERVAL, time)
+        else:
+            return 0
+        return max(0, ticks(until) - ticks(after))
+
+    """
+    Returns True if a decay tick at the given health does more than lower it by one point:
+    it shows as a health bar step, crosses SLEEP_HEALTH_THRESHOLD, sends the pet to sleep or hits the floor.
+    """
+    def _is_health_event(self, health):
+
+        if health <= 2:
+            return True
+        return (fill_width(health - 1) != fill_width(health)
+                or (health - 1 <= SLEEP_HEALTH_THRESHOLD) != (health <= SLEEP_HEALTH_THRESHOLD)
+                or (health - 1 <= SLEEP_HEALTH_THRESHOLD and self.action != "Sleep"))
+
+    """
+    Runs one decay tick at the current rate. Quiet ticks only lower health, without notifying anyone.
+    """
+    def _decay_tick(self):
+
+        if not self._is_health_event(self._health):
+            self._health -= 1
+        elif self.is_playing:
+            self._play_health_decrease()
+        else:
+            self._decrease_health()
+
+    """
+    Applies every decay tick due by until (now by default), in order, following rate changes on the way.
+    """
+    def _catch_up(self, until=None):
+
+        until = self.clock.now() if until is None else until
+        self._quiet_ticks = 0
+        while True:
+            tick = self._next_tick_after(self._settled_at)
+            if tick is None or tick > until:
+                break
+            self._settled_at = tick
+            self._decay_tick()
+        self._settled_at = max(self._settled_at, until)
+
+    """
+    Schedules a single timer for the next health event, counting the quiet ticks before it.
+    """
+    def _schedule_health_event(self):
+
+        self.scheduler.cancel(self._health_job)
+        self._health_job = None
+        self._quiet_ticks = 0
+
+        health, tick = self._health, self._settled_at
+        while True:
+            tick = self._next_tick_after(tick)
+            if tick is None:
+                return
+            if self._is_health_event(health):
+                break
+            health -= 1
+            self._quiet_ticks += 1
+
+        self._event_at = tick
+        self._health_job = self.scheduler.call_at(tick, self._on_health_event)
+
+    def _on_health_event(self):
+
+        self._health_job = None
+        # A real-time driver may run a timer slightly early; the event still belongs to its deadline
+        self._catch_up(max(self.clock.now(), self._event_at))
+        self._schedule_health_event()
+
+    """
+    Changes the pet's current action if allowed and refreshes the pet's mood.
+    """
+    def switch_action(self, action):
+
+        if self.is_playing and action not in ["Sleep", "Play"]:
+            return
+        if self.action == "Sleep" and action not in ["Sleep", "Idle"]:
+            return
+        if action not in ACTIONS:
+            return
+
+        # A pending "back to Idle" only belongs to the Action it was scheduled for
+        if action != "Action":
+            self.scheduler.cancel(self._action_end_job)
+            self._action_end_job = None
+
+        self.action = action
+        self._notify("action")
+        self.update_mood()
+
+    """
+    Resets the pet's health to full, cancels any ongoing play,
+    and switches the pet to the idle action.
+    """
+    def feed(self):
+
+        self._catch_up()
+        self.is_sleeping = False
+        self._set_health(FULL_HEALTH)
+
+        if self.is_playing:
+            self._cancel_play()
+
+        self.switch_action("Idle")
+        self._schedule_health_event()
+
+    def _cancel_play(self):
+
+        self.is_playing = False
+        self.scheduler.cancel(self._stop_play_job)
+        self._stop_play_job = None
+
+    """
+    Starts playing unless the pet is asleep or already playing.
+    Returns True if play started.
+    """
+    def start_play(self):
+
+        self._catch_up()
+        if self.action == "Sleep" or self.is_playing:
+            return False
+
+        self.is_playing = True
+        self._play_started = self._settled_at = self.clock.now()
+        self.switch_action("Play")
+        self._stop_play_job = self.scheduler.call_later(PLAY_DURATION, self.stop_play)
+
+        # The first play drain happens right away, the rest every PLAY_HEALTH_DECREASE_INTERVAL
+        self._decay_tick()
+        self._schedule_health_event()
+        return True
+
+    """
+    Stops the play action, cancels the play health decrease,
+    and switches the pet to idle unless it's sleeping.
+    """
+    def stop_play(self):
+
+        self._catch_up()
+        self._end_play()
+        self._schedule_health_event()
+
+    def _end_play(self):
+
+        self._cancel_play()
+
+        if self.action != "Sleep":
+            self.switch_action("Idle")
+
+    """
+    Decreases health faster while the pet is playing.
+    If health falls below the threshold, switches pet to sleep.
+    """
+    def _play_health_decrease(self):
+
+        if self.action != "Play":
+            return
+
+        if self.health > 2:
+            self._set_health(self.health - 1)
+            self.update_mood()
+
+            if self.health <= SLEEP_HEALTH_THRESHOLD and self.action != "Sleep":
+                self.switch_action("Sleep")
+                self._end_play()
+        else:
+            self.is_sleeping = True
+            self._set_health(2)
+            self.update_mood()
+
+            if self.action != "Sleep":
+                self.switch_action("Sleep")
+            self._end_play()
+
+    """
+    Periodically switches between idle and action, to simulate natural pet behavior.
+    """
+    def _action_cycle(self):
+
+        if not self.is_playing and not self.is_sleeping and self.action != "Sleep":
+            self.switch_action("Action")
+            self._action_end_job = self.scheduler.call_later(ACTION_DURATION, self._end_action)
+
+    def _end_action(self):
+
+        self._action_end_job = None
+        self.switch_action("Idle")
+
+    """
+    Gradually decreases health over time when not playing or sleeping.
+    Switches to the sleep action if health falls below the threshold.
+    """
+    def _decrease_health(self):
+
+        if not self.is_sleeping and not self.is_playing:
+            if self.health > 2:
+                self._set_health(self.health - 1)
+                self.update_mood()
+
+                if self.health <= SLEEP_HEALTH_THRESHOLD and self.action != "Sleep":
+                    self.switch_action("Sleep")
+            else:
+                self.is_sleeping = True
+                self._set_health(2)
+                self.update_mood()
+
+
+"""
+PetAnimation tracks what a renderer shows for one pet on each animation tick:
+the frame index, whether the sleep animation has finished, and the play movement.
+It restarts the animation whenever the engine switches action. speed is the play movement per tick in pixels.
+"""
+class PetAnimation:
+
+    def __init__(self, engine, x, direction="left", speed=PET_PLAY_SPEED):
+
+        self.engine = engine
+        self.x = x
+        self.direction = direction
+        self.speed = speed
+        self.frame_index = 0
+        self.sleep_animation_done = False
+        engine.add_listener(self._on_engine_change)
+
+    def _on_engine_change(self, what):
+
+        if what == "action":
+            self.restart()
+
+    """
+    Starts the current action's animation from its first frame.
+    """
+    def restart(self):
+
+        self.frame_index = 0
+        if self.engine.action == "Sleep":
+            self.sleep_animation_done = False
+
+    """
+    Advances one animation tick for an action with frame_count frames.
+    While playing, the pet walks between 0 and max_x, turning around at either edge.
+    """
+    def step(self, frame_count, max_x):
+
+        action = self.engine.action
+
+        if action == "Sleep" and not self.sleep_animation_done:
+            if self.frame_index < frame_count - 1:
+                self.frame_index += 1
+            else:
+                self.sleep_animation_done = True
+        elif action != "Sleep":
+            self.frame_index = (self.frame_index + 1) % frame_count if frame_count else 0
+
+        if action == "Play":
+            if self.direction == "right":
+                self.x += self.speed
+                if self.x >= max_x:
+                    self.direction = "left"
+            else:
+                self.x -= self.speed
+                if self.x <= 0:
+                    self.direction = "right"
+
+
+if __name__ == "__main__":
+    # Fast-forward a pet's life and print its state, e.g. "python pet_engine.py 60" for an hour
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    sim_engine = PetEngine(VirtualClock())
+    sim_engine.start()
+
+    for minute in range(1, int(minutes) + 1):
+        sim_engine.advance(60 * 1000)
+        print(f"[{minute:4d} min] health={sim_engine.health:2d} action={sim_engine.action:<6} "
+              f"mood={sim_engine.mood:<9} sleeping={sim_engine.is_sleeping}")
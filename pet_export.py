@@ -0,0 +1,226 @@
+"""
+Offline export of pet animations for Virtual Pet Pal.
+Renders every action of every installed pet, facing right and left, to sprite sheets,
+animated GIFs and APNGs at the ANIMATION_DELAY timing, without opening a window.
+Frames are found and decoded by pet_loader, so pets in packs, folders or Assets.zip all export.
+
+Each (pet, action) is one job; jobs run on a process pool, so large exports scale with the cores.
+The outputs' sources are remembered in export_state.json inside the output folder, and an output
+whose frames, scale and timing have not changed since the last export is skipped.
+
+    python pet_export.py                      # every pet and format into Exports/
+    python pet_export.py Dog Cat --formats gif --scale 2
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image
+
+import pet_loader
+from asset_manifest import get_manifest
+from config import ACTIONS, ANIMATION_DELAY
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EXPORT_DIR = os.path.join(BASE_DIR, "Exports")
+STATE_NAME = "export_state.json"
+STATE_VERSION = 1
+
+DIRECTIONS = ("right", "left")
+FORMATS = {"sheet": "_sheet.png", "gif": ".gif", "apng": ".apng"}
+SHEET_COLUMNS = 8  # frames per sprite sheet row
+
+"""
+Returns the full, equally sized frames of an action facing direction, untrimmed onto a shared canvas.
+"""
+def export_frames(pet_name, action, direction):
+
+    images = [pet_loader.untrim(img) for img in pet_loader.load_action_images(pet_name, action, direction) or []]
+    width = max((img.width for img in images), default=0)
+    height = max((img.height for img in images), default=0)
+
+    frames = []
+    for img in images:
+        if img.size != (width, height):
+            # Frames of different sizes are aligned at their bottom centre, where the pet stands
+            canvas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+            canvas.paste(img, ((width - img.width) // 2, height - img.height))
+            img = canvas
+        frames.append(img)
+    return frames
+
+"""
+Lays out frames left to right in rows of SHEET_COLUMNS on a transparent sheet.
+"""
+def sprite_sheet(frames):
+
+    width, height = frames[0].size
+    columns = min(len(frames), SHEET_COLUMNS)
+    rows = (len(frames) + columns - 1) // columns
+    sheet = Image.new("RGBA", (width * columns, height * rows), (0, 0, 0, 0))
+    for i, frame in enumerate(frames):
+        sheet.paste(frame, (i % columns * width, i // columns * height))
+    return sheet
+
+"""
+Writes one output of an action through a temporary file, so an interrupted export never leaves a
+truncated file behind. Sleep plays once and holds its last frame, as in the pet window; every other action loops.
+"""
+def write_output(path, fmt, frames, action):
+
+    tmp_path = f"{path}.tmp"
+    once = action == "Sleep"
+    if fmt == "sheet":
+        sprite_sheet(frames).save(tmp_path, format="PNG")
+    elif fmt == "gif":
+        # A GIF without a loop count plays once
+        frames[0].save(tmp_path, format="GIF", save_all=True, append_images=frames[1:], duration=ANIMATION_DELAY,
+                       disposal=2, **({} if once else {"loop": 0}))
+    else:
+        frames[0].save(tmp_path, format="PNG", save_all=True, append_images=frames[1:], duration=ANIMATION_DELAY,
+                       disposal=1, loop=1 if once else 0)
+    os.replace(tmp_path, path)
+
+"""
+Returns the output path of an action, direction and format, relative to the output folder.
+"""
+def output_name(pet_name, action, direction, fmt):
+    return f"{pet_name}/{action}_{direction}{FORMATS[fmt]}"
+
+"""
+Points a pool worker at the parent's asset tree and scale.
+"""
+def _init_worker(assets_dir, scale):
+
+    if assets_dir != pet_loader.ASSETS_DIR:
+        pet_loader.use_asset_root(assets_dir)
+    pet_loader.set_scale(scale)
+
+"""
+Exports one action of a pet: decodes each direction once and writes the named outputs.
+Runs in a pool worker. Returns (job, written names, milliseconds, error message or None).
+"""
+def export_action(job, names, out_dir):
+
+    pet_name, action = job
+    start = time.perf_counter()
+    written = []
+    try:
+        for direction in DIRECTIONS:
+            wanted = [fmt for fmt in FORMATS if output_name(pet_name, action, direction, fmt) in names]
+            if not wanted:
+                continue
+            frames = export_frames(pet_name, action, direction)
+            if not frames:
+                raise ValueError(f"no frames facing {direction}")
+            os.makedirs(os.path.join(out_dir, pet_name), exist_ok=True)
+            for fmt in wanted:
+                name = output_name(pet_name, action, direction, fmt)
+                write_output(os.path.join(out_dir, name), fmt, frames, action)
+                written.append(name)
+    except Exception as e:
+        return job, written, (time.perf_counter() - start) * 1000, str(e)
+    return job, written, (time.perf_counter() - start) * 1000, None
+
+def _load_state(path):
+
+    try:
+        with open(path) as state_file:
+            data = json.load(state_file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+        return {}
+    return data.get("outputs", {})
+
+def _save_state(path, outputs):
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w") as state_file:
+            json.dump({"version": STATE_VERSION, "outputs": outputs}, state_file, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[Warning] Could not save export state to {path}: {e}")
+
+"""
+Exports the actions of pet_names (every installed pet if empty) to formats in out_dir.
+Outputs whose source stamp, scale and timing match the last export and still exist are skipped,
+unless force is set. workers=None uses one process per core.
+Returns (outputs written, outputs skipped, failed jobs).
+"""
+def export(pet_names=None, formats=tuple(FORMATS), out_dir=EXPORT_DIR, scale=1.0, workers=None, force=False):
+
+    manifest = get_manifest()
+    installed = manifest.pet_names()
+    for pet_name in pet_names or ():
+        if pet_name not in installed:
+            print(f"[Warning] Pet '{pet_name}' is not installed. Skipping it.")
+    pet_names = [pet for pet in pet_names if pet in installed] if pet_names else installed
+
+    state_path = os.path.join(out_dir, STATE_NAME)
+    outputs = _load_state(state_path)
+    jobs = {}
+    skipped = 0
+    for pet_name in pet_names:
+        actions = manifest.actions(pet_name)
+        for action in ACTIONS:
+            if not actions.get(action, {}).get("frames"):
+                print(f"[Warning] Pet '{pet_name}' has no {action} frames. Skipping them.")
+                continue
+            stamp = f"{actions[action]['stamp']}-{scale:g}-{ANIMATION_DELAY}"
+            for direction in DIRECTIONS:
+                for fmt in formats:
+                    name = output_name(pet_name, action, direction, fmt)
+                    if not force and outputs.get(name) == stamp and os.path.exists(os.path.join(out_dir, name)):
+                        skipped += 1
+                    else:
+                        jobs.setdefault((pet_name, action), {})[name] = stamp
+
+    written, failed = 0, []
+    if jobs:
+        os.makedirs(out_dir, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(pet_loader.ASSETS_DIR, scale)) as pool:
+            futures = [pool.submit(export_action, job, list(names), out_dir) for job, names in jobs.items()]
+            try:
+                for future in as_completed(futures):
+                    job, names, elapsed_ms, error = future.result()
+                    for name in names:
+                        outputs[name] = jobs[job][name]
+                    written += len(names)
+                    if error:
+                        failed.append(job)
+                        print(f"[Error] Failed to export {job[0]}/{job[1]}: {error}")
+                    else:
+                        print(f"[Info] Exported {job[0]}/{job[1]} ({len(names)} files) in {elapsed_ms:.0f} ms")
+            finally:
+                # Keep what was written so far, so an interrupted export resumes where it stopped
+                _save_state(state_path, outputs)
+
+    return written, skipped, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export pet animations to sprite sheets, GIF and APNG")
+    parser.add_argument("pets", nargs="*", help="pets to export (default: every installed pet)")
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=list(FORMATS),
+                        help="what to write for every action and direction")
+    parser.add_argument("--out", default=EXPORT_DIR, help="output folder (default: Exports)")
+    parser.add_argument("--scale", type=float, default=1.0, help="export frames at this scale, e.g. 2")
+    parser.add_argument("--workers", type=int, help="export processes (default: one per core)")
+    parser.add_argument("--force", action="store_true", help="export again even if nothing changed")
+    parser.add_argument("--assets", help="export the pets of another Assets folder")
+    args = parser.parse_args()
+
+    if args.assets:
+        pet_loader.use_asset_root(os.path.abspath(args.assets))
+    started = time.perf_counter()
+    count, unchanged, failures = export(args.pets, args.formats, args.out, args.scale, args.workers, args.force)
+    print(f"[Info] Wrote {count} files and skipped {unchanged} unchanged ones in "
+          f"{time.perf_counter() - started:.1f} s; outputs are in {args.out}")
+    if failures:
+        sys.exit(1)
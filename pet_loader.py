@@ -1,38 +1,334 @@
 """
 Frame and UI loading script for Virtual Pet Pal.
 Loads all image assets used throughout the application.
+Assets are read from compiled packs, the extracted Assets folder, or straight from Assets.zip.
 """
 
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageTk
-from config import FULL_HEALTH
+from config import FULL_HEALTH, PARALLEL_LOADING, LOADER_WORKERS, REPORT_LOAD_TIMES, PACK_DIRS, HIT_ALPHA_THRESHOLD
+from asset_archive import AssetArchive
+from pet_pack import PetPack, PACK_DIR
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(BASE_DIR, "Assets")
+ASSETS_ZIP = os.path.join(BASE_DIR, "Assets.zip")
+
+_pack_dir = PACK_DIR
+_extra_pack_dirs = [os.path.join(BASE_DIR, pack_dir) for pack_dir in PACK_DIRS]
+_packs = {}
+_attached_packs = []
+_archive = None
+_open_lock = threading.Lock()
+_pool = None
+_scale = 1.0
+
+# (what, frame count, milliseconds) for every load, newest last
+load_times = []
+
+"""
+Returns the folders searched for compiled packs, in precedence order:
+Assets/Packs first, then the PACK_DIRS of config.py.
+"""
+def pack_dirs():
+    return [_pack_dir] + _extra_pack_dirs
+
+"""
+Points the loader at another asset tree, e.g. the synthetic assets of benchmark.py.
+Packs are then looked up in <assets_dir>/Packs and extra_pack_dirs, and the zip fallback is assets_zip.
+Packs and archives opened so far are dropped, not closed, since loaded images may still reference them.
+"""
+def use_asset_root(assets_dir, assets_zip=None, extra_pack_dirs=()):
+
+    global ASSETS_DIR, ASSETS_ZIP, _pack_dir, _extra_pack_dirs, _packs, _archive
+    with _open_lock:
+        ASSETS_DIR = assets_dir
+        ASSETS_ZIP = assets_zip or os.path.join(assets_dir, "Assets.zip")
+        _pack_dir = os.path.join(assets_dir, "Packs")
+        _extra_pack_dirs = list(extra_pack_dirs)
+        _packs = {}
+        _archive = None
+
+"""
+Sets the scale pet frames are loaded at, e.g. from scaled_cache.resolve_scale.
+Frames already loaded keep their size, so set it before loading any.
+"""
+def set_scale(scale):
+
+    global _scale
+    _scale = scale
+
+def get_scale():
+    return _scale
+
+"""
+Opens a compiled pack (see pet_pack.py) once per process. Safe to call from worker threads.
+Returns None if the pack cannot be read.
+"""
+def _open_pack(path):
+
+    with _open_lock:
+        if path not in _packs:
+            try:
+                _packs[path] = PetPack.open(path)
+            except (OSError, ValueError) as e:
+                print(f"[Warning] Ignoring pet pack {path}: {e}")
+                _packs[path] = None
+    return _packs[path]
+
+"""
+Makes the loaders read from an already opened pack, e.g. one in shared memory (see shared_frames.py),
+before any pack file, PNG folder or Assets.zip.
+"""
+def attach_pack(pack):
+
+    with _open_lock:
+        _attached_packs.append(pack)
+
+"""
+Returns the pack holding the given asset key, or None.
+Attached packs come first; otherwise the asset manifest says which pack file that is,
+so only that one pack is opened.
+"""
+def _find_pack(key):
+
+    for pack in _attached_packs:
+        if key in pack:
+            return pack
+
+    from asset_manifest import get_manifest  # asset_manifest imports this module
+
+    path = get_manifest().pack_for(key)
+    pack = _open_pack(path) if path else None
+    return pack if pack and key in pack else None
+
+"""
+Opens and indexes Assets.zip once per process. Safe to call from worker threads.
+Returns None if the archive is missing or unreadable.
+"""
+def _get_archive():
+
+    global _archive
+    with _open_lock:
+        if _archive is None:
+            _archive = False
+            if os.path.exists(ASSETS_ZIP):
+                try:
+                    _archive = AssetArchive(ASSETS_ZIP)
+                except (OSError, ValueError) as e:
+                    print(f"[Warning] Could not read {ASSETS_ZIP}: {e}")
+    return _archive or None
+
+"""
+Runs func over items, on the shared thread pool when parallel loading is enabled.
+Pillow releases the GIL while decoding and transposing, so the work overlaps.
+Results come back in input order as (item, result, error) tuples,
+so callers keep their sorted frame order and per-file error reporting.
+"""
+def _map_ordered(func, items, parallel=None):
+
+    global _pool
+
+    def run(item):
+        try:
+            return item, func(item), None
+        except Exception as e:
+            return item, None, e
+
+    if parallel is None:
+        parallel = PARALLEL_LOADING
+    if not parallel or len(items) < 2:
+        return [run(item) for item in items]
+
+    with _open_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=LOADER_WORKERS, thread_name_prefix="pet-loader")
+    return list(_pool.map(run, items))
+
+"""
+Records the wall-clock time of a load started at start (a time.perf_counter() value).
+"""
+def _record_load_time(what, count, start):
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    load_times.append((what, count, elapsed_ms))
+    if REPORT_LOAD_TIMES:
+        print(f"[Info] Loaded {count} frames for {what} in {elapsed_ms:.1f} ms")
+
+"""
+Finds an asset folder such as "Pets/Dog/Idle", preferring the extracted Assets folder
+over Assets.zip. Returns the PNG filenames inside it (sorted) and a function that opens
+one of them, or (None, None) if the folder exists in neither place.
+"""
+def _find_asset_dir(rel_dir):
+
+    path = os.path.join(ASSETS_DIR, *rel_dir.split("/"))
+    if os.path.isdir(path):
+        files = sorted(file for file in os.listdir(path) if file.lower().endswith(".png"))
+        return files, lambda file: Image.open(os.path.join(path, file))
+
+    archive = _get_archive()
+    if archive and archive.isdir(rel_dir):
+        files = sorted(file for file in archive.listdir(rel_dir) if file.lower().endswith(".png"))
+        return files, lambda file: archive.open_image(f"{rel_dir}/{file}")
+
+    return None, None
+
+"""
+Decodes every PNG of an asset folder to RGBA (flipped if mirrored), in sorted filename order.
+Files that fail to load are reported and skipped. limit decodes only the first files.
+Returns None if the folder does not exist.
+"""
+def _decode_dir(rel_dir, mirrored=False, parallel=None, limit=None):
+
+    files, open_image = _find_asset_dir(rel_dir)
+    if files is None:
+        return None
+    files = files[:limit]
+
+    def decode(file):
+        img = open_image(file).convert("RGBA")
+        return img.transpose(Image.FLIP_LEFT_RIGHT) if mirrored else img
+
+    images = []
+    for file, img, error in _map_ordered(decode, files, parallel):
+        if error:
+            print(f"[Error] Failed to load image {file}: {error}")
+        else:
+            images.append(img)
+    return images
 
 """
-Load_frames loads all frames for a specific action (e.g., 'Idle', 'Action') 
+Returns the pack key of an action's frames at a scale: "Pets/<pet>/<action>", with "@<scale>" unless the scale is 1.
+"""
+def pack_key(pet_name, action, scale=1):
+
+    key = f"Pets/{pet_name}/{action}"
+    return key if scale == 1 else f"{key}@{scale:g}"
+
+"""
+Load_action_images decodes the frames of one action of a pet as RGBA Pillow images.
+Direction "left" returns the mirrored frames, which come pre-flipped from a compiled pack
+or are flipped here. Frames from an optimized pack are trimmed; see frame_offset.
+use_packs=False reads the PNG sources even if a pack holds the action.
+limit decodes only the first frames, e.g. limit=1 for a quick first frame at startup.
+masks=True also builds each frame's hit-test bitmask (see alpha_mask) into img.info["mask"].
+Frames come at the scale given by set_scale unless scale is passed; scaled frames are
+resampled once and kept on disk (see scaled_cache.py).
+Returns None if the action does not exist.
+"""
+def load_action_images(pet_name, action, direction="right", parallel=None, use_packs=True, limit=None,
+                       masks=False, scale=None):
+
+    start = time.perf_counter()
+
+    # Prefer a compiled pack, which already holds decoded and mirrored frames
+    scale = _scale if scale is None else scale
+    key = pack_key(pet_name, action, scale)
+    if not use_packs:
+        pack = None
+    elif scale == 1:
+        pack = _find_pack(key)
+    else:
+        # Only packs attached from shared memory hold scaled frames (see shared_frames.py)
+        pack = next((attached for attached in _attached_packs if key in attached), None)
+
+    if pack:
+        images = pack.images(key, direction, limit)
+    elif scale != 1:
+        from scaled_cache import load_scaled  # scaled_cache imports this module
+
+        images = load_scaled(pet_name, action, direction, scale, limit)
+    else:
+        # Load all PNG files sorted by filename to ensure correct frame order
+        images = _decode_dir(key, mirrored=(direction == "left"), parallel=parallel, limit=limit)
+
+    if images is not None:
+        if masks:
+            for img in images:
+                img.info["mask"] = alpha_mask(img)
+        _record_load_time(f"{pet_name}/{action} ({direction})", len(images), start)
+    return images
+
+"""
+Returns the pixels of a frame that respond to clicks as a packed bitmask: one bit per pixel,
+set where alpha is at least HIT_ALPHA_THRESHOLD, most significant bit first, each row padded to whole bytes.
+"""
+def alpha_mask(img):
+    return img.getchannel("A").point(lambda alpha: 255 if alpha >= HIT_ALPHA_THRESHOLD else 0).convert("1").tobytes()
+
+"""
+Returns a frame's hit-test bitmask, built by load_action_images(masks=True) or now.
+"""
+def frame_mask(img):
+    return img.info["mask"] if "mask" in img.info else alpha_mask(img)
+
+"""
+Returns True if pixel (x, y) is set in a packed bitmask of a frame width pixels wide.
+"""
+def mask_hit(mask, width, x, y):
+    return bool(mask[y * ((width + 7) // 8) + x // 8] & (0x80 >> (x % 8)))
+
+"""
+Returns where a frame's top-left corner sits inside the full animation frame.
+Frames trimmed by asset_optimizer.py carry this offset; all other frames are at (0, 0).
+"""
+def frame_offset(img):
+    return img.info.get("offset", (0, 0))
+
+"""
+Returns a trimmed frame pasted back onto its full transparent canvas, or the frame itself if it was not trimmed.
+Used where frames are shown without per-frame offsets (the selector preview and load_frames).
+"""
+def untrim(img):
+
+    if "offset" not in img.info:
+        return img
+    full = Image.new("RGBA", img.info["canvas"], (0, 0, 0, 0))
+    full.paste(img, img.info["offset"])
+    return full
+
+"""
+Count_frames returns how many frames an action has without decoding any of them.
+Returns 0 if the action does not exist.
+"""
+def count_frames(pet_name, action):
+
+    key = f"Pets/{pet_name}/{action}"
+    pack = _find_pack(key)
+    if pack:
+        return len(pack.index[key].get("right", []))
+
+    files, _ = _find_asset_dir(key)
+    return len(files) if files else 0
+
+"""
+Load_frames loads all frames for a specific action (e.g., 'Idle', 'Action')
 from the given pet's folder. Returns two lists of frames:
 - right-facing frames (original)
 - left-facing frames (flipped horizontally)
 """
-def load_frames(folder_name, action):
+def load_frames(folder_name, action, parallel=None):
 
-    path = os.path.join(BASE_DIR, "Assets", "Pets", folder_name, action)
     right_frames, left_frames = [], []
 
-    if not os.path.exists(path):
-        print(f"[Warning] Path not found: {path}")
+    images = load_action_images(folder_name, action, parallel=parallel)
+    if images is None:
+        print(f"[Warning] Path not found: {os.path.join(ASSETS_DIR, 'Pets', folder_name, action)}")
         return right_frames, left_frames
 
-    # Load all PNG files sorted by filename to ensure correct frame order
-    for file in sorted(os.listdir(path)):
-        if file.lower().endswith(".png"):
-            try:
-                img = Image.open(os.path.join(path, file)).convert("RGBA")
-                right_frames.append(ImageTk.PhotoImage(img))
-                left_frames.append(ImageTk.PhotoImage(img.transpose(Image.FLIP_LEFT_RIGHT)))
-            except Exception as e:
-                print(f"[Error] Failed to load image {file}: {e}")
+    # Compiled packs and the scaled cache store the mirrored frames, so only flip when decoding PNGs
+    if _scale != 1 or _find_pack(f"Pets/{folder_name}/{action}"):
+        mirrored = load_action_images(folder_name, action, "left")
+    else:
+        flipped = _map_ordered(lambda img: img.transpose(Image.FLIP_LEFT_RIGHT), images, parallel)
+        mirrored = [img for _, img, _ in flipped]
+
+    right_frames = [ImageTk.PhotoImage(untrim(img)) for img in images]
+    left_frames = [ImageTk.PhotoImage(untrim(img)) for img in mirrored]
 
     return right_frames, left_frames
 
@@ -41,64 +337,81 @@ Load_health_frames loads health bar images representing health values from 1 to
 Note: Sorting is not used here because filenames are numeric and loaded sequentially using a range.
 Returns a list of health bar images.
 """
-def load_health_frames():
+def load_health_frames(parallel=None):
+
+    start = time.perf_counter()
+
+    pack = _find_pack("Health_Bar")
+    if pack:
+        health_frames = [ImageTk.PhotoImage(img) for img in pack.images("Health_Bar")]
+        _record_load_time("Health_Bar", len(health_frames), start)
+        return health_frames
 
-    path = os.path.join(BASE_DIR, "Assets", "Health_Bar")
     health_frames = []
 
-    if not os.path.exists(path):
-        print(f"[Warning] Health bar folder not found: {path}")
+    files, open_image = _find_asset_dir("Health_Bar")
+    if files is None:
+        print(f"[Warning] Health bar folder not found: {os.path.join(ASSETS_DIR, 'Health_Bar')}")
         return health_frames
 
     # Load health images sequentially based on numeric filenames (1.png, 2.png, ...)
+    available = set(files)
+    names = []
     for i in range(1, FULL_HEALTH + 1):
-        file_path = os.path.join(path, f"{i}.png")
-        if not os.path.exists(file_path):
+        if f"{i}.png" not in available:
             print(f"[Warning] Missing health image: {i}.png")
             continue
-        try:
-            img = Image.open(file_path)
+        names.append(f"{i}.png")
+
+    def decode(name):
+        img = open_image(name)
+        img.load()
+        return img
+
+    # PhotoImages are only ever created here, on the calling (Tk) thread
+    for name, img, error in _map_ordered(decode, names, parallel):
+        if error:
+            print(f"[Error] Failed to load health image {name}: {error}")
+        else:
             health_frames.append(ImageTk.PhotoImage(img))
-        except Exception as e:
-            print(f"[Error] Failed to load health image {i}.png: {e}")
 
+    _record_load_time("Health_Bar", len(health_frames), start)
     return health_frames
 
 """
-Load_preview_frames loads idle and action frames for the pet preview shown in the selection popup.
+Load_preview_images decodes the idle and action frames shown in the selection popup
+as RGBA Pillow images. It does not touch Tk, so it is safe to call from a worker thread.
 Returns two lists:
-- idle frames
-- action frames
+- idle images
+- action images
 """
-def load_preview_frames(pet_name):
-
-    idle_path = os.path.join(BASE_DIR, "Assets", "Pets", pet_name, "Idle")
-    action_path = os.path.join(BASE_DIR, "Assets", "Pets", pet_name, "Action")
+def load_preview_images(pet_name, parallel=None):
 
-    idle_frames, action_frames = [], []
+    idle_images, action_images = [], []
 
     # Load idle frames sorted by filename to maintain correct order
-    if os.path.exists(idle_path):
-        for file in sorted(os.listdir(idle_path)):
-            if file.lower().endswith(".png"):
-                try:
-                    img = Image.open(os.path.join(idle_path, file)).convert("RGBA")
-                    idle_frames.append(ImageTk.PhotoImage(img))
-                except Exception as e:
-                    print(f"[Error] Failed to load idle image {file}: {e}")
+    images = load_action_images(pet_name, "Idle", parallel=parallel)
+    if images is not None:
+        idle_images = [untrim(img) for img in images]
     else:
-        print(f"[Warning] Idle frames path not found: {idle_path}")
+        print(f"[Warning] Idle frames path not found: {os.path.join(ASSETS_DIR, 'Pets', pet_name, 'Idle')}")
 
     # Load action frames sorted by filename
-    if os.path.exists(action_path):
-        for file in sorted(os.listdir(action_path)):
-            if file.lower().endswith(".png"):
-                try:
-                    img = Image.open(os.path.join(action_path, file)).convert("RGBA")
-                    action_frames.append(ImageTk.PhotoImage(img))
-                except Exception as e:
-                    print(f"[Error] Failed to load action image {file}: {e}")
+    images = load_action_images(pet_name, "Action", parallel=parallel)
+    if images is not None:
+        action_images = [untrim(img) for img in images]
     else:
-        print(f"[Warning] Action frames path not found: {action_path}")
+        print(f"[Warning] Action frames path not found: {os.path.join(ASSETS_DIR, 'Pets', pet_name, 'Action')}")
+
+    return idle_images, action_images
+
+"""
+Load_preview_frames loads idle and action frames for the pet preview shown in the selection popup.
+Returns two lists:
+- idle frames
+- action frames
+"""
+def load_preview_frames(pet_name, parallel=None):
 
-    return idle_frames, action_frames
+    idle_images, action_images = load_preview_images(pet_name, parallel)
+    return [ImageTk.PhotoImage(img) for img in idle_images], [ImageTk.PhotoImage(img) for img in action_images]
@@ -0,0 +1,254 @@
+"""
+Compiled pet pack format for Virtual Pet Pal.
+Bundles decoded animation and health bar frames into a single binary file,
+so the loaders can memory-map one file instead of opening every PNG.
+
+Layout of a pack file (all integers little-endian):
+- header: magic (4 bytes), format version (uint32), index length (uint32)
+- index: UTF-8 JSON mapping an asset key to its frame table
+- padding up to a 16-byte boundary
+- data: raw RGBA frame blobs, right-facing and mirrored left-facing
+
+Asset keys mirror the folder layout, e.g. "Pets/Dog/Idle" or "Health_Bar".
+Each frame table entry is [offset, width, height] relative to the data area.
+Optimized packs (see asset_optimizer.py) use [offset, width, height, x, y, colors] instead:
+the frame was trimmed and sits at (x, y) of the key's "canvas" size, and if colors is not 0
+the blob starts with a palette of that many RGBA entries followed by one index byte per pixel.
+
+Run this file to build packs:
+    python pet_pack.py            # whole Assets tree into Assets/Packs/Assets.vpp
+    python pet_pack.py Dog Cat    # one pack per pet in Assets/Packs/<pet>.vpp
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from PIL import Image
+
+from config import FULL_HEALTH
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(BASE_DIR, "Assets")
+PACK_DIR = os.path.join(ASSETS_DIR, "Packs")
+PACK_EXTENSION = ".vpp"
+
+MAGIC = b"VPPK"
+VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+HEADER = struct.Struct("<4sII")
+ALIGNMENT = 16
+
+"""
+PetPack reads frames out of a compiled pack held in any buffer
+(a memory-mapped file or a shared memory block).
+Frames are returned as RGBA Pillow images backed by the buffer itself.
+"""
+class PetPack:
+
+    def __init__(self, buffer, name="<buffer>"):
+
+        self.name = name
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+
+        magic, version, index_len = HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{name} is not a pet pack")
+        if version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"{name} has unsupported pack version {version}")
+
+        index_end = HEADER.size + index_len
+        self.index = json.loads(bytes(self._view[HEADER.size:index_end]).decode("utf-8"))
+        self._data_start = _align(index_end)
+
+    """
+    Opens a pack file and memory-maps it read-only.
+    """
+    @classmethod
+    def open(cls, path):
+
+        with open(path, "rb") as pack_file:
+            mapped = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, name=path)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    """
+    Returns the RGBA images stored for an asset key and direction ("right" or "left").
+    Trimmed frames carry their position in info["offset"] and the untrimmed size in info["canvas"].
+    Returns an empty list if the key or direction is not in the pack. limit returns only the first frames.
+    """
+    def images(self, key, direction="right", limit=None):
+
+        entry = self.index.get(key, {})
+        images = []
+        for offset, width, height, *placement in entry.get(direction, [])[:limit]:
+            start = self._data_start + offset
+            x, y, colors = placement or (0, 0, 0)
+
+            if colors:
+                palette = bytes(self._view[start:start + colors * 4])
+                start += colors * 4
+                img = Image.frombuffer("P", (width, height), self._view[start:start + width * height], "raw", "P", 0, 1)
+                img.putpalette(palette, "RGBA")
+                img = img.convert("RGBA")
+            else:
+                blob = self._view[start:start + width * height * 4]
+                img = Image.frombuffer("RGBA", (width, height), blob, "raw", "RGBA", 0, 1)
+
+            if placement:
+                img.info["offset"] = (x, y)
+                img.info["canvas"] = tuple(entry.get("canvas", (width, height)))
+            images.append(img)
+        return images
+
+    """
+    Releases the underlying buffer. Images returned earlier must not be used afterwards.
+    """
+    def close(self):
+
+        self._view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+"""
+Serializes a mapping of asset key -> {"right": [images], "left": [images]} into pack bytes.
+Palette ("P") images are stored as palette plus indices, everything else as RGBA.
+Images with info["offset"] (trimmed by asset_optimizer.py) keep their position and canvas size.
+"""
+def encode_pack(assets):
+
+    index = {}
+    blobs = []
+    offset = 0
+
+    for key, directions in assets.items():
+        index[key] = {}
+        for direction, images in directions.items():
+            table = []
+            for img in images:
+                colors = 0
+                if img.mode == "P":
+                    palette = bytes(img.getpalette("RGBA"))
+                    colors = len(palette) // 4
+                    data = palette + img.tobytes()
+                else:
+                    data = img.convert("RGBA").tobytes()
+
+                if "offset" in img.info or colors:
+                    x, y = img.info.get("offset", (0, 0))
+                    table.append([offset, img.width, img.height, x, y, colors])
+                    index[key]["canvas"] = list(img.info.get("canvas", img.size))
+                else:
+                    table.append([offset, img.width, img.height])
+
+                blobs.append(data)
+                offset += len(data)
+            index[key][direction] = table
+
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    header = HEADER.pack(MAGIC, VERSION, len(index_bytes))
+    padding = b"\0" * (_align(len(header) + len(index_bytes)) - len(header) - len(index_bytes))
+
+    return b"".join([header, index_bytes, padding] + blobs)
+
+
+"""
+Writes pack bytes to disk through a temporary file, so a crashed build
+never leaves a truncated pack behind.
+"""
+def write_pack(path, assets):
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as pack_file:
+        pack_file.write(encode_pack(assets))
+    os.replace(tmp_path, path)
+
+
+"""
+Collects every action of a pet from its PNG sources, in the Assets folder or Assets.zip,
+including the mirrored left-facing frames. Returns an empty dictionary for an unknown pet.
+"""
+def collect_pet(pet_name):
+
+    # asset_manifest and pet_loader import this module
+    from asset_manifest import get_manifest
+    from pet_loader import load_action_images
+
+    assets = {}
+
+    for action in get_manifest().actions(pet_name):
+        right = load_action_images(pet_name, action, use_packs=False, scale=1)
+        if not right:
+            continue
+        left = [img.transpose(Image.FLIP_LEFT_RIGHT) for img in right]
+        assets[f"Pets/{pet_name}/{action}"] = {"right": right, "left": left}
+
+    return assets
+
+
+"""
+Collects the health bar images 1.png to FULL_HEALTH.png in health order,
+from the Assets folder or Assets.zip. Returns an empty dictionary if any of them is missing.
+"""
+def collect_health_bar():
+
+    from pet_loader import _find_asset_dir  # pet_loader imports this module
+
+    files, open_image = _find_asset_dir("Health_Bar")
+    names = [f"{i}.png" for i in range(1, FULL_HEALTH + 1)]
+    missing = [name for name in names if name not in (files or ())]
+    if missing:
+        print(f"[Warning] Health bar images missing ({', '.join(missing[:3])}...). Leaving them out of the pack.")
+        return {}
+    return {"Health_Bar": {"right": [open_image(name) for name in names]}}
+
+
+"""
+Builds packs from the PNG sources in the Assets folder or Assets.zip.
+With no pet names the whole tree goes into one pack, otherwise one pack per pet.
+Unknown pets are reported and skipped.
+Returns the list of written pack paths.
+"""
+def build(pet_names=None, out_dir=PACK_DIR):
+
+    from asset_manifest import get_manifest  # asset_manifest imports this module
+
+    written = []
+    installed = get_manifest().pet_names()
+
+    if not pet_names:
+        assets = collect_health_bar()
+        for pet_name in installed:
+            assets.update(collect_pet(pet_name))
+        path = os.path.join(out_dir, "Assets" + PACK_EXTENSION)
+        write_pack(path, assets)
+        written.append(path)
+    else:
+        for pet_name in pet_names:
+            assets = collect_pet(pet_name) if pet_name in installed else {}
+            if not assets:
+                print(f"[Error] Unknown pet '{pet_name}'. Installed pets: {', '.join(installed) or 'none'}")
+                continue
+            path = os.path.join(out_dir, pet_name + PACK_EXTENSION)
+            write_pack(path, assets)
+            written.append(path)
+
+    return written
+
+
+if __name__ == "__main__":
+    pack_paths = build(sys.argv[1:])
+    for pack_path in pack_paths:
+        print(f"[Info] Wrote {pack_path} ({os.path.getsize(pack_path)} bytes)")
+    if len(pack_paths) < max(len(sys.argv) - 1, 1):
+        sys.exit(1)
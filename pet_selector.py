@@ -1,29 +1,92 @@
 """
 Pet selection popup script for Virtual Pet Pal.
-Displays a popup window with a dropdown to select a pet.
+Displays a popup window with a dropdown to select one of the pets found by the asset manifest.
 Includes an animated preview of the selected pet.
-Disables the Save button if necessary frames are missing.
+Disables the Save button if the asset manifest reports missing frames.
+Preview frames for the first pets of the list are decoded in a background thread while the popup is open.
+Nothing is decoded until the popup has been drawn, so the window appears without waiting for frames.
 """
 
+import queue
+import threading
 import tkinter as tk
-from pet_loader import load_preview_frames
-from config import PET_LIST, DEFAULT_PET, PET_FRAME_WIDTH, PET_FRAME_HEIGHT
+from PIL import ImageTk
+from pet_loader import load_preview_frames, load_preview_images, set_scale
+from asset_manifest import get_manifest
+from scaled_cache import resolve_scale, scaled_size
+from config import DEFAULT_PET, PET_FRAME_WIDTH, PET_FRAME_HEIGHT, PET_SCALE
+
+PREFETCH_POLL_INTERVAL = 50  # milliseconds
+PREFETCH_PETS = 8  # pets decoded ahead of time; the others are decoded when selected
+
+"""
+Decodes preview images for each pet in order and hands them to the Tk thread through a queue.
+Only Pillow decoding happens here; PhotoImages must be created on the Tk thread.
+"""
+def prefetch_previews(pet_names, results, stop_event):
+
+    for pet_name in pet_names:
+        if stop_event.is_set():
+            return
+        results.put((pet_name, load_preview_images(pet_name)))
+
+"""
+Moves decoded previews from the worker into preview_cache, building their PhotoImages on the Tk thread.
+"""
+def drain_prefetch(preview_cache, results):
+
+    while True:
+        try:
+            pet_name, (idle_images, action_images) = results.get_nowait()
+        except queue.Empty:
+            break
+        if pet_name not in preview_cache:
+            preview_cache[pet_name] = ([ImageTk.PhotoImage(img) for img in idle_images],
+                                       [ImageTk.PhotoImage(img) for img in action_images])
+
+"""
+Returns the (idle, action) preview frames shown when the user switches to pet_name.
+Takes them from the cache, decoding now only if the worker has not reached this pet yet.
+"""
+def switch_preview(pet_name, preview_cache, results):
+
+    drain_prefetch(preview_cache, results)
+    if pet_name not in preview_cache:
+        preview_cache[pet_name] = load_preview_frames(pet_name)
+    return preview_cache[pet_name]
 
 """
 Displays a popup window allowing the user to select a pet from a dropdown.
 Shows animated preview for each pet.
-Disables the Save button if the selected pet is missing idle or action frames.
+Disables the Save button if the selected pet is missing any action.
+Previews are shown at scale (a number, or "auto" for the screen DPI), the size the pet will have.
 """
-def show_popup():
+def show_popup(scale=PET_SCALE):
+
+    manifest = get_manifest()
+    pet_names = manifest.pet_names()
+    if not pet_names:
+        print("[Error] No pets found in the Assets folder, Assets.zip or any pet pack.")
+        return None
+    first_pet = DEFAULT_PET if DEFAULT_PET in pet_names else pet_names[0]
 
     popup = tk.Tk()
+    scale = resolve_scale(scale, popup)
+    set_scale(scale)
+    preview_w, preview_h = scaled_size((PET_FRAME_WIDTH, PET_FRAME_HEIGHT), scale)
+
     popup.title("Select Pet")
-    popup.geometry("250x280")
+    popup.geometry(f"{max(250, preview_w + 40)}x{280 + preview_h - PET_FRAME_HEIGHT}")
     popup.resizable(False, False)
     popup.configure(bg="lightblue")
 
-    dropdown_selected_pet = tk.StringVar(value=DEFAULT_PET)
-    idle_frames, action_frames = load_preview_frames(DEFAULT_PET)
+    dropdown_selected_pet = tk.StringVar(value=first_pet)
+    idle_frames, action_frames = [], []  # decoded by start_previews once the popup is on screen
+
+    # Per-pet preview cache, filled by the background prefetch worker
+    preview_cache = {}
+    prefetch_results = queue.Queue()
+    stop_prefetch = threading.Event()
     frame_index = [0]  
     is_acting = [False]  
     result = {"pet": None}
@@ -49,45 +112,73 @@ def show_popup():
         popup.after(150, animate)
 
     """
-    Enables or disables the Save button based on availability of idle and action frames.
-    Prevents starting the app without essential frames.
+    Drains the prefetch queue periodically until the worker has finished and its results are cached.
+    """
+    def poll_prefetch():
+
+        drain_prefetch(preview_cache, prefetch_results)
+        if prefetch_thread.is_alive() or not prefetch_results.empty():
+            popup.after(PREFETCH_POLL_INTERVAL, poll_prefetch)
+
+    """
+    Enables or disables the Save button based on the asset manifest, before any frame is decoded.
+    Prevents starting the app without every action the main window needs.
     """
     def update_save_button_state():
 
-        if idle_frames and action_frames:
-            save_btn.config(state=tk.NORMAL)
-        else:
-            save_btn.config(state=tk.DISABLED)
+        missing = manifest.missing_actions(dropdown_selected_pet.get())
+        save_btn.config(state=tk.DISABLED if missing else tk.NORMAL)
+        return missing
 
     """
     Triggered when the selected pet changes.
-    Reloads frames, resets animation state, and updates Save button status.
+    Takes frames from the preview cache (decoding now only if the worker has not reached this pet yet),
+    resets animation state, and updates Save button status.
     """
     def on_pet_change(*_):
 
         nonlocal idle_frames, action_frames
         new_pet = dropdown_selected_pet.get()
-        idle_frames, action_frames = load_preview_frames(new_pet)
 
-        frame_index[0] = 0
-        is_acting[0] = False
+        missing = update_save_button_state()
+        if missing:
+            print(f"[Warning] Pet '{new_pet}' missing {', '.join(missing)} frames - Save disabled.")
 
-        update_save_button_state()
+        idle_frames, action_frames = switch_preview(new_pet, preview_cache, prefetch_results)
 
-        if not idle_frames or not action_frames:
-            print(f"[Warning] Pet '{new_pet}' missing frames - Save disabled.")
+        frame_index[0] = 0
+        is_acting[0] = False
 
         if idle_frames:
             canvas.itemconfig(sprite, image=idle_frames[0])
         else:
             canvas.itemconfig(sprite, image='')
 
+    """
+    Decodes the selected pet's preview and starts prefetching the others, after the popup is drawn.
+    """
+    def start_previews():
+
+        nonlocal idle_frames, action_frames, prefetch_thread
+        if not preview_cache:
+            idle_frames, action_frames = switch_preview(dropdown_selected_pet.get(), preview_cache, prefetch_results)
+            if idle_frames:
+                canvas.itemconfig(sprite, image=idle_frames[0])
+
+        pending_pets = [pet for pet in pet_names[:PREFETCH_PETS] if pet not in preview_cache]
+        prefetch_thread = threading.Thread(target=prefetch_previews,
+                                           args=(pending_pets, prefetch_results, stop_prefetch), daemon=True)
+        prefetch_thread.start()
+        poll_prefetch()
+        animate()
+
     """
     Saves the currently selected pet and closes the popup.
     """
     def save_and_start():
         selected = dropdown_selected_pet.get()
         result["pet"] = selected
+        stop_prefetch.set()
         popup.destroy()
 
     """
@@ -96,12 +187,13 @@ def show_popup():
     """
     def on_close():
         print("[Info] Popup closed. No pet selected.")
+        stop_prefetch.set()
         popup.destroy()
 
     canvas = tk.Canvas(
         popup,
-        width=PET_FRAME_WIDTH,
-        height=PET_FRAME_HEIGHT,
+        width=preview_w,
+        height=preview_h,
         highlightthickness=0,
         bg="lightblue"
     )
@@ -115,13 +207,12 @@ def show_popup():
     )
     label.pack(pady=(5, 0))
 
-    dropdown = tk.OptionMenu(popup, dropdown_selected_pet, *PET_LIST)
-    max_len = max(len(name) for name in PET_LIST)
+    dropdown = tk.OptionMenu(popup, dropdown_selected_pet, *pet_names)
+    max_len = max(len(name) for name in pet_names)
     dropdown.config(width=max_len)
     dropdown.pack(pady=5)
 
-    initial_image = idle_frames[0] if idle_frames else None
-    sprite = canvas.create_image(PET_FRAME_WIDTH // 2, PET_FRAME_HEIGHT // 2, image=initial_image)
+    sprite = canvas.create_image(preview_w // 2, preview_h // 2)
 
     save_btn = tk.Button(
         popup,
@@ -144,7 +235,9 @@ def show_popup():
 
     update_save_button_state()
 
-    animate()
+    # after_idle runs once the popup is mapped; the after(0) lets Tk paint it before decoding starts
+    prefetch_thread = None
+    popup.after_idle(lambda: popup.after(0, start_previews))
     popup.mainloop()
 
     return result["pet"]
@@ -0,0 +1,141 @@
+"""
+Pet state persistence for Virtual Pet Pal.
+Keeps each pet's health, action and sleep state in pet_state.json, so closing the window
+no longer resets the pet to full health. Snapshots are written atomically and at most once
+every STATE_SAVE_INTERVAL while the pet changes, plus once on close.
+On restore, the time the app was closed is applied by PetEngine.restore in closed form.
+The file also remembers the last pet chosen in the selector, for the fast-start path in main.py.
+"""
+
+import json
+import os
+import time
+
+from config import STATE_SAVE_INTERVAL
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = os.path.join(BASE_DIR, "pet_state.json")
+STATE_VERSION = 1
+
+"""
+Reads the whole state file. Returns an empty dictionary if the file is missing, unreadable
+or from another version.
+"""
+def _read(path):
+
+    try:
+        with open(path) as state_file:
+            data = json.load(state_file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"[Warning] Ignoring saved pet state {path}: {e}")
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+        return {}
+    return data
+
+"""
+Replaces the state file atomically, so a crash mid-write never leaves a corrupt state behind.
+"""
+def _write(path, data):
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w") as state_file:
+            json.dump(dict(data, version=STATE_VERSION), state_file, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[Warning] Could not save pet state to {path}: {e}")
+
+"""
+Reads every saved pet state. Returns a dictionary of pet name to snapshot.
+"""
+def load_states(path=STATE_PATH):
+    return _read(path).get("pets", {})
+
+"""
+Writes the snapshot of one pet, keeping the other pets' states and the last chosen pet.
+"""
+def save_state(pet_name, snapshot, path=STATE_PATH):
+
+    data = _read(path)
+    data.setdefault("pets", {})[pet_name] = dict(snapshot, saved_at=time.time())
+    _write(path, data)
+
+"""
+Returns the name of the pet last chosen in the selector, or None.
+"""
+def load_last_pet(path=STATE_PATH):
+    return _read(path).get("last_pet")
+
+"""
+Remembers the pet chosen in the selector, so the next fast start can skip the selector.
+"""
+def save_last_pet(pet_name, path=STATE_PATH):
+
+    data = _read(path)
+    if data.get("last_pet") != pet_name:
+        _write(path, dict(data, last_pet=pet_name))
+
+"""
+Restores a pet's saved state into an engine that has not been started yet,
+catching up on the wall-clock time since it was saved. Returns True if a state was found.
+"""
+def restore_state(engine, pet_name, path=STATE_PATH):
+
+    snapshot = load_states(path).get(pet_name)
+    if not snapshot:
+        return False
+
+    try:
+        elapsed_ms = max(0.0, time.time() - snapshot["saved_at"]) * 1000
+        engine.restore(snapshot, elapsed_ms)
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"[Warning] Ignoring saved state for '{pet_name}': {e}")
+        return False
+
+    print(f"[Info] Restored '{pet_name}' after {elapsed_ms / 60000:.1f} minutes away: "
+          f"health {engine.health}, {engine.action}")
+    return True
+
+"""
+StateSaver snapshots an engine whenever it changes, rate-limited to one write per STATE_SAVE_INTERVAL
+through a timer on the engine's scheduler. Call flush() on close to write any pending change.
+"""
+class StateSaver:
+
+    def __init__(self, engine, pet_name, path=STATE_PATH, interval=STATE_SAVE_INTERVAL):
+
+        self.engine = engine
+        self.pet_name = pet_name
+        self.path = path
+        self.interval = interval
+        self.saves = 0
+        self._dirty = False
+        self._job = None
+        engine.add_listener(self._on_engine_change)
+
+    def _on_engine_change(self, what):
+
+        self._dirty = True
+        if self._job is None:
+            self._job = self.engine.scheduler.call_later(self.interval, self._save)
+
+    def _save(self):
+
+        self._job = None
+        if self._dirty:
+            self._dirty = False
+            self.saves += 1
+            save_state(self.pet_name, self.engine.snapshot(), self.path)
+
+    """
+    Writes the current state now, whether or not a save is pending.
+    """
+    def flush(self):
+
+        self.engine.scheduler.cancel(self._job)
+        self._dirty = True
+        self._save()
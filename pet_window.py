@@ -1,29 +1,213 @@
 """
 Main application window for the Virtual Pet Pal.
-Initializes and runs the pet animation, health, and interaction logic.
+Renders the pet and forwards interactions to the headless PetEngine,
+which owns the health, mood and action logic.
 """
 
 import tkinter as tk
-from PIL import ImageTk
-import os
 import sys
-
-from config import (
-    PET_PLAY_SPEED, ANIMATION_DELAY, HEALTH_DECREASE_INTERVAL, ACTION_INTERVAL,
-    ACTION_DURATION, SLEEP_HEALTH_THRESHOLD, FULL_HEALTH, PET_FRAME_WIDTH, PET_FRAME_HEIGHT
-)
-from pet_loader import load_frames, load_health_frames
+import time
+
+from config import (ANIMATION_DELAY, REPORT_RENDER_STATS, PERSIST_STATE, PROGRESSIVE_LOADING, RENDER_BACKEND,
+                    PET_SCALE, PET_PLAY_SPEED)
+from asset_manifest import get_manifest
+from health_bar import HealthBar, BAR_WIDTH, BAR_HEIGHT
+from frame_cache import FrameCache
+from pet_engine import PetEngine, PetAnimation
+from scheduler import Scheduler, TkDriver
+from pet_state import restore_state, StateSaver
+from progressive_loader import ProgressiveLoader
+from pet_loader import set_scale
+from scaled_cache import resolve_scale, scaled_size
 
 selected_pet = None  
 
+"""
+PetView draws one pet on the main window canvas: its sprite and the mood text above it.
+It remembers what the canvas currently shows, so rendering only issues Tk calls for real changes.
+With a ProgressiveLoader, actions that are still being decoded are drawn with a ready fallback animation.
+"""
+class PetView:
+
+    def __init__(self, canvas, pet_name, frame_cache, engine, animation, y, frame_w, window_width, loader=None):
+
+        self.canvas = canvas
+        self.pet_name = pet_name
+        self.frame_cache = frame_cache
+        self.engine = engine
+        self.animation = animation
+        self.y = y
+        self.frame_w = frame_w
+        self.window_width = window_width
+        self.loader = loader
+
+        idle_set = self._frame_set("Idle")
+        first_image = idle_set.images[0] if idle_set.images else None
+        offset_x, offset_y = idle_set.offsets[0] if idle_set.images else (0, 0)
+        position = (animation.x + offset_x, y + offset_y)
+        self.sprite = canvas.create_image(*position, anchor="nw", image=first_image)
+
+        # The mood text setup
+        self.mood_text = canvas.create_text(
+            animation.x + frame_w // 2,
+            y - 20,
+            text=f"Mood: {engine.mood}",
+            font=("Arial", 10, "bold"),
+            fill="white"
+        )
+        canvas.tag_raise(self.mood_text)
+
+        self.shown = {
+            "position": position,
+            "text_x": None,
+            "mood": engine.mood,
+            "image": first_image
+        }
+        self.ticks = 0
+        self.tk_calls = 0
+        self._hit_frame = (idle_set if idle_set.images else None, 0)
+
+    def _frame_set(self, action):
+
+        if self.loader:
+            return self.loader.frame_set(action, self.animation.direction)
+        return self.frame_cache.get_set(self.pet_name, action, self.animation.direction)
+
+    """
+    Returns True if the canvas point lies on a visible pixel of the frame last rendered,
+    using the frame's packed alpha mask rather than its bounding box.
+    """
+    def hit(self, px, py):
+
+        frame_set, index = self._hit_frame
+        return frame_set is not None and frame_set.hit(index, px - self.animation.x, py - self.y)
+
+    """
+    Pushes the pet's position, mood text and current frame to the canvas,
+    skipping every property that has not changed since the last render.
+    """
+    def render(self):
+
+        canvas, shown, engine = self.canvas, self.shown, self.engine
+
+        # Only the facing direction on screen is decoded, so static actions never load mirrored frames
+        frame_set = self._frame_set(engine.action)
+        frames = frame_set.images
+        index = self.animation.frame_index % len(frames) if frames else 0
+        self._hit_frame = (frame_set if frames else None, index)
+
+        # Trimmed frames are drawn at their offset inside the full frame
+        x = self.animation.x
+        offset_x, offset_y = frame_set.offsets[index] if frames else (0, 0)
+        position = (x + offset_x, self.y + offset_y)
+        if position != shown["position"]:
+            shown["position"] = position
+            canvas.coords(self.sprite, *position)
+            self.tk_calls += 1
+
+        text_x = max(60, min(self.window_width - 60, x + self.frame_w // 2))
+        if text_x != shown["text_x"]:
+            shown["text_x"] = text_x
+            canvas.coords(self.mood_text, text_x, self.y - 20)
+            self.tk_calls += 1
+
+        if engine.mood != shown["mood"]:
+            shown["mood"] = engine.mood
+            canvas.itemconfig(self.mood_text, text=f"Mood: {engine.mood}")
+            self.tk_calls += 1
+
+        image = frames[index] if frames else None
+        if image is not None and image is not shown["image"]:
+            shown["image"] = image
+            canvas.itemconfig(self.sprite, image=image)
+            self.tk_calls += 1
+
+    """
+    Advances the animation by one tick and renders it.
+    Returns True once nothing can change on screen until the next action change: the sleep
+    animation has finished, or a non-moving action has a single frame.
+    """
+    def tick(self):
+
+        self.ticks += 1
+        engine = self.engine
+        frames = self._frame_set(engine.action).images
+        self.animation.step(len(frames), self.window_width - self.frame_w)
+        self.render()
+
+        if engine.action == "Play":
+            return False
+        return self.animation.sleep_animation_done if engine.action == "Sleep" else len(frames) <= 1
+
+"""
+CompositedPetView draws the same pet as PetView through a CompositedSurface (see compositor.py):
+the sprite, the mood text and the health bar are layers of one frame buffer instead of canvas items.
+Its frame cache must hold premultiplied arrays rather than PhotoImages.
+"""
+class CompositedPetView(PetView):
+
+    def __init__(self, surface, pet_name, frame_cache, engine, animation, y, frame_w, window_width, health_origin,
+                 loader=None):
+
+        self.surface = surface
+        self.sprite = surface.item
+        self.pet_name = pet_name
+        self.frame_cache = frame_cache
+        self.engine = engine
+        self.animation = animation
+        self.y = y
+        self.frame_w = frame_w
+        self.window_width = window_width
+        self.health_origin = health_origin
+        self.loader = loader
+        self.ticks = 0
+        self.tk_calls = 0
+        self._hit_frame = (None, 0)
+        self.render()
+
+    """
+    Composites the sprite, mood text and health bar. Unchanged layers cost nothing:
+    only the rectangles of layers that moved or changed image are blended and sent to Tk.
+    """
+    def render(self):
+
+        from compositor import label_pixels, health_pixels  # NumPy is only imported with this renderer
+
+        engine = self.engine
+        frame_set = self._frame_set(engine.action)
+        frames = frame_set.images
+        x = self.animation.x
+
+        layers = []
+        self._hit_frame = (None, 0)
+        if frames:
+            index = self.animation.frame_index % len(frames)
+            self._hit_frame = (frame_set, index)
+            offset_x, offset_y = frame_set.offsets[index]
+            layers.append(("sprite", x + offset_x, self.y + offset_y, frames[index]))
+
+        label = label_pixels(f"Mood: {engine.mood}")
+        text_x = max(60, min(self.window_width - 60, x + self.frame_w // 2))
+        layers.append(("mood", text_x - label.shape[1] // 2, self.y - 20 - label.shape[0] // 2, label))
+        layers.append(("health", *self.health_origin, health_pixels(engine.health)))
+
+        self.tk_calls += self.surface.draw(layers)
+
 """
 Initializes and runs the main application window.
-Loads animations and health frames, sets up UI, and manages pet state and behavior.
+Loads animations and health frames, sets up UI, and renders the pet engine's state.
+If a profiler is given (see profiler.py), every timer callback and action switch is recorded.
+With PROGRESSIVE_LOADING the window opens on the first Idle frame and each action streams in when first shown.
+renderer is "canvas" (one Tk item per sprite) or "compositor" (one composited image, needs NumPy).
+started is the perf_counter time the first-frame delay is measured from, e.g. the process start.
+scale sizes the pet (a number, or "auto" for the screen DPI); the window and play movement follow it.
 """
-def run_main_app(pet_name):
+def run_main_app(pet_name, profiler=None, renderer=RENDER_BACKEND, started=None, scale=PET_SCALE):
 
     global selected_pet
     selected_pet = pet_name
+    if started is None:
+        started = time.perf_counter()
 
     root_window = tk.Tk()
     root_window.overrideredirect(True)  # Makes the window borderless
@@ -36,28 +220,31 @@ def run_main_app(pet_name):
     root_window.config(bg=transparent_color)
     root_window.wm_attributes("-transparentcolor", transparent_color)
 
-    window_width, window_height = 400, 400
+    # Frames are resampled once per scale (see scaled_cache.py), so set it before any frame is loaded
+    scale = resolve_scale(scale, root_window)
+    set_scale(scale)
+
+    window_width = window_height = max(400, round(400 * scale))
     window_x = screen_width - window_width - 10
     window_y = screen_height - window_height - 40
     root_window.geometry(f"{window_width}x{window_height}+{window_x}+{window_y}")
 
-    # All the available animations
-    animations = {
-        "Idle": load_frames(selected_pet, "Idle"),
-        "Action": load_frames(selected_pet, "Action"),
-        "Sleep": load_frames(selected_pet, "Sleep"),
-        "Play": load_frames(selected_pet, "Play")
-    }
-
-    for action, frames in animations.items():
-        if not frames or not all(frames):
-            print(f"[Warning] Animation frames missing or incomplete for '{action}' action.")
-            sys.exit(1)
-
-    health_images = load_health_frames()
-
-    if not health_images:
-        print("[Error] Health frames failed to load. Health bar will not display.")
+    # All the available animations, decoded lazily per direction on first use
+    compositing = renderer == "compositor"
+    if compositing:
+        import compositor  # NumPy is only imported with this renderer
+        if not compositor.AVAILABLE:
+            print("[Warning] The compositor renderer needs NumPy. Using the canvas renderer instead.")
+            compositing = False
+    frame_cache = FrameCache(convert=compositor.premultiply if compositing else None)
+
+    # The manifest answers from its index, without opening any frame
+    manifest = get_manifest()
+    if selected_pet not in manifest.pet_names():
+        print(f"[Error] Pet '{selected_pet}' is not installed.")
+        sys.exit(1)
+    for action in manifest.missing_actions(selected_pet):
+        print(f"[Warning] Animation frames missing or incomplete for '{action}' action.")
         sys.exit(1)
 
     canvas = tk.Canvas(
@@ -70,245 +257,160 @@ def run_main_app(pet_name):
     canvas.place(x=0, y=0)
 
     # The location of the pet sprite on the screen
-    frame_w = animations["Idle"][0][0].width() if animations["Idle"] else 100  
-    frame_h = animations["Idle"][0][0].height() if animations["Idle"] else 100
+    frame_w, frame_h = scaled_size(manifest.frame_size(selected_pet) or (100, 100), scale)
     x = window_width - frame_w - 10
     y = window_height - frame_h - 10
 
-    direction = "left"  
-    current_action = ["Idle"]  
-    is_playing = [False]  
-    is_sleeping = [False]  
-    current_health = [FULL_HEALTH]  
-    mood = ["Happy"]  
-    running_health_job = [None]  
-    sleep_animation_done = [False]
-
-    right_frames, left_frames = animations[current_action[0]]
-    frame_index = [0]
-
-    pet_sprite = canvas.create_image(x, y, anchor="nw", image=left_frames[0] if left_frames else None)
-
-    # The mood text setup
-    mood_text = canvas.create_text(
-        x + frame_w // 2,
-        y - 20,
-        text=f"Mood: {mood[0]}",
-        font=("Arial", 10, "bold"),
-        fill="white"
-    )
-    canvas.tag_raise(mood_text)
+    # One scheduler drives the engine timers and the animation through a single Tk wakeup
+    scheduler = Scheduler()
+    driver = TkDriver(scheduler, root_window)
+    engine = PetEngine(scheduler=scheduler)
+    state_saver = None
+    if PERSIST_STATE:
+        # Picks up where the pet was left, with the health it lost while the app was closed
+        restore_state(engine, selected_pet)
+        state_saver = StateSaver(engine, selected_pet)
+    animation = PetAnimation(engine, x, speed=max(1, round(PET_PLAY_SPEED * scale)))
+
+    loader = None
+    if PROGRESSIVE_LOADING:
+        loader = ProgressiveLoader(frame_cache, selected_pet, scheduler, engine.action, animation.direction)
+    if compositing:
+        # The health bar goes where the canvas renderer's health canvas sits, centered below the buttons
+        health_origin = (window_width - 120 + 25, y - 135 + 30)
+        surface = compositor.CompositedSurface(canvas, window_width, window_height)
+        view = CompositedPetView(surface, selected_pet, frame_cache, engine, animation, y, frame_w, window_width,
+                                 health_origin, loader)
+    else:
+        view = PetView(canvas, selected_pet, frame_cache, engine, animation, y, frame_w, window_width, loader)
+
+    if profiler:
+        scheduler.profiler = profiler
+        profiler.watch_engine(engine)
+        if profiler.overlay:
+            from profiler import ProfilerOverlay  # loaded only when profiling
+
+            ProfilerOverlay(canvas, profiler, scheduler)
 
     # UI Frame with buttons and health bar 
     ui_frame = tk.Frame(canvas, bg=transparent_color)
-    feed_btn = tk.Button(ui_frame, text="Feed", command=lambda: feed_pet())
-    close_btn = tk.Button(ui_frame, text="Close", command=root_window.destroy)
+    feed_btn = tk.Button(ui_frame, text="Feed", command=engine.feed)
+    close_btn = tk.Button(ui_frame, text="Close", command=lambda: close_app())
     feed_btn.grid(row=0, column=0, padx=10)
     close_btn.grid(row=0, column=1, padx=10)
 
-    health_label = tk.Label(ui_frame, image=health_images[current_health[0] - 1] if health_images else None,
-                            bg=transparent_color)
-    health_label.grid(row=1, column=0, columnspan=2)
+    # The health bar is composed from two templates, so only the empty and full health images are loaded.
+    # The compositor draws it as a layer of the pet view instead.
+    health_bar = None
+    if not compositing:
+        health_canvas = tk.Canvas(ui_frame, width=BAR_WIDTH, height=BAR_HEIGHT, bg=transparent_color,
+                                  highlightthickness=0)
+        health_canvas.grid(row=1, column=0, columnspan=2)
+        health_bar = HealthBar(health_canvas)
+        health_bar.set_health(engine.health)
     canvas.create_window(window_width - 120, y - 135, anchor="nw", window=ui_frame)
 
-    """
-    Updates the health bar image to reflect the pet's current health.
-    Called periodically whenever health changes.
-    """
-    def update_health_bar():
-
-        current_health_index = max(current_health[0], 1) - 1
-        if health_images and 0 <= current_health_index < len(health_images):
-            health_label.config(image=health_images[current_health_index])
+    render_stats = {"suspensions": 0, "started": time.monotonic()}
+    animation_job = [None]
 
     """
-    Updates the pet's mood text based on its current action and health level.
+    Logs how long the window took to show the pet, once Tk has drawn the first frame.
     """
-    def update_mood():
+    def report_first_frame():
 
-        if current_action[0] in ["Play", "Action"]:
-            mood[0] = "Energetic"
-        elif current_action[0] == "Sleep" or current_health[0] <= SLEEP_HEALTH_THRESHOLD:
-            mood[0] = "Hungry"
-        else:
-            mood[0] = "Happy"
+        mode = "progressive" if loader else "blocking"
+        print(f"[Info] First frame of '{selected_pet}' shown after {(time.perf_counter() - started) * 1000:.0f} ms "
+              f"({mode} loading)")
 
     """
-    Changes the pet's current animation action if allowed,
-    updates frames accordingly, and refreshes the pet's mood.
+    Updates the health bar to reflect the pet's current health.
+    Called whenever the engine reports a health change; only the fill segment is redrawn.
     """
-    def switch_action(action):
-
-        if is_playing[0] and action not in ["Sleep", "Play"]:
-            return
-        if current_action[0] == "Sleep" and action not in ["Sleep", "Idle"]:
-            return
-        if action not in animations:
-            return
-
-        frames = animations.get(action)
-
-        if isinstance(frames, tuple) and len(frames) == 2:
-            nonlocal right_frames, left_frames
-            right_frames, left_frames = frames
-        else:
-            right_frames, left_frames = ([], [])
-
-        current_action[0] = action
-        frame_index[0] = 0
-        sleep_animation_done[0] = False if action == "Sleep" else sleep_animation_done[0]
-        update_mood()
-
-    """
-    Resets the pet's health to full, cancels any ongoing health decrease,
-    and switches the pet to the idle animation.
-    """
-    def feed_pet():
-
-        current_health[0] = FULL_HEALTH
-        is_sleeping[0] = False
-        sleep_animation_done[0] = False
-        update_health_bar()
-
-        if running_health_job[0]:
-            root_window.after_cancel(running_health_job[0])
-            running_health_job[0] = None
-            is_playing[0] = False
+    def update_health_bar():
 
-        switch_action("Idle")
+        if health_bar is None:
+            view.render()
+        elif health_bar.set_health(engine.health):
+            view.tk_calls += 1
 
     """
-    Stops the play action, cancels health decrease timers,
-    and switches the pet to idle unless it's sleeping.
+    Starts the animation timer again if it was suspended.
     """
-    def stop_play():
+    def resume_animation():
 
-        is_playing[0] = False
-        if running_health_job[0]:
-            root_window.after_cancel(running_health_job[0])
-            running_health_job[0] = None
-
-        if current_action[0] != "Sleep":
-            switch_action("Idle")
+        if animation_job[0] is None:
+            animation_job[0] = scheduler.call_every(ANIMATION_DELAY, animate, first_delay=0)
 
     """
-    Decreases health faster while the pet is playing.
-    If health falls below the threshold, switches pet to sleep.
+    Reacts to engine changes: a new action restarts the animation, a health change
+    refreshes the health bar, and a mood change is rendered even while the animation is suspended.
     """
-    def play_health_decrease():
-
-        if current_action[0] != "Play":
-            return
-
-        if current_health[0] > 2:
-            current_health[0] -= 1
-            update_health_bar()
-            update_mood()
-
-            if current_health[0] <= SLEEP_HEALTH_THRESHOLD and current_action[0] != "Sleep":
-                switch_action("Sleep")
-                stop_play()
-                return
+    def on_engine_change(what):
 
-            running_health_job[0] = root_window.after(500, play_health_decrease)
-        else:
-            current_health[0] = 2
-            is_sleeping[0] = True
+        if what == "health":
             update_health_bar()
-            update_mood()
-
-            if current_action[0] != "Sleep":
-                switch_action("Sleep")
-            stop_play()
+        elif what == "action":
+            resume_animation()
+        elif what == "mood":
+            view.render()
 
     """
-    Starts the play action when the pet sprite is clicked,
-    initiating faster health decrease and play animation.
+    Called when the background loader has decoded an action. If the pet is showing that action,
+    its animation restarts from the first real frame instead of the fallback.
     """
-    def on_click(event):
+    def on_frames_ready(action, direction):
 
-        mouse_x, mouse_y = event.x, event.y
-        if x < mouse_x < x + frame_w and y < mouse_y < y + frame_h:
-            if current_action[0] != "Sleep" and not is_playing[0]:
-                is_playing[0] = True
-                switch_action("Play")
-                play_health_decrease()
-                root_window.after(3000, stop_play)
+        if action == engine.action and direction == animation.direction:
+            animation.restart()
+        resume_animation()
 
     """
-    Periodically switches pet actions between idle and action animations,
-    to simulate natural pet behavior.
+    Prints render counters if enabled, then closes the window.
     """
-    def action_cycle():
-
-        if not is_playing[0] and not is_sleeping[0] and current_action[0] != "Sleep":
-            switch_action("Action")
-            root_window.after(ACTION_DURATION, lambda: switch_action("Idle"))
-
-        root_window.after(ACTION_INTERVAL, action_cycle)
+    def close_app():
+
+        if REPORT_RENDER_STATS:
+            elapsed = max(time.monotonic() - render_stats["started"], 1e-6)
+            print(f"[Info] {view.ticks} animation ticks, {view.tk_calls} Tk calls, "
+                  f"{driver.wakeups / elapsed:.2f} wakeups/s, animation suspended {render_stats['suspensions']} times")
+        if state_saver:
+            state_saver.flush()
+        if loader:
+            loader.stop()
+        driver.stop()
+        root_window.destroy()
 
     """
-    Gradually decreases the pet's health over time when not playing or sleeping.
-    Triggers sleep action if health falls below threshold.
+    Starts the play action when a visible pixel of the pet sprite is clicked,
+    initiating faster health decrease and play animation. Clicks on transparent padding are ignored.
     """
-    def decrease_health():
-        if not is_sleeping[0] and not is_playing[0]:
-            if current_health[0] > 2:
-                current_health[0] -= 1
-                update_health_bar()
-                update_mood()
-
-                if current_health[0] <= SLEEP_HEALTH_THRESHOLD and current_action[0] != "Sleep":
-                    switch_action("Sleep")
-            else:
-                current_health[0] = 2
-                is_sleeping[0] = True
-                update_health_bar()
-                update_mood()
-
-        root_window.after(HEALTH_DECREASE_INTERVAL, decrease_health)
+    def on_click(event):
+
+        if view.hit(event.x, event.y):
+            engine.start_play()
 
     """
     Animates the pet by updating its animation frames and position.
     Handles pet movement during play, updates mood text position,
-    and schedules itself to run periodically for smooth animation.
+    and runs every ANIMATION_DELAY on the scheduler for smooth animation.
+    Once nothing can change on screen the timer is suspended until the next action change.
     """
     def animate():
-        if current_action[0] == "Sleep" and not sleep_animation_done[0]:
-            if frame_index[0] < len(right_frames) - 1:
-                frame_index[0] += 1
-            else:
-                sleep_animation_done[0] = True
-        elif current_action[0] != "Sleep":
-            frame_index[0] = (frame_index[0] + 1) % len(right_frames) if right_frames else 0
-
-        nonlocal x, direction
-
-        if current_action[0] == "Play":
-            if direction == "right":
-                x += PET_PLAY_SPEED
-                if x >= window_width - frame_w:
-                    direction = "left"
-            else:
-                x -= PET_PLAY_SPEED
-                if x <= 0:
-                    direction = "right"
-
-        text_x = max(60, min(window_width - 60, x + frame_w // 2))
-
-        canvas.coords(pet_sprite, x, y)
-        canvas.coords(mood_text, text_x, y - 20)
-        canvas.itemconfig(mood_text, text=f"Mood: {mood[0]}", fill="white")
-
-        if right_frames and left_frames:
-            canvas.itemconfig(pet_sprite, image=(right_frames if direction == "right" else left_frames)[frame_index[0]])
-
-        root_window.after(ANIMATION_DELAY, animate)
-
-    canvas.tag_bind(pet_sprite, "<Button-1>", on_click)
-
-    action_cycle()
-    decrease_health()
-    animate()
+
+        if view.tick():
+            scheduler.cancel(animation_job[0])
+            animation_job[0] = None
+            render_stats["suspensions"] += 1
+
+    canvas.tag_bind(view.sprite, "<Button-1>", on_click)
+
+    engine.add_listener(on_engine_change)
+    engine.start()
+    if loader:
+        loader.add_listener(on_frames_ready)
+        loader.start(engine.action, animation.direction)
+    resume_animation()
+    root_window.after_idle(report_first_frame)
+    driver.arm()
 
     root_window.mainloop()
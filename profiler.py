@@ -0,0 +1,225 @@
+"""
+Opt-in timing profiler for Virtual Pet Pal.
+Records, for every scheduler callback (animate, _on_health_event, _action_cycle, stop_play, ...),
+when it was due versus when it actually ran and how long it took, plus every action switch of the engine.
+The data is aggregated into per-callback histograms, can be shown as a small overlay on the canvas,
+and is written to JSON and CSV when the process exits.
+
+Enable it with "python main.py --profile" (or --profile-overlay), or by setting the environment variable
+VPP_PROFILE=1 (VPP_PROFILE=overlay for the overlay). VPP_PROFILE_OUT overrides the output file prefix.
+When disabled no profiler exists, and the scheduler only pays one attribute check per callback.
+"""
+
+import atexit
+import bisect
+import csv
+import json
+import os
+import time
+from collections import deque
+
+from config import PROFILE_OUTPUT, PROFILE_MAX_SAMPLES, PROFILE_OVERLAY_INTERVAL
+from scheduler import LATENESS_BUCKETS
+
+PROFILE_ENV = "VPP_PROFILE"
+PROFILE_OUT_ENV = "VPP_PROFILE_OUT"
+
+# Upper bounds (milliseconds) of the callback duration histogram buckets; the last bucket is open-ended
+DURATION_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50, 100]
+
+"""
+Histogram counts values into fixed buckets given by their upper bounds, plus an open-ended last bucket.
+"""
+class Histogram:
+
+    def __init__(self, bounds):
+
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    """
+    Returns an upper bound for the given percentile (0-100), read from the bucket it falls in.
+    """
+    def percentile(self, percent):
+
+        if not self.count:
+            return 0.0
+        target = self.count * percent / 100
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.max
+
+    def summary(self):
+
+        labels = [f"<={bound}ms" for bound in self.bounds] + [f">{self.bounds[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": self.mean,
+            "max_ms": self.max,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "histogram": dict(zip(labels, self.counts)),
+        }
+
+"""
+Profiler collects callback timings from a Scheduler (see Scheduler.profiler) and action transitions
+from any number of engines. Raw samples are kept up to PROFILE_MAX_SAMPLES for the CSV export;
+the histograms cover every run.
+"""
+class Profiler:
+
+    def __init__(self, output=PROFILE_OUTPUT, overlay=False):
+
+        self.output = output
+        self.overlay = overlay
+        self.lateness = {}
+        self.durations = {}
+        self.samples = deque(maxlen=PROFILE_MAX_SAMPLES)
+        self.transitions = []
+        self._dumped = False
+
+    """
+    Runs a scheduler callback that was due at deadline and started at now (scheduler clock milliseconds),
+    recording its lateness and how long it ran.
+    """
+    def run(self, callback, deadline, now):
+
+        start = time.perf_counter()
+        try:
+            callback()
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            name = getattr(callback, "__name__", repr(callback))
+            lateness = max(0.0, now - deadline)
+
+            if name not in self.lateness:
+                self.lateness[name] = Histogram(LATENESS_BUCKETS)
+                self.durations[name] = Histogram(DURATION_BUCKETS)
+            self.lateness[name].record(lateness)
+            self.durations[name].record(duration)
+            self.samples.append((name, deadline, now, lateness, duration))
+
+    """
+    Records every action switch of an engine, with the time on the engine clock and the health at that moment.
+    """
+    def watch_engine(self, engine, label=None):
+
+        state = {"action": engine.action}
+
+        def on_change(what):
+            if what == "action":
+                self.transitions.append({
+                    "engine": label,
+                    "time_ms": engine.clock.now(),
+                    "from": state["action"],
+                    "to": engine.action,
+                    "health": engine.health,
+                })
+                state["action"] = engine.action
+
+        engine.add_listener(on_change)
+
+    """
+    Returns the aggregated histograms per callback name.
+    """
+    def summary(self):
+
+        return {
+            name: {"lateness": self.lateness[name].summary(), "duration": self.durations[name].summary()}
+            for name in sorted(self.lateness)
+        }
+
+    """
+    Returns a few lines describing each callback, for the overlay.
+    """
+    def overlay_text(self):
+
+        lines = []
+        for name in sorted(self.lateness):
+            late, run = self.lateness[name], self.durations[name]
+            lines.append(f"{name[:16]:<16} n={late.count:<5} late p95 {late.percentile(95)}ms "
+                         f"run {run.mean:.2f}/{run.max:.2f}ms")
+        return "\n".join(lines)
+
+    """
+    Writes <output>.json (histograms, transitions and samples) and <output>.csv (one row per callback run).
+    Only the first call writes; later calls are ignored.
+    """
+    def dump(self):
+
+        if self._dumped:
+            return
+        self._dumped = True
+
+        report = {
+            "callbacks": self.summary(),
+            "transitions": self.transitions,
+            "samples": [dict(zip(("callback", "deadline_ms", "started_ms", "lateness_ms", "duration_ms"), sample))
+                        for sample in self.samples],
+        }
+        try:
+            with open(f"{self.output}.json", "w") as json_file:
+                json.dump(report, json_file, indent=2)
+            with open(f"{self.output}.csv", "w", newline="") as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(["callback", "deadline_ms", "started_ms", "lateness_ms", "duration_ms"])
+                writer.writerows(self.samples)
+        except OSError as e:
+            print(f"[Error] Could not write profile to {self.output}: {e}")
+            return
+        print(f"[Info] Profile of {sum(h.count for h in self.durations.values())} callbacks written to "
+              f"{self.output}.json and {self.output}.csv")
+
+"""
+ProfilerOverlay shows the profiler's live summary as a small text block on a canvas,
+refreshed every PROFILE_OVERLAY_INTERVAL on the given scheduler.
+"""
+class ProfilerOverlay:
+
+    def __init__(self, canvas, profiler, scheduler, x=5, y=5):
+
+        self.canvas = canvas
+        self.profiler = profiler
+        self.item = canvas.create_text(x, y, anchor="nw", font=("Courier", 7), fill="white")
+        self.job = scheduler.call_every(PROFILE_OVERLAY_INTERVAL, self.refresh, first_delay=0)
+
+    def refresh(self):
+
+        self.canvas.itemconfig(self.item, text=self.profiler.overlay_text())
+        self.canvas.tag_raise(self.item)
+
+"""
+Returns a Profiler if profiling was requested on the command line or through VPP_PROFILE, otherwise None.
+An output prefix or the overlay also turn profiling on. The profile is written automatically when the process exits.
+"""
+def create_profiler(enabled=False, overlay=False, output=None):
+
+    env = os.environ.get(PROFILE_ENV, "").strip().lower()
+    if env and env not in ("0", "false", "no", "off"):
+        enabled = True
+        overlay = overlay or env == "overlay"
+    enabled = enabled or overlay or bool(output)
+    if not enabled:
+        return None
+
+    profiler = Profiler(output or os.environ.get(PROFILE_OUT_ENV) or PROFILE_OUTPUT, overlay)
+    atexit.register(profiler.dump)
+    print(f"[Info] Profiling enabled, writing to {profiler.output}.json/.csv on exit")
+    return profiler
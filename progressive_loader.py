@@ -0,0 +1,158 @@
+"""
+Progressive frame loading for Virtual Pet Pal.
+Lets the main window appear as soon as the first Idle frame is decoded. The first action is then
+decoded on a background thread, and every other action and direction only when it is first shown,
+so lazy loading keeps its memory budget; PROGRESSIVE_PREFETCH queues all of them up front instead.
+Decoded sets are handed to the FrameCache on the Tk thread, polled through the scheduler.
+Until an action is ready, renderers are given a ready fallback animation, and the action is moved
+to the front of the queue.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+from config import ACTIONS, PROGRESSIVE_POLL_INTERVAL, PROGRESSIVE_PREFETCH
+from pet_loader import load_action_images
+
+DIRECTIONS = ("left", "right")
+
+"""
+ProgressiveLoader streams one pet's actions into a FrameCache.
+Only the Pillow decoding runs on the worker thread; PhotoImages are created on the Tk thread.
+Listeners are called with (action, direction) on the Tk thread whenever a set becomes ready.
+"""
+class ProgressiveLoader:
+
+    def __init__(self, frame_cache, pet_name, scheduler, first_action="Idle", direction="left"):
+
+        self.frame_cache = frame_cache
+        self.pet_name = pet_name
+        self.scheduler = scheduler
+        self.started = time.perf_counter()
+        self.ready_ms = None
+        self._listeners = []
+        self._jobs = deque()
+        self._pending = set()
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._poll_job = None
+        self._stopped = False
+
+        # Shown until any full animation is ready
+        images = load_action_images(pet_name, first_action, direction, limit=1, masks=True) or []
+        self.first_set = frame_cache.make_set(images)
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    """
+    Queues first_action facing direction. Other actions and directions are requested by frame_set()
+    when first shown, or all queued behind it with PROGRESSIVE_PREFETCH.
+    """
+    def start(self, first_action="Idle", direction="left"):
+
+        self.request(first_action, direction)
+        if not PROGRESSIVE_PREFETCH:
+            return
+        directions = sorted(DIRECTIONS, key=lambda d: d != direction)
+        actions = sorted(ACTIONS, key=lambda a: a != first_action)
+        for facing in directions:
+            for action in actions:
+                self.request(action, facing)
+
+    """
+    Asks for an action to be decoded unless it is resident or already queued.
+    urgent=True moves it to the front of the queue.
+    """
+    def request(self, action, direction, urgent=False):
+
+        job = (action, direction)
+        if self._stopped or self.frame_cache.peek(self.pet_name, action, direction) is not None:
+            return
+
+        with self._lock:
+            if job in self._pending:
+                if urgent and job in self._jobs:
+                    self._jobs.remove(job)
+                    self._jobs.appendleft(job)
+                return
+            self._pending.add(job)
+            if urgent:
+                self._jobs.appendleft(job)
+            else:
+                self._jobs.append(job)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, name="pet-progressive", daemon=True)
+                self._worker.start()
+
+        if self._poll_job is None:
+            self._poll_job = self.scheduler.call_every(PROGRESSIVE_POLL_INTERVAL, self._drain)
+
+    def _work(self):
+
+        while True:
+            with self._lock:
+                if not self._jobs or self._stopped:
+                    self._worker = None
+                    return
+                action, direction = self._jobs.popleft()
+            # Hit-test masks are built here too, off the Tk thread
+            images = load_action_images(self.pet_name, action, direction, masks=True) or []
+            self._results.put((action, direction, images))
+
+    """
+    Moves decoded actions into the frame cache and tells the listeners. Stops polling once idle.
+    """
+    def _drain(self):
+
+        while True:
+            try:
+                action, direction, images = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.frame_cache.put(self.pet_name, action, direction, images)
+            with self._lock:
+                self._pending.discard((action, direction))
+            for callback in self._listeners:
+                callback(action, direction)
+
+        with self._lock:
+            idle = not self._pending
+        if idle:
+            self.scheduler.cancel(self._poll_job)
+            self._poll_job = None
+            if self.ready_ms is None:
+                self.ready_ms = (time.perf_counter() - self.started) * 1000
+                frames = "All frames" if PROGRESSIVE_PREFETCH else "First animation"
+                print(f"[Info] {frames} of '{self.pet_name}' ready after {self.ready_ms:.0f} ms")
+
+    """
+    Returns the FrameSet to show for an action: its own frames once ready, otherwise (after asking for
+    them first) the Idle frames, any other ready action of the pet, or the first Idle frame.
+    """
+    def frame_set(self, action, direction):
+
+        frame_set = self.frame_cache.peek(self.pet_name, action, direction)
+        if frame_set is not None:
+            return frame_set
+
+        self.request(action, direction, urgent=True)
+        for fallback in ["Idle"] + ACTIONS:
+            frame_set = self.frame_cache.peek(self.pet_name, fallback, direction)
+            if frame_set is not None and frame_set.images:
+                return frame_set
+        return self.first_set
+
+    """
+    Drops queued work. Actions already being decoded finish in the background and are discarded.
+    """
+    def stop(self):
+
+        with self._lock:
+            self._stopped = True
+            self._jobs.clear()
+        self.scheduler.cancel(self._poll_job)
+        self._poll_job = None
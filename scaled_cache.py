@@ -0,0 +1,139 @@
+"""
+Scaled sprite cache for Virtual Pet Pal.
+Resamples a pet's frames once per scale (see PET_SCALE in config.py) instead of on every animation tick.
+An action is resampled in both directions at once, the left-facing frames being the mirrored right-facing ones,
+and written as a pet pack (see pet_pack.py) to
+
+    Assets/Scaled/<pet>/<action>@<scale>-<filter>-<stamp>.vpp
+
+so later launches at the same scale memory-map the scaled frames instead of resampling them again.
+The stamp comes from the asset manifest and changes with the action's source frames, so edited pets miss
+the cache; their old entries are replaced on the next write. Scaled frames are trimmed to their visible pixels.
+"""
+
+import os
+import threading
+from PIL import Image
+
+import pet_loader
+from asset_manifest import get_manifest
+from asset_optimizer import trim
+from config import SCALE_STEP, SCALE_FILTER
+from pet_pack import PetPack, write_pack, PACK_EXTENSION
+
+CACHE_DIR_NAME = "Scaled"
+BASE_DPI = 96  # screen DPI at which scale 1 shows frames at their PNG size
+FILTERS = {"nearest": Image.NEAREST, "bilinear": Image.BILINEAR, "lanczos": Image.LANCZOS}
+
+_packs = {}
+_lock = threading.Lock()
+
+"""
+Returns the scale for a PET_SCALE setting: a number, or "auto" to follow the screen DPI of a Tk window.
+Scales are rounded to SCALE_STEP, so every screen reuses one of a few cached sizes.
+"""
+def resolve_scale(setting, root=None):
+
+    if setting == "auto":
+        scale = root.winfo_fpixels("1i") / BASE_DPI if root is not None else 1.0
+    else:
+        scale = float(setting)
+    return max(SCALE_STEP, round(scale / SCALE_STEP) * SCALE_STEP)
+
+"""
+Returns a (width, height) size at a scale, at least one pixel each way.
+"""
+def scaled_size(size, scale):
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+"""
+Returns where an action's frames at a scale are cached, or None if the pet has no such action.
+"""
+def cache_path(pet_name, action, scale):
+
+    info = get_manifest().actions(pet_name).get(action)
+    if not info:
+        return None
+    return os.path.join(pet_loader.ASSETS_DIR, CACHE_DIR_NAME, pet_name,
+                        f"{action}@{scale:g}-{SCALE_FILTER}-{info['stamp']}{PACK_EXTENSION}")
+
+"""
+Resamples one frame, trimmed or not, on its full canvas and trims the result again.
+Returns the right-facing and the mirrored left-facing frame.
+"""
+def _resample(img, scale):
+
+    full = pet_loader.untrim(img)
+    full = full.resize(scaled_size(full.size, scale), FILTERS.get(SCALE_FILTER, Image.LANCZOS))
+
+    frames = []
+    for frame in (full, full.transpose(Image.FLIP_LEFT_RIGHT)):
+        trimmed, offset = trim(frame)
+        trimmed.info["offset"] = offset
+        trimmed.info["canvas"] = full.size
+        frames.append(trimmed)
+    return frames
+
+def _open(path):
+
+    with _lock:
+        if path not in _packs:
+            try:
+                _packs[path] = PetPack.open(path)
+            except (OSError, ValueError) as e:
+                print(f"[Warning] Ignoring scaled sprite cache {path}: {e}")
+                _packs[path] = None
+    return _packs[path]
+
+"""
+Writes both directions of an action to the cache and removes its entries for older sources.
+A cache that cannot be written only costs the resampling again next time.
+"""
+def _store(path, key, right, left):
+
+    prefix = os.path.basename(path).rsplit("-", 1)[0] + "-"
+    with _lock:
+        try:
+            write_pack(path, {key: {"right": right, "left": left}})
+        except OSError as e:
+            print(f"[Warning] Could not write scaled sprite cache {path}: {e}")
+            return
+
+        folder = os.path.dirname(path)
+        for file in os.listdir(folder):
+            if file.startswith(prefix) and file != os.path.basename(path):
+                try:
+                    os.remove(os.path.join(folder, file))
+                except OSError:
+                    pass  # still mapped by another process; replaced next time
+
+"""
+Returns an action's frames facing direction at a scale, from the cache or resampled now and cached.
+limit returns only the first frames; a partial result is resampled but not cached,
+so a quick first frame at startup never stands in for the whole action.
+Returns None if the action does not exist.
+"""
+def load_scaled(pet_name, action, direction, scale, limit=None):
+
+    key = f"Pets/{pet_name}/{action}"
+    path = cache_path(pet_name, action, scale)
+    if path is None:
+        return None
+
+    if os.path.exists(path):
+        pack = _open(path)
+        if pack and key in pack:
+            return pack.images(key, direction, limit)
+
+    images = pet_loader.load_action_images(pet_name, action, "right", limit=limit, scale=1)
+    if images is None:
+        return None
+    right, left = [], []
+    for img in images:
+        right_frame, left_frame = _resample(img, scale)
+        right.append(right_frame)
+        left.append(left_frame)
+
+    if limit is None:
+        _store(path, key, right, left)
+    return right if direction == "right" else left
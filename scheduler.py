@@ -0,0 +1,331 @@
+"""
+Central timer scheduler for Virtual Pet Pal.
+Every periodic and one-off callback (animation, health, actions, play) runs through one
+hashed timer wheel keyed by monotonic deadlines, instead of independent root_window.after chains.
+
+- Periodic timers are drift-free: the next deadline is the previous deadline plus the interval.
+- Timers due in the same wheel tick are run together in one pass, in deadline order.
+- Every timer returns a handle that can be cancelled.
+- After a stall, periodic timers either skip the missed runs ("skip") or replay them
+  back-to-back ("compress"), replaying at most the last SCHEDULER_MAX_CATCH_UP and skipping older ones.
+- Lateness of every callback is recorded in Scheduler.metrics.
+- An optional profiler (see profiler.py) can time every callback individually.
+"""
+
+import heapq
+import math
+import time
+
+from config import SCHEDULER_TICK, SCHEDULER_SLOTS, SCHEDULER_MAX_CATCH_UP
+
+SKIP = "skip"
+COMPRESS = "compress"
+
+# Upper bounds (milliseconds) of the lateness histogram buckets; the last bucket is open-ended
+LATENESS_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+"""
+MonotonicClock reports real elapsed time in milliseconds.
+"""
+class MonotonicClock:
+
+    def now(self):
+        return time.monotonic() * 1000
+
+"""
+VirtualClock only moves when told to, which lets simulations run faster than real time.
+"""
+class VirtualClock:
+
+    def __init__(self, start=0):
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def set(self, now):
+        self._now = max(self._now, now)
+
+"""
+TimerHandle is returned for every scheduled callback. Call cancel() to stop it;
+a cancelled periodic timer does not run again, even if cancelled from its own callback.
+"""
+class TimerHandle:
+
+    __slots__ = ("deadline", "callback", "interval", "catch_up", "cancelled", "tick", "seq")
+
+    def __init__(self, deadline, callback, interval, catch_up, seq):
+
+        self.deadline = deadline
+        self.callback = callback
+        self.interval = interval
+        self.catch_up = catch_up
+        self.cancelled = False
+        self.tick = 0
+        self.seq = seq
+
+    def cancel(self):
+        self.cancelled = True
+
+"""
+TimerMetrics aggregates how late callbacks ran compared to their deadlines.
+"""
+class TimerMetrics:
+
+    def __init__(self):
+
+        self.runs = 0
+        self.late_runs = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+        self.skipped = 0
+        self.compressed = 0
+        self.histogram = [0] * (len(LATENESS_BUCKETS) + 1)
+
+    def record(self, lateness):
+
+        self.runs += 1
+        if lateness > 0:
+            self.late_runs += 1
+            self.total_lateness += lateness
+            self.max_lateness = max(self.max_lateness, lateness)
+
+        for i, bound in enumerate(LATENESS_BUCKETS):
+            if lateness <= bound:
+                self.histogram[i] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+
+    """
+    Returns the metrics as a plain dictionary.
+    """
+    def summary(self):
+
+        labels = [f"<={bound}ms" for bound in LATENESS_BUCKETS] + [f">{LATENESS_BUCKETS[-1]}ms"]
+        return {
+            "runs": self.runs,
+            "late_runs": self.late_runs,
+            "mean_lateness_ms": self.total_lateness / self.runs if self.runs else 0.0,
+            "max_lateness_ms": self.max_lateness,
+            "skipped": self.skipped,
+            "compressed": self.compressed,
+            "histogram": dict(zip(labels, self.histogram)),
+        }
+
+"""
+Scheduler is a hashed timer wheel: each timer is filed under the tick its deadline falls in,
+so scheduling and cancelling are O(1). A small heap of occupied ticks finds the next due slot
+without scanning empty ones, which keeps long fast-forwarded simulations cheap.
+on_reschedule, if set, is called whenever a timer is added, so a driver can re-arm its wakeup.
+profiler, if set, runs each callback and records its timing; it is None unless profiling is enabled.
+"""
+class Scheduler:
+
+    def __init__(self, clock=None, tick_ms=SCHEDULER_TICK, slots=SCHEDULER_SLOTS, on_reschedule=None):
+
+        self.clock = clock or MonotonicClock()
+        self.tick_ms = tick_ms
+        self.on_reschedule = on_reschedule
+        self.metrics = TimerMetrics()
+        self.profiler = None
+
+        self._wheel = [[] for _ in range(slots)]
+        self._ticks = []
+        self._occupied = set()
+        self._size = 0
+        self._seq = 0
+
+    def _tick_of(self, deadline):
+        return math.ceil(deadline / self.tick_ms)
+
+    def _insert(self, handle):
+
+        handle.tick = self._tick_of(handle.deadline)
+        self._wheel[handle.tick % len(self._wheel)].append(handle)
+        self._size += 1
+        if handle.tick not in self._occupied:
+            self._occupied.add(handle.tick)
+            heapq.heappush(self._ticks, handle.tick)
+        if self.on_reschedule:
+            self.on_reschedule()
+
+    def _new_handle(self, deadline, callback, interval=None, catch_up=SKIP):
+
+        self._seq += 1
+        handle = TimerHandle(deadline, callback, interval, catch_up, self._seq)
+        self._insert(handle)
+        return handle
+
+    """
+    Runs callback once at the given deadline (milliseconds on the scheduler clock).
+    """
+    def call_at(self, deadline, callback):
+        return self._new_handle(deadline, callback)
+
+    """
+    Runs callback once, delay milliseconds from now.
+    """
+    def call_later(self, delay, callback):
+        return self._new_handle(self.clock.now() + delay, callback)
+
+    """
+    Runs callback every interval milliseconds, first after first_delay (defaults to interval).
+    catch_up chooses what happens to runs missed during a stall: SKIP or COMPRESS.
+    """
+    def call_every(self, interval, callback, catch_up=SKIP, first_delay=None):
+
+        delay = interval if first_delay is None else first_delay
+        return self._new_handle(self.clock.now() + delay, callback, interval, catch_up)
+
+    def cancel(self, handle):
+        if handle is not None:
+            handle.cancel()
+
+    """
+    Returns the smallest tick holding a live timer, dropping cancelled timers on the way.
+    """
+    def _next_tick(self):
+
+        slots = len(self._wheel)
+        while self._ticks:
+            tick = self._ticks[0]
+            slot = self._wheel[tick % slots]
+            if any(handle.cancelled for handle in slot):
+                self._size -= sum(handle.cancelled for handle in slot)
+                slot[:] = [handle for handle in slot if not handle.cancelled]
+            if any(handle.tick == tick for handle in slot):
+                return tick
+            heapq.heappop(self._ticks)
+            self._occupied.discard(tick)
+        return None
+
+    """
+    Returns the earliest pending deadline, or None if nothing is scheduled.
+    """
+    def next_deadline(self):
+
+        tick = self._next_tick()
+        if tick is None:
+            return None
+        slot = self._wheel[tick % len(self._wheel)]
+        return min(handle.deadline for handle in slot if handle.tick == tick)
+
+    def __len__(self):
+        return self._size
+
+    """
+    Runs every timer due by the given time. Timers sharing a wheel tick run as one batch,
+    so a real-time driver may run work up to one tick early instead of waking twice.
+    With a VirtualClock nothing runs early, and the clock is moved to each deadline before its callback.
+    """
+    def run_until(self, until):
+
+        virtual = isinstance(self.clock, VirtualClock)
+        limit = self._tick_of(until)
+        slots = len(self._wheel)
+
+        while True:
+            tick = self._next_tick()
+            if tick is None or tick > limit:
+                break
+
+            slot = self._wheel[tick % slots]
+            due = [handle for handle in slot if handle.tick == tick and (not virtual or handle.deadline <= until)]
+            if not due:
+                break
+            batch = set(due)
+            slot[:] = [handle for handle in slot if handle not in batch]
+            self._size -= len(due)
+
+            due.sort(key=lambda handle: (handle.deadline, handle.seq))
+            for handle in due:
+                if not handle.cancelled:
+                    self._run(handle, virtual)
+
+        if virtual:
+            self.clock.set(until)
+
+    def _run(self, handle, virtual):
+
+        if virtual:
+            self.clock.set(handle.deadline)
+        now = self.clock.now()
+        self.metrics.record(max(0.0, now - handle.deadline))
+
+        if self.profiler is None:
+            handle.callback()
+        else:
+            self.profiler.run(handle.callback, handle.deadline, now)
+
+        if handle.interval is None or handle.cancelled:
+            return
+
+        # Drift-free: the next run is measured from the deadline, not from when this run happened
+        next_deadline = handle.deadline + handle.interval
+        now = self.clock.now()
+        if next_deadline < now:
+            missed = math.ceil((now - next_deadline) / handle.interval)
+            # Compressing replays the most recent runs only; anything beyond the cap is skipped
+            replayed = min(missed, SCHEDULER_MAX_CATCH_UP) if handle.catch_up == COMPRESS else 0
+            next_deadline += (missed - replayed) * handle.interval
+            self.metrics.skipped += missed - replayed
+            if replayed:
+                self.metrics.compressed += 1
+
+        handle.deadline = next_deadline
+        self._insert(handle)
+
+"""
+TkDriver keeps exactly one root.after wakeup armed for the scheduler's next deadline
+and runs every due timer when it fires.
+"""
+class TkDriver:
+
+    def __init__(self, scheduler, root):
+
+        self.scheduler = scheduler
+        self.root = root
+        self._job = None
+        self._armed_for = None
+        self._running = False
+        self.wakeups = 0
+        scheduler.on_reschedule = self.arm
+
+    """
+    Re-arms the wakeup if the earliest deadline changed. Ignored while timers are running,
+    since the wakeup is re-armed once the batch finishes.
+    """
+    def arm(self):
+
+        if self._running:
+            return
+
+        deadline = self.scheduler.next_deadline()
+        if self._job and deadline == self._armed_for:
+            return
+
+        self.stop()
+        if deadline is not None:
+            delay = max(0, math.ceil(deadline - self.scheduler.clock.now()))
+            self._job = self.root.after(delay, self._pump)
+            self._armed_for = deadline
+
+    def _pump(self):
+
+        self.wakeups += 1
+        self._job = None
+        self._armed_for = None
+        self._running = True
+        try:
+            self.scheduler.run_until(self.scheduler.clock.now())
+        finally:
+            self._running = False
+        self.arm()
+
+    def stop(self):
+
+        if self._job:
+            self.root.after_cancel(self._job)
+        self._job = None
+        self._armed_for = None
@@ -0,0 +1,170 @@
+"""
+Shared-memory frame store for Virtual Pet Pal.
+Runs several pet windows as separate processes while decoding each pet type only once.
+
+The supervisor decodes every action of each distinct pet, in both directions, into a pet pack
+(see pet_pack.py) held in a multiprocessing.shared_memory segment, then starts one
+"main.py --pet <name> --shared-frames <segment>" process per pet. Each child attaches to its
+pet's segment and reads frames straight out of it, without opening or decoding any file.
+Frames in the segment are plain RGBA, so a child's Pillow images point into shared memory.
+With a scale other than 1 the segment holds the frames at that scale, which the supervisor resolves
+once (including "auto") and passes to every child, so children never resample either.
+
+    python main.py --launch Dog Dog Cat     # three windows, two decodes
+"""
+
+import atexit
+import os
+import subprocess
+import sys
+import time
+from multiprocessing import shared_memory
+
+import pet_loader
+from asset_manifest import get_manifest
+from pet_pack import PetPack, encode_pack
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SEGMENT_PREFIX = "vpp"
+CHILD_POLL_INTERVAL = 0.5  # seconds between checks for exited pet windows
+
+# Segments attached in this process, kept alive while their frames are in use
+_attached = []
+
+"""
+Decodes every action of a pet in both directions at a scale and returns them as pack bytes.
+Palette frames of optimized packs are expanded, so children never decode anything.
+"""
+def decode_pet(pet_name, scale=1):
+
+    assets = {}
+    for action in get_manifest().actions(pet_name):
+        key = pet_loader.pack_key(pet_name, action, scale)
+        assets[key] = {direction: pet_loader.load_action_images(pet_name, action, direction, scale=scale) or []
+                       for direction in ("right", "left")}
+    return encode_pack(assets)
+
+"""
+Decodes each distinct pet once into its own shared memory segment.
+Returns a dictionary of pet name to SharedMemory; the caller closes and unlinks them.
+"""
+def publish(pet_names, scale=1):
+
+    segments = {}
+    try:
+        for i, pet_name in enumerate(dict.fromkeys(pet_names)):
+            data = decode_pet(pet_name, scale)
+            segment = shared_memory.SharedMemory(name=f"{SEGMENT_PREFIX}_{os.getpid()}_{i}", create=True,
+                                                 size=len(data))
+            segment.buf[:len(data)] = data
+            segments[pet_name] = segment
+            print(f"[Info] Decoded '{pet_name}' into shared memory {segment.name} ({len(data) / 1024:.0f} KiB)")
+    except Exception:
+        release(segments)
+        raise
+    return segments
+
+"""
+Closes and removes segments created by publish.
+"""
+def release(segments):
+
+    for segment in segments.values():
+        segment.close()
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+"""
+Attaches to a segment published by the supervisor and makes the loader read frames from it
+before any pack file or PNG (see pet_loader.attach_pack).
+"""
+def attach(name):
+
+    try:
+        segment = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the segment with this process's resource tracker,
+        # which would remove it when this child exits while other pets still use it
+        segment = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(segment._name, "shared_memory")
+
+    pack = PetPack(segment.buf, name=f"shared memory {name}")
+    if not _attached:
+        atexit.register(_detach_all)
+    _attached.append((segment, pack))
+    pet_loader.attach_pack(pack)
+
+"""
+Unmaps the attached segments at exit. The supervisor removes them once every window has closed.
+"""
+def _detach_all():
+
+    while _attached:
+        segment, pack = _attached.pop()
+        try:
+            pack.close()
+            segment.close()
+        except BufferError:
+            pass  # frames still in use; the mapping goes away with the process
+
+"""
+Returns the scale for a PET_SCALE setting as the pet windows would resolve it.
+"auto" needs a Tk window for the screen DPI, so a hidden one is opened briefly.
+"""
+def resolve_child_scale(setting):
+
+    from scaled_cache import resolve_scale
+
+    if setting != "auto":
+        return resolve_scale(setting)
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        return resolve_scale(setting, root)
+    finally:
+        root.destroy()
+
+"""
+Runs one pet window process per entry of pet_names (names may repeat), all reading frames from
+shared memory decoded here once per distinct pet at the given scale. Returns when every window has closed.
+child_args are passed on to each window, e.g. ["--renderer", "compositor"].
+"""
+def run_supervisor(pet_names, child_args=(), scale=1):
+
+    manifest = get_manifest()
+    installed = manifest.pet_names()
+    for pet_name in dict.fromkeys(pet_names):
+        if pet_name not in installed or not manifest.is_complete(pet_name):
+            print(f"[Warning] Animation frames missing or incomplete for '{pet_name}'. Skipping it.")
+    pet_names = [pet for pet in pet_names if pet in installed and manifest.is_complete(pet)]
+    if not pet_names:
+        sys.exit(1)
+
+    scale = resolve_child_scale(scale)
+    segments = publish(pet_names, scale)
+    children = []
+    try:
+        for pet_name in pet_names:
+            command = [sys.executable, os.path.join(BASE_DIR, "main.py"), "--pet", pet_name,
+                       "--shared-frames", segments[pet_name].name, "--scale", f"{scale:g}", *child_args]
+            children.append(subprocess.Popen(command))
+        print(f"[Info] Started {len(children)} pet windows sharing {len(segments)} decoded pets "
+              f"({sum(segment.size for segment in segments.values()) / 1024:.0f} KiB)")
+
+        while any(child.poll() is None for child in children):
+            time.sleep(CHILD_POLL_INTERVAL)
+    except KeyboardInterrupt:
+        print("[Info] Stopping pet windows.")
+    finally:
+        for child in children:
+            if child.poll() is None:
+                child.terminate()
+        for child in children:
+            child.wait()
+        release(segments)
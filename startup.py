@@ -0,0 +1,46 @@
+"""
+Startup timing for Virtual Pet Pal.
+Records how long each lazily imported part of the app took to import, in the spirit of
+"python -X importtime" but summarized per step, plus the time from process start to the first pet frame.
+Printed when REPORT_STARTUP is set in config.py or with "python main.py --startup-report".
+"""
+
+import importlib
+import sys
+import time
+
+# Taken when main.py imports this module, before anything else of the app is loaded
+PROCESS_START = time.perf_counter()
+
+# (module, milliseconds, modules newly loaded) for every timed import
+_imports = []
+
+"""
+Imports a module, recording how long it took and how many modules it pulled in.
+Modules that are already loaded cost nothing and are not recorded.
+"""
+def timed_import(name):
+
+    if name in sys.modules:
+        return sys.modules[name]
+
+    loaded = len(sys.modules)
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _imports.append((name, (time.perf_counter() - start) * 1000, len(sys.modules) - loaded))
+    return module
+
+"""
+Returns the milliseconds since the process started.
+"""
+def elapsed_ms():
+    return (time.perf_counter() - PROCESS_START) * 1000
+
+"""
+Prints the recorded imports, slowest first, and the time spent since the process started.
+"""
+def report(label="Startup"):
+
+    for name, ms, modules in sorted(_imports, key=lambda entry: -entry[1]):
+        print(f"[Info]   import {name:<16} {ms:7.1f} ms  ({modules} modules)")
+    print(f"[Info] {label} after {elapsed_ms():.0f} ms, {len(sys.modules)} modules loaded")
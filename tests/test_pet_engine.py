@@ -0,0 +1,307 @@
+"""
+Tests for pet_engine.py. PetEngine counts quiet health decay in closed form and only wakes up for health
+events, so it is checked against a reference pet that runs every decay tick as its own timer,
+both on a VirtualClock: decay, play, feeding, the sleep threshold and snapshot/restore across long gaps.
+Run from the app folder with "python -m pytest tests" or "python -m unittest discover tests".
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    HEALTH_DECREASE_INTERVAL, ACTION_INTERVAL, ACTION_DURATION, SLEEP_HEALTH_THRESHOLD, FULL_HEALTH,
+    PLAY_DURATION, PLAY_HEALTH_DECREASE_INTERVAL
+)
+from pet_engine import PetEngine
+from scheduler import Scheduler, VirtualClock, COMPRESS
+
+"""
+ReferencePet follows the pet rules one decay tick at a time, each tick a timer of its own.
+"""
+class ReferencePet:
+
+    def __init__(self, clock):
+
+        self.clock = clock
+        self.scheduler = Scheduler(clock)
+        self.health = FULL_HEALTH
+        self.action = "Idle"
+        self.mood = "Happy"
+        self.is_sleeping = False
+        self.is_playing = False
+        self._play_jobs = []
+        self._action_end_job = None
+
+    def start(self):
+
+        self.scheduler.call_every(ACTION_INTERVAL, self._action_cycle, first_delay=0)
+        # The first decay tick runs at once, like the engine's on a fresh start
+        self.scheduler.call_every(HEALTH_DECREASE_INTERVAL, self._decrease_health, COMPRESS, first_delay=0)
+
+    def advance(self, ms):
+        self.scheduler.run_until(self.clock.now() + ms)
+
+    def update_mood(self):
+
+        if self.action in ("Play", "Action"):
+            self.mood = "Energetic"
+        elif self.action == "Sleep" or self.health <= SLEEP_HEALTH_THRESHOLD:
+            self.mood = "Hungry"
+        else:
+            self.mood = "Happy"
+
+    def switch_action(self, action):
+
+        if self.is_playing and action not in ("Sleep", "Play"):
+            return
+        if self.action == "Sleep" and action not in ("Sleep", "Idle"):
+            return
+        if action != "Action":
+            self.scheduler.cancel(self._action_end_job)
+            self._action_end_job = None
+        self.action = action
+        self.update_mood()
+
+    def feed(self):
+
+        self.is_sleeping = False
+        self.health = FULL_HEALTH
+        if self.is_playing:
+            self._cancel_play()
+        self.switch_action("Idle")
+
+    def start_play(self):
+
+        if self.action == "Sleep" or self.is_playing:
+            return False
+        self.is_playing = True
+        self.switch_action("Play")
+        self._play_jobs = [self.scheduler.call_later(PLAY_DURATION, self.stop_play)]
+        self._play_health_decrease()
+        if self.is_playing:
+            self._play_jobs.append(self.scheduler.call_every(PLAY_HEALTH_DECREASE_INTERVAL,
+                                                             self._play_health_decrease, COMPRESS))
+        return True
+
+    def stop_play(self):
+
+        self._cancel_play()
+        if self.action != "Sleep":
+            self.switch_action("Idle")
+
+    def _cancel_play(self):
+
+        self.is_playing = False
+        for job in self._play_jobs:
+            self.scheduler.cancel(job)
+        self._play_jobs = []
+
+    def _lose_health(self):
+
+        if self.health > 2:
+            self.health -= 1
+            self.update_mood()
+            if self.health <= SLEEP_HEALTH_THRESHOLD and self.action != "Sleep":
+                self.switch_action("Sleep")
+                return True
+            return False
+        self.is_sleeping = True
+        self.health = 2
+        self.update_mood()
+        return True
+
+    def _play_health_decrease(self):
+
+        if self.action != "Play":
+            return
+        if self._lose_health():
+            if self.action != "Sleep":
+                self.switch_action("Sleep")
+            self.stop_play()
+
+    def _decrease_health(self):
+
+        if not self.is_sleeping and not self.is_playing:
+            self._lose_health()
+
+    def _action_cycle(self):
+
+        if not self.is_playing and not self.is_sleeping and self.action != "Sleep":
+            self.switch_action("Action")
+            self._action_end_job = self.scheduler.call_later(ACTION_DURATION, self._end_action)
+
+    def _end_action(self):
+
+        self._action_end_job = None
+        self.switch_action("Idle")
+
+def state(pet):
+    return pet.health, pet.action, pet.mood, pet.is_sleeping, pet.is_playing
+
+"""
+Starts a PetEngine and a ReferencePet at the same time, both on VirtualClocks.
+"""
+def start_pair(start=0):
+
+    engine, reference = PetEngine(VirtualClock(start)), ReferencePet(VirtualClock(start))
+    engine.start()
+    reference.start()
+    return engine, reference
+
+class PetEngineTest(unittest.TestCase):
+
+    def assert_same(self, engine, reference, when):
+        self.assertEqual(state(engine), state(reference), f"at {when} ms")
+
+    """
+    Advances both pets in steps, comparing them after every step.
+    """
+    def run_pair(self, engine, reference, total_ms, step_ms):
+
+        for _ in range(int(total_ms // step_ms)):
+            engine.advance(step_ms)
+            reference.advance(step_ms)
+            self.assert_same(engine, reference, engine.clock.now())
+
+    def test_decay_to_sleep(self):
+
+        engine, reference = start_pair()
+        self.run_pair(engine, reference, 60 * HEALTH_DECREASE_INTERVAL, 250)
+
+        # Full health drains one point per tick down to the floor, then the pet falls asleep
+        self.assertEqual(engine.health, 2)
+        self.assertTrue(engine.is_sleeping)
+        self.assertEqual(engine.action, "Sleep")
+
+        # Asleep, health stays at the floor
+        self.run_pair(engine, reference, 10 * HEALTH_DECREASE_INTERVAL, 1000)
+
+    def test_sleep_threshold(self):
+
+        engine, reference = start_pair()
+        # The first decay tick runs at once, so the tick reaching the threshold falls at (ticks - 1) intervals
+        ticks = FULL_HEALTH - SLEEP_HEALTH_THRESHOLD
+        self.run_pair(engine, reference, (ticks - 1) * HEALTH_DECREASE_INTERVAL - 100, 100)
+        self.assertEqual(engine.health, SLEEP_HEALTH_THRESHOLD + 1)
+        self.assertNotEqual(engine.action, "Sleep")
+        self.run_pair(engine, reference, 200, 100)
+        self.assertEqual(engine.health, SLEEP_HEALTH_THRESHOLD)
+        self.assertEqual(engine.action, "Sleep")
+        self.assertEqual(engine.mood, "Hungry")
+        self.assertFalse(engine.is_sleeping)
+
+    def test_play(self):
+
+        engine, reference = start_pair()
+        self.run_pair(engine, reference, 7 * HEALTH_DECREASE_INTERVAL + 1234, 500)
+        self.assertEqual(engine.start_play(), reference.start_play())
+        self.assert_same(engine, reference, "play start")
+        self.run_pair(engine, reference, PLAY_DURATION + HEALTH_DECREASE_INTERVAL, 50)
+        self.assertFalse(engine.is_playing)
+
+        # Playing drains health fast enough to put the pet to sleep near the threshold
+        self.run_pair(engine, reference, 26 * HEALTH_DECREASE_INTERVAL, 1000)
+        self.assertEqual(engine.start_play(), reference.start_play())
+        self.run_pair(engine, reference, PLAY_DURATION + HEALTH_DECREASE_INTERVAL, 50)
+
+    def test_feed(self):
+
+        engine, reference = start_pair()
+        self.run_pair(engine, reference, 70 * HEALTH_DECREASE_INTERVAL, 1000)
+        self.assertTrue(engine.is_sleeping)
+        engine.feed()
+        reference.feed()
+        self.assert_same(engine, reference, "feed")
+        self.assertEqual(engine.health, FULL_HEALTH)
+        self.assertFalse(engine.is_sleeping)
+
+        # Feeding during play cancels it and restarts the decay from full health
+        self.assertTrue(engine.start_play() and reference.start_play())
+        self.run_pair(engine, reference, 1200, 100)
+        engine.feed()
+        reference.feed()
+        self.assert_same(engine, reference, "feed while playing")
+        self.run_pair(engine, reference, 20 * HEALTH_DECREASE_INTERVAL, 300)
+
+    def test_random_interaction(self):
+
+        for seed in range(40):
+            rng = random.Random(seed)
+            engine, reference = start_pair(rng.choice([0, 1234.5]))
+            for _ in range(60):
+                ms = rng.choice([rng.randint(0, 3000), rng.randint(0, 60) * PLAY_HEALTH_DECREASE_INTERVAL,
+                                 rng.random() * 20 * HEALTH_DECREASE_INTERVAL])
+                engine.advance(ms)
+                reference.advance(ms)
+                event = rng.choice(["feed", "play", "play", "stop", None])
+                if event == "feed":
+                    engine.feed()
+                    reference.feed()
+                elif event == "play":
+                    self.assertEqual(engine.start_play(), reference.start_play())
+                elif event == "stop":
+                    engine.stop_play()
+                    reference.stop_play()
+                self.assert_same(engine, reference, f"seed {seed}, {engine.clock.now()} ms after {event}")
+
+    """
+    Restores a snapshot taken before ms into a pet's life after a gap, and compares the restored pet
+    with a reference pet that ran through the gap tick by tick.
+    """
+    def check_restore(self, before, gap, feed, rng):
+
+        engine, reference = start_pair()
+        engine.advance(before)
+        reference.advance(before)
+        if feed:
+            engine.feed()
+            reference.feed()
+        snapshot = engine.snapshot()
+        reference.advance(gap)
+
+        restored = PetEngine(VirtualClock(before + gap))
+        restored.restore(snapshot, gap)
+        restored.start()
+        for extra in [0] + [rng.randint(0, 3 * HEALTH_DECREASE_INTERVAL) for _ in range(3)]:
+            restored.advance(extra)
+            reference.advance(extra)
+            # Play and Action are not kept across restarts, and the action cycle restarts with the app
+            self.assertEqual((restored.health, restored.action == "Sleep", restored.is_sleeping),
+                             (reference.health, reference.action == "Sleep", reference.is_sleeping),
+                             f"snapshot after {before} ms, gap {gap} ms, fed {feed}")
+        return snapshot
+
+    def test_restore_across_gaps(self):
+
+        rng = random.Random(0)
+        gaps = [0, 1, HEALTH_DECREASE_INTERVAL - 1, HEALTH_DECREASE_INTERVAL, 90 * 1000, 60 * 60 * 1000,
+                7 * 24 * 60 * 60 * 1000] + [rng.randint(0, 600 * 1000) for _ in range(40)]
+        for i, gap in enumerate(gaps):
+            self.check_restore(rng.randint(0, 400 * 1000), gap, i % 3 == 0, rng)
+
+    """
+    Gaps ending right around the ticks that reach the sleep threshold, the floor and falling asleep.
+    """
+    def test_restore_at_tick_boundaries(self):
+
+        rng = random.Random(1)
+        for before in [0, 2500, 40 * 1000, 123 * 1000 + 7]:
+            for feed in (False, True):
+                engine = PetEngine(VirtualClock())
+                engine.start()
+                engine.advance(before)
+                if feed:
+                    engine.feed()
+                snapshot = engine.snapshot()
+                health, phase = snapshot["health"], snapshot["decay_phase_ms"]
+                for ticks in {health - SLEEP_HEALTH_THRESHOLD, health - 2, health - 1}:
+                    for delta in (-1, 0, 1):
+                        gap = max(0, ticks * HEALTH_DECREASE_INTERVAL - phase + delta)
+                        self.check_restore(before, gap, feed, rng)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for the catch-up behaviour of scheduler.py after a stall, on a VirtualClock.
+Run from the app folder with "python -m pytest tests" or "python -m unittest discover tests".
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import SCHEDULER_MAX_CATCH_UP
+from scheduler import Scheduler, VirtualClock, SKIP, COMPRESS
+
+INTERVAL = 10
+
+"""
+Runs a periodic timer whose first run stalls the clock for missed intervals (plus half of one),
+then runs the scheduler up to the end of the stall. Returns the scheduler and the times it ran at.
+"""
+def stall(catch_up, missed):
+
+    clock = VirtualClock()
+    scheduler = Scheduler(clock)
+    runs = []
+
+    def callback():
+        if not runs:
+            clock.set(clock.now() + (missed + 0.5) * INTERVAL)
+        runs.append(clock.now())
+
+    scheduler.call_every(INTERVAL, callback, catch_up)
+    scheduler.run_until(INTERVAL + (missed + 0.5) * INTERVAL)
+    return scheduler, runs
+
+class CatchUpTest(unittest.TestCase):
+
+    def test_skip_drops_every_missed_run(self):
+
+        scheduler, runs = stall(SKIP, 30)
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(scheduler.metrics.skipped, 30)
+
+    def test_compress_replays_every_missed_run_under_the_cap(self):
+
+        scheduler, runs = stall(COMPRESS, 30)
+        self.assertEqual(len(runs), 1 + 30)
+        self.assertEqual(scheduler.metrics.skipped, 0)
+
+    def test_compress_replays_the_cap_and_skips_the_rest(self):
+
+        scheduler, runs = stall(COMPRESS, SCHEDULER_MAX_CATCH_UP + 50)
+        self.assertEqual(len(runs), 1 + SCHEDULER_MAX_CATCH_UP)
+        self.assertEqual(scheduler.metrics.skipped, 50)
+
+        # The timer keeps its period once it has caught up
+        scheduler.run_until(runs[-1] + INTERVAL)
+        self.assertEqual(len(runs), 2 + SCHEDULER_MAX_CATCH_UP)
+
+
+if __name__ == "__main__":
+    unittest.main()